@@ -1,33 +1,91 @@
-from model.SBML import SBML
-from model.SBMLtoODES import sbml_to_odes
-from marginal_likelihood.MarginalLikelihood import MarginalLikelihood
-from model.PriorsReader import define_sbml_params_priors
-from experiment.ExperimentSet import ExperimentSet
-import seed_manager
 import argparse
 
 
 def perform_marginal_likelihood (sbml_file, priors_file, \
         experiment_file, burnin1_iterations, sigma_update_n, \
         burnin2_iterations, sampling_iterations, verbose=False, \
-        n_process=0, sample_output_file=None, seed=0):
+        n_process=0, sample_output_file=None, seed=0, 
+        warm_start_waves=0, prior_sample_size=0, importance_beta=0,
+        engine="ti", n_particles=1000, n_moves=10, fisher_update_n=0,
+        noise_updates=0, delayed_acceptance_scale=0, 
+        early_termination=False, surrogate_screen=False,
+        likelihood_cache_dir=None, reduce_conservation_laws=False,
+        model_bundle_dir=None, target_ess=0, max_r_hat=1.1,
+        chains_per_temperature=1, retained_states=0, thinning=1,
+        spill_dir=None, checkpoint_dir=None, checkpoint_n=100, 
+        resume=False, langevin_step_size=0, 
+        likelihood_cache_entries=100000):
+    # The modules are imported here, so parsing the command line 
+    # arguments is fast
+    from model.ModelBundle import ModelBundle
+    from marginal_likelihood.MarginalLikelihood import \
+            MarginalLikelihood
+    from marginal_likelihood.SequentialMonteCarlo import \
+            SequentialMonteCarlo
+    from marginal_likelihood.NestedSampling import NestedSampling
+    from marginal_likelihood.LikelihoodFunction import \
+            LikelihoodFunction
+    from marginal_likelihood.SampleFile import SampleWriter
+    from model.PriorsReader import define_sbml_params_priors
+    from experiment.ExperimentSet import ExperimentSet
+    import seed_manager
     print  ("Performing marginal likelihood calculations of model: " + \
             sbml_file)
-    sbml = SBML ()
-    sbml.load_file (sbml_file)
-    odes = sbml_to_odes (sbml)
+    if model_bundle_dir:
+        sbml = ModelBundle.load (sbml_file, model_bundle_dir, 
+                reduce_conservation_laws)
+        odes = sbml.odes
+    else:
+        from model.SBML import SBML
+        from model.SBMLtoODES import sbml_to_odes
+        sbml = SBML ()
+        sbml.load_file (sbml_file)
+        odes = sbml_to_odes (sbml, reduce_conservation_laws)
     experiments = ExperimentSet (experiment_file)
     theta_priors = define_sbml_params_priors (sbml, priors_file)
     seed_manager.set_seed (seed)
+    LikelihoodFunction.set_cache_dir (likelihood_cache_dir, 
+            likelihood_cache_entries)
+    # Samples written to .npz files are not printed
+    binary_sample = sample_output_file is not None and \
+            sample_output_file.lower ().endswith (".npz")
 
-    ml = MarginalLikelihood (burnin1_iterations, 
-            sigma_update_n, 
-            burnin2_iterations, 
-            sampling_iterations, 20, 2, \
-            verbose=verbose, n_process=n_process)
+    if engine == "smc":
+        ml = SequentialMonteCarlo (n_particles, n_moves, 
+                verbose=verbose, n_process=n_process)
+    elif engine == "nested":
+        ml = NestedSampling (n_particles, n_moves, verbose=verbose, 
+                n_process=n_process)
+    else:
+        ml = MarginalLikelihood (burnin1_iterations, 
+                sigma_update_n, 
+                burnin2_iterations, 
+                sampling_iterations, 20, 2, \
+                verbose=verbose, n_process=n_process, 
+                warm_start_waves=warm_start_waves, 
+                prior_sample_size=prior_sample_size, 
+                importance_beta=importance_beta, 
+                fisher_update_n=fisher_update_n, 
+                noise_updates=noise_updates, 
+                delayed_acceptance_scale=delayed_acceptance_scale,
+                early_termination=early_termination,
+                surrogate_screen=surrogate_screen,
+                sample_file=sample_output_file if binary_sample else None,
+                target_ess=target_ess, max_r_hat=max_r_hat,
+                chains_per_temperature=chains_per_temperature,
+                retained_states=retained_states, thinning=thinning,
+                spill_dir=spill_dir, checkpoint_dir=checkpoint_dir,
+                checkpoint_n=checkpoint_n, resume=resume,
+                langevin_step_size=langevin_step_size)
     log_l = ml.estimate_marginal_likelihood (experiments, odes, 
             theta_priors)
-    ml.print_sample (output_file=sample_output_file)
+    if not binary_sample:
+        ml.print_sample (output_file=sample_output_file)
+    elif engine != "ti":
+        writer = SampleWriter (sample_output_file, {"betas": [1],
+            "parameters": [p.name for p in theta_priors]})
+        thetas, log_ls = ml.get_posterior_sample ()
+        writer.write (1, thetas, log_ls)
     print ("log_l = " + str (log_l))
     return log_l
 
@@ -37,8 +95,8 @@ def main ():
     parser.add_argument ("model", help="SBLM file with model definition.")
     parser.add_argument ("priors", help="An XML file with the priors for" \
             + " the model parameters.")
-    parser.add_argument ("experiment", help="An XML file with the" \
-            + " experiments observations.")
+    parser.add_argument ("experiment", help="An XML, CSV or NPZ file" \
+            + " with the experiments observations.")
     parser.add_argument ("first_sampling_iterations", help="How many" \
             + " iterations should be performed on the first step of the" \
             + " parameter sampling.")
@@ -57,6 +115,107 @@ def main ():
             help="Number of parallel process used on sampling step.")
     parser.add_argument ('--seed', type=int, nargs='?', default=0, \
             help="Random number generation seed.")
+    parser.add_argument ('--warm_start_waves', type=int, nargs='?', \
+            default=0, help="Number of waves in which the first and" \
+            + " second steps are run along the temperatures, warm" \
+            + " starting each temperature from its neighbour. It" \
+            + " should be 0, in which case every temperature starts" \
+            + " from the priors, or at least 2.")
+    parser.add_argument ('--prior_sample_size', type=int, nargs='?', \
+            default=0, help="Number of independent draws from the" \
+            + " priors used for temperature 0 instead of MCMC. If 0," \
+            + " every temperature is sampled with MCMC.")
+    parser.add_argument ('--importance_beta', type=float, nargs='?', \
+            default=0, help="Temperatures up to this value are" \
+            + " estimated by importance sampling of the prior draws.")
+    parser.add_argument ('--engine', choices=["ti", "smc", "nested"], \
+            default="ti", help="Algorithm used to estimate the" \
+            + " marginal likelihood: thermodynamic integration with" \
+            + " populational MCMC (ti), Sequential Monte Carlo with" \
+            + " adaptive tempering (smc) or nested sampling (nested).")
+    parser.add_argument ('--n_particles', type=int, nargs='?', \
+            default=1000, help="Number of particles of the smc engine" \
+            + " or of live points of the nested engine.")
+    parser.add_argument ('--n_moves', type=int, nargs='?', default=10, \
+            help="Number of MCMC moves per particle and temperature" \
+            + " of the smc engine, or per new live point of the" \
+            + " nested engine.")
+    parser.add_argument ('--fisher_update_n', type=int, nargs='?', \
+            default=0, help="Iterations between updates of the first" \
+            + " step jump covariance, calculated from the Fisher" \
+            + " information of the current point. If 0, the first" \
+            + " step jumps are independent.")
+    parser.add_argument ('--noise_updates', type=int, nargs='?', \
+            default=0, help="Number of updates of the experimental" \
+            + " error alone after each MCMC iteration. These updates" \
+            + " don't integrate the model.")
+    parser.add_argument ('--delayed_acceptance_scale', type=float, \
+            nargs='?', default=0, help="Factor that multiplies the" \
+            + " integration tolerances of the cheap likelihood used" \
+            + " to screen proposals of the second and third steps. If" \
+            + " 0, delayed acceptance is not used.")
+    parser.add_argument ('--early_termination', type=bool, nargs='?', \
+            const=True, default=False, help="Stop the integration of" \
+            + " the model for a proposal as soon as its rejection is" \
+            + " certain.")
+    parser.add_argument ('--surrogate_screen', type=bool, nargs='?', \
+            const=True, default=False, help="Screen proposals of the" \
+            + " second and third steps with a Gaussian process" \
+            + " regression of the evaluated log-likelihoods.")
+    parser.add_argument ('--likelihood_cache_dir', nargs='?', \
+            default=None, help="Directory in which the evaluated" \
+            + " likelihoods are stored, so they are shared between" \
+            + " process and runs.")
+    parser.add_argument ('--likelihood_cache_entries', type=int, \
+            nargs='?', default=100000, help="Greatest number of" \
+            + " likelihoods kept on --likelihood_cache_dir. The least" \
+            + " recently used ones are removed.")
+    parser.add_argument ('--reduce_conservation_laws', type=bool, \
+            nargs='?', const=True, default=False, help="Do not" \
+            + " integrate one species of each conservation law of" \
+            + " the model, calculating it from the other species.")
+    parser.add_argument ('--sample_output_file', nargs='?', \
+            default=None, help="File in which the sample is written." \
+            + " If its extension is .npz, the sample is written in a" \
+            + " compressed binary format and it is not printed.")
+    parser.add_argument ('--target_ess', type=float, nargs='?', \
+            default=0, help="Effective sample size of every parameter" \
+            + " after which the first and second steps stop. If 0," \
+            + " these steps always perform all their iterations.")
+    parser.add_argument ('--max_r_hat', type=float, nargs='?', \
+            default=1.1, help="Greatest split-R-hat of the parameters" \
+            + " for which the first and second steps stop. Only used" \
+            + " with --target_ess.")
+    parser.add_argument ('--chains_per_temperature', type=int, \
+            nargs='?', default=1, help="Number of independent chains" \
+            + " that sample each temperature in parallel. Their" \
+            + " samples are pooled.")
+    parser.add_argument ('--retained_states', type=int, nargs='?', \
+            default=0, help="Number of sampled parameters kept by" \
+            + " each chain of the first and second steps. If 0, all" \
+            + " of them are kept.")
+    parser.add_argument ('--thinning', type=int, nargs='?', default=1, \
+            help="Interval between the parameters of the third step" \
+            + " that are kept in the sample.")
+    parser.add_argument ('--spill_dir', nargs='?', default=None, \
+            help="Directory in which the sample of the third step is" \
+            + " kept during the run, instead of memory.")
+    parser.add_argument ('--checkpoint_dir', nargs='?', default=None, \
+            help="Directory in which the state of the run is saved," \
+            + " so it can be resumed.")
+    parser.add_argument ('--checkpoint_n', type=int, nargs='?', \
+            default=100, help="Iterations between the saves of the" \
+            + " state of each chain.")
+    parser.add_argument ('--resume', type=bool, nargs='?', const=True, \
+            default=False, help="Continue the run whose state was" \
+            + " saved on --checkpoint_dir.")
+    parser.add_argument ('--langevin_step_size', type=float, \
+            nargs='?', default=0, help="Initial step size of the" \
+            + " Langevin sampler used on the third step. If 0, the" \
+            + " third step is a random walk.")
+    parser.add_argument ('--model_bundle_dir', nargs='?', default=None, \
+            help="Directory in which the converted and compiled model" \
+            + " is saved, so later runs do not read the SBML file.")
     args = parser.parse_args ()
     
 
@@ -73,11 +232,57 @@ def main ():
     verbose = args.verbose
     n_process = args.n_process
     seed = args.seed
+    warm_start_waves = args.warm_start_waves
+    prior_sample_size = args.prior_sample_size
+    importance_beta = args.importance_beta
+    engine = args.engine
+    n_particles = args.n_particles
+    n_moves = args.n_moves
+    fisher_update_n = args.fisher_update_n
+    noise_updates = args.noise_updates
+    delayed_acceptance_scale = args.delayed_acceptance_scale
+    early_termination = args.early_termination
+    surrogate_screen = args.surrogate_screen
+    likelihood_cache_dir = args.likelihood_cache_dir
+    likelihood_cache_entries = args.likelihood_cache_entries
+    reduce_conservation_laws = args.reduce_conservation_laws
+    model_bundle_dir = args.model_bundle_dir
+    sample_output_file = args.sample_output_file
+    target_ess = args.target_ess
+    max_r_hat = args.max_r_hat
+    chains_per_temperature = args.chains_per_temperature
+    retained_states = args.retained_states
+    thinning = args.thinning
+    spill_dir = args.spill_dir
+    checkpoint_dir = args.checkpoint_dir
+    checkpoint_n = args.checkpoint_n
+    resume = args.resume
+    langevin_step_size = args.langevin_step_size
 
     perform_marginal_likelihood (sbml_file, priors_file, \
             experiment_file, first_step_n, sigma_update_n, \
             second_step_n, third_step_n, verbose=verbose, \
-            n_process=n_process, seed=seed)
+            n_process=n_process, seed=seed, \
+            sample_output_file=sample_output_file, \
+            warm_start_waves=warm_start_waves, \
+            prior_sample_size=prior_sample_size, \
+            importance_beta=importance_beta, engine=engine, \
+            n_particles=n_particles, n_moves=n_moves, \
+            fisher_update_n=fisher_update_n, \
+            noise_updates=noise_updates, \
+            delayed_acceptance_scale=delayed_acceptance_scale, \
+            early_termination=early_termination, \
+            surrogate_screen=surrogate_screen, \
+            likelihood_cache_dir=likelihood_cache_dir, \
+            reduce_conservation_laws=reduce_conservation_laws, \
+            model_bundle_dir=model_bundle_dir, \
+            target_ess=target_ess, max_r_hat=max_r_hat, \
+            chains_per_temperature=chains_per_temperature, \
+            retained_states=retained_states, thinning=thinning, \
+            spill_dir=spill_dir, checkpoint_dir=checkpoint_dir, \
+            checkpoint_n=checkpoint_n, resume=resume, \
+            langevin_step_size=langevin_step_size, \
+            likelihood_cache_entries=likelihood_cache_entries)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+# Converts experiment data files between the formats read by 
+# ExperimentSet. The format of each file is given by its extension: 
+# .npz files are columnar binary files, .csv files are CSV files and
+# other files are XML files.
+import sys
+import os
+current_path = os.path.abspath (__file__)
+signetms_path = '/'.join (current_path.split ('/')[:-2])
+sys.path.insert (0, signetms_path)
+
+from experiment.ExperimentSet import ExperimentSet
+import argparse
+
+parser = argparse.ArgumentParser ()
+parser.add_argument ("input_file", help="An experiment data file.")
+parser.add_argument ("output_file", help="The converted experiment" \
+        + " data file.")
+args = parser.parse_args ()
+
+experiments = ExperimentSet (args.input_file)
+extension = os.path.splitext (args.output_file)[1].lower ()
+if extension == ".npz":
+    experiments.save_to_npz (args.output_file)
+elif extension == ".csv":
+    experiments.save_to_csv (args.output_file)
+else:
+    experiments.save_to_file (args.output_file)
+print ("Converted " + str (experiments.get_size ()) + " experiments.")
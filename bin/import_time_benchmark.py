@@ -0,0 +1,59 @@
+# Measures the time needed to import the entry points of SigNetMS and
+# shows which heavy dependencies each of them loads. Every import is
+# performed on a new python process, so nothing is cached between runs.
+import sys
+import os
+current_path = os.path.abspath (__file__)
+signetms_path = '/'.join (current_path.split ('/')[:-2])
+import argparse
+import subprocess
+
+# Modules imported by the command line interface and by the workers
+ENTRY_POINTS = ["SigNetMS", "marginal_likelihood.MarginalLikelihood",
+        "marginal_likelihood.LikelihoodFunction", "model.ODES",
+        "parallel_map", "utils"]
+
+# Dependencies that should only be imported when they are used
+HEAVY_DEPENDENCIES = ["sympy", "matplotlib", "seaborn", "libsbml"]
+
+IMPORT_SCRIPT = """
+import sys
+import time
+sys.path.insert (0, {path!r})
+start = time.perf_counter ()
+import {module}
+elapsed = time.perf_counter () - start
+loaded = [dep for dep in {deps!r} if dep in sys.modules]
+print (elapsed)
+print (','.join (loaded))
+"""
+
+
+def time_import (module, repetitions):
+    """ Returns the median time, in seconds, needed to import module on
+        a new process, and the list of heavy dependencies it loads. """
+    script = IMPORT_SCRIPT.format (path=signetms_path, module=module,
+            deps=HEAVY_DEPENDENCIES)
+    times = []
+    loaded = []
+    for _ in range (repetitions):
+        output = subprocess.check_output ([sys.executable, "-c",
+            script], cwd=signetms_path, stderr=subprocess.DEVNULL)
+        lines = output.decode ().split ("\n")
+        times.append (float (lines[-3]))
+        loaded = [dep for dep in lines[-2].split (',') if dep]
+    times.sort ()
+    return times[len (times) // 2], loaded
+
+
+parser = argparse.ArgumentParser ()
+parser.add_argument ("--repetitions", type=int, nargs="?", default=5,
+        help="Number of imports of each module.")
+parser.add_argument ("modules", nargs="*", default=ENTRY_POINTS,
+        help="Modules that should be imported.")
+args = parser.parse_args ()
+
+for module in args.modules:
+    elapsed, loaded = time_import (module, args.repetitions)
+    print (module + ": " + "{:.3f}".format (elapsed) + " s, loads " +
+            (", ".join (loaded) if loaded else "no heavy dependency"))
@@ -87,15 +87,15 @@ def get_signetms_path (current_path):
 @ray.remote
 def run_task (model_file, priors_file, experiment_file, \
         iterations_phase1, sigma_update_n, iterations_phase2, \
-        iterations_phase3, nof_process, signetms_path, seed=42):
+        iterations_phase3, nof_process, signetms_path, seed=42, 
+        model_bundle_dir=None):
     # pylint: disable=reimported
     import time
     start_time = time.time()
     # importing local modules...
     sys.path.insert (0, signetms_path)
-    from model.SBML import SBML
     from experiment.ExperimentSet import ExperimentSet
-    from model.SBMLtoODES import sbml_to_odes
+    from model.ModelBundle import ModelBundle
     from marginal_likelihood.MarginalLikelihood \
             import MarginalLikelihood
     from model.PriorsReader import define_sbml_params_priors
@@ -103,9 +103,15 @@ def run_task (model_file, priors_file, experiment_file, \
 
     # Now the actual code...
     seed_manager.set_seed(seed)
-    sbml = SBML ()
-    sbml.load_file (model_file)
-    odes = sbml_to_odes (sbml)
+    if model_bundle_dir:
+        sbml = ModelBundle.load (model_file, model_bundle_dir)
+        odes = sbml.odes
+    else:
+        from model.SBML import SBML
+        from model.SBMLtoODES import sbml_to_odes
+        sbml = SBML ()
+        sbml.load_file (model_file)
+        odes = sbml_to_odes (sbml)
     experiments = ExperimentSet (experiment_file)
     theta_priors = define_sbml_params_priors (sbml, priors_file)
     ml = MarginalLikelihood (iterations_phase1, 
@@ -140,6 +146,7 @@ cluster_json = json.load (cluster_file)
 workers_list = cluster_json["machines"]
 ray_abs_path = cluster_json["ray_path"]
 process_by_task = cluster_json["n_process_by_task"]
+bundle_dir = cluster_json.get ("model_bundle_dir")
 
 # Prepares Ray on all machines
 redis_server_address = prepare_workers (workers_list, ray_abs_path)
@@ -171,7 +178,9 @@ for task in tasks_json:
             int (task["phase3_it"]),
             int (process_by_task),
             signetms_abs_path,
-            seed=arg_seed)
+            seed=arg_seed,
+            model_bundle_dir=bundle_dir and abs_path (bundle_dir, \
+                signetms_abs_path))
     id_to_name[str (task_id)] = task["name"]
     not_ready_tasks.append (task_id)
     print ("Creating task", task["name"])
@@ -86,3 +86,11 @@ class Gamma:
             this random variable on point x. """
         # TODO: simplify calculations
         return safe_log (self.pdf (x))
+
+
+    def log_pdf_derivative (self, x):
+        """ Returns the derivative of the log of the probability density
+            function of this random variable on point x. """
+        if x <= 0:
+            return 0
+        return (self.__a - 1) / x - 1 / self.__b
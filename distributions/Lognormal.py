@@ -59,3 +59,12 @@ class Lognormal:
             this random variable on point x. """
         # TODO: simplify calculations
         return safe_log (self.pdf (x))
+
+
+    def log_pdf_derivative (self, x):
+        """ Returns the derivative of the log of the probability density
+            function of this random variable on point x. """
+        if x <= 0:
+            return 0
+        s2 = self.__s * self.__s
+        return - (1 + (np.log (x) - self.__mu) / s2) / x
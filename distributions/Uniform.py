@@ -58,3 +58,9 @@ class Uniform:
 
     def log_pdf (self, x):
         return safe_log (self.pdf (x))
+
+
+    def log_pdf_derivative (self, x):
+        """ The log of the probability density function is constant 
+            where it is defined. """
+        return 0
@@ -2,6 +2,8 @@ from lxml import etree
 from experiment.Experiment import Experiment
 from utils import clean_tag
 import numpy as np
+import csv
+import os
 
 class ExperimentSet:
     """ This class represents a set of experiments. """
@@ -72,52 +74,126 @@ class ExperimentSet:
     
     def load_data_file (self, file_name):
         """ Reads and adds all experiments of an experiment set file.
+            Files with extension .npz are read as columnar binary 
+            files, written by save_to_npz, and files with extension 
+            .csv are read as CSV files, written by save_to_csv. Other
+            files are read as XML.
             
             Parameters
-                file_name: an xml file that contains a set of 
-                    experiments.
+                file_name: a file that contains a set of experiments.
         """
-        tree = etree.parse (file_name)
-        root = tree.getroot ()
-    
-        if clean_tag (root) != "ExperimentSet":
-            print ("Wrong experiment data syntax. Root tag should be" \
-                + "<ExperimentSet>")
-            return 
+        extension = os.path.splitext (file_name)[1].lower ()
+        if extension == ".npz":
+            experiments_arr = self.__read_npz_file (file_name)
+        elif extension == ".csv":
+            experiments_arr = self.__read_csv_file (file_name)
+        else:
+            experiments_arr = self.__read_xml_file (file_name)
+
+        for e in experiments_arr:
+            self.add (e)
+
 
+    def __read_xml_file (self, file_name):
+        """ Reads the experiments of an XML file. The file is parsed
+            incrementally and each experiment is discarded from the 
+            parsed tree after it is read, so large files are read 
+            without keeping the whole tree in memory. """
+        root = None
         experiments_arr = []
-        for experiment_tag in root.getchildren ():
-            rows = []
+        for _, experiment_tag in etree.iterparse (file_name, 
+                tag="{*}Experiment"):
+            if root is None:
+                root = experiment_tag.getparent ()
+                if root is None or clean_tag (root) != "ExperimentSet":
+                    print ("Wrong experiment data syntax. Root tag" \
+                        + " should be <ExperimentSet>")
+                    return []
+            if experiment_tag.getparent () is not root:
+                continue
 
-            if clean_tag (experiment_tag) != "Experiment":
-                print ("Wrong experiment data syntax. The children of" \
-                        + " <ExperimentSet> can only be of tag" \
-                        + " <Experiment>.")
-        
-            for children in experiment_tag.getchildren ():
-                if clean_tag (children) == "row":
-                    row = self.__read_xml_row (children, file_name)
-                    rows.append (row)
-                elif clean_tag (children) == "condition" :
-                    continue
-                elif clean_tag (children) == "interpretation":
-                    interp = self.__read_interpretation (children)
-                else:
-                    print ("Unexpected child of dataset in" + file_name)
-            rows = np.array (rows)
-    
-            time_idx = interp.index ("time")
-            times = rows[:, time_idx]
-            for i in range (len (interp)):
-                if i == time_idx:
-                    continue
-                expression = interp[i]
-                var_values = rows[:, i]
-                experiment = Experiment (times, var_values, expression)
-                experiments_arr.append (experiment)
+            experiments_arr += self.__read_xml_experiment (
+                    experiment_tag, file_name)
+            experiment_tag.clear ()
+            while experiment_tag.getprevious () is not None:
+                if clean_tag (root[0]) != "Experiment":
+                    print ("Wrong experiment data syntax. The children" \
+                            + " of <ExperimentSet> can only be of tag" \
+                            + " <Experiment>.")
+                del root[0]
+        return experiments_arr
 
-        for e in experiments_arr:
-            self.add (e)
+
+    def __read_xml_experiment (self, experiment_tag, file_name):
+        """ Reads the experiments of an <Experiment> tag, one for each
+            measured column. """
+        rows = []
+        for children in experiment_tag:
+            if clean_tag (children) == "row":
+                row = self.__read_xml_row (children, file_name)
+                rows.append (row)
+            elif clean_tag (children) == "condition" :
+                continue
+            elif clean_tag (children) == "interpretation":
+                interp = self.__read_interpretation (children)
+            else:
+                print ("Unexpected child of dataset in" + file_name)
+        rows = np.array (rows)
+
+        experiments_arr = []
+        time_idx = interp.index ("time")
+        times = rows[:, time_idx]
+        for i in range (len (interp)):
+            if i == time_idx:
+                continue
+            expression = interp[i]
+            var_values = rows[:, i]
+            experiment = Experiment (times, var_values, expression)
+            experiments_arr.append (experiment)
+        return experiments_arr
+
+
+    @staticmethod
+    def __read_npz_file (file_name):
+        """ Reads the experiments of a columnar binary file. """
+        experiments_arr = []
+        with np.load (file_name, allow_pickle=False) as data:
+            times = data["times"]
+            values = data["values"]
+            offsets = data["offsets"]
+            measures = data["measures"]
+        for i in range (len (measures)):
+            first, last = offsets[i], offsets[i + 1]
+            experiment = Experiment (times[first:last], 
+                    values[first:last], str (measures[i]))
+            experiments_arr.append (experiment)
+        return experiments_arr
+
+
+    @staticmethod
+    def __read_csv_file (file_name):
+        """ Reads the experiments of a CSV file with the columns 
+            experiment, measure, time and value. Rows with the same
+            experiment label form an experiment, in the order they 
+            appear on the file. """
+        columns = {}
+        measures = {}
+        with open (file_name, newline='') as f:
+            for row in csv.DictReader (f):
+                label = row["experiment"]
+                if label not in columns:
+                    columns[label] = ([], [])
+                    measures[label] = row["measure"]
+                columns[label][0].append (float (row["time"]))
+                columns[label][1].append (float (row["value"]))
+
+        experiments_arr = []
+        for label in columns:
+            times, values = columns[label]
+            experiment = Experiment (np.array (times), 
+                    np.array (values), measures[label])
+            experiments_arr.append (experiment)
+        return experiments_arr
 
     @staticmethod
     def __read_interpretation (interp):
@@ -138,14 +214,13 @@ class ExperimentSet:
     @staticmethod
     def __read_xml_row (row_tag, file_name):
         """ Reads experiment rows on a data file. """
-        columns = len (row_tag.getchildren ())
-        row = [None for x in range (columns)]
-        for element in row_tag.getchildren ():
-            if clean_tag (element) != "element":
+        row = [None] * len (row_tag)
+        for element in row_tag:
+            if element.tag != "element" and \
+                    clean_tag (element) != "element":
                 print ("Unexpected child of row in " + file_name)
-            attribs = element.attrib
-            index = int (attribs["index"])
-            value = float (attribs["value"])
+            index = int (element.get ("index"))
+            value = float (element.get ("value"))
             row[index] = value
         return row 
 
@@ -182,6 +257,51 @@ class ExperimentSet:
         tree.write (file_name, pretty_print=True, encoding='utf-8',
                 standalone=True, xml_declaration=True)
 
+
+    def save_to_npz (self, file_name):
+        """ Saves experiment set into a columnar binary file, which is
+            read much faster than XML files. The times and values of 
+            all experiments are stored as two concatenated arrays, with
+            the offset of each experiment and its measure expression.
+        
+        Parameters
+            file_name: a string with the name of the file in which the
+                experiment set is to be saved.
+        """
+        experiments = self.__experiment_set
+        times = [np.asarray (exp.times, dtype=float) for exp in 
+                experiments]
+        values = [np.asarray (exp.values, dtype=float) for exp in 
+                experiments]
+        offsets = np.cumsum ([0] + [len (t) for t in times])
+        measures = np.array ([exp.measure_expression for exp in 
+            experiments], dtype=str)
+        # A file object is used, so numpy does not change the name of
+        # the file
+        with open (file_name, 'wb') as f:
+            np.savez (f, times=np.concatenate (times + [np.zeros (0)]),
+                    values=np.concatenate (values + [np.zeros (0)]), 
+                    offsets=offsets, measures=measures)
+
+
+    def save_to_csv (self, file_name):
+        """ Saves experiment set into a CSV file, with the columns
+            experiment, measure, time and value.
+        
+        Parameters
+            file_name: a string with the name of the file in which the
+                experiment set is to be saved.
+        """
+        with open (file_name, 'w', newline='') as f:
+            writer = csv.writer (f)
+            writer.writerow (["experiment", "measure", "time", "value"])
+            for i in range (len (self.__experiment_set)):
+                exp = self.__experiment_set[i]
+                for t, v in zip (exp.times, exp.values):
+                    writer.writerow ([i, exp.measure_expression, 
+                        repr (float (t)), repr (float (v))])
+
+
     def get_as_abcsysbio_syntax (self):
         """ Returns a string containing the experiment set in an 
             abc-sysbio format.  
@@ -0,0 +1,281 @@
+import numpy as np
+
+class ChainDiagnostics:
+    """ This class calculates convergence diagnostics of a Markov chain
+        while it is sampled, without storing it: the effective sample
+        size of each coordinate, the split-R-hat of one or more chains
+        and the acceptance ratio of windows of iterations.
+
+        The effective sample size is calculated from the
+        autocorrelations of lags up to max_lag, which are updated on
+        each iteration, truncated with Geyer's initial monotone
+        sequence. It is overestimated when the chain has
+        autocorrelations longer than max_lag.
+
+        The split-R-hat needs the mean and variance of the two halves
+        of each chain. They are calculated from a fixed number of
+        blocks of consecutive iterations whose size doubles, by merging
+        pairs of blocks, whenever all blocks are full.
+
+        Attributes
+            max_lag (int): the greatest lag of the autocorrelations.
+            window (int): the number of iterations of each acceptance
+                window.
+    """
+
+    def __init__ (self, dim, max_lag=100, window=100, n_blocks=32):
+        """ Default constructor.
+
+            Parameters
+                dim: the number of coordinates of the chain.
+                max_lag: the greatest lag of the autocorrelations used
+                    to estimate the effective sample size.
+                window: the number of iterations of each acceptance
+                    window.
+                n_blocks: the number of blocks used to split the chain
+                    in halves. It must be even.
+        """
+        if n_blocks < 2 or n_blocks % 2 != 0:
+            raise ValueError ("The number of blocks should be a " \
+                    + "positive even number.")
+        self.max_lag = max_lag
+        self.window = window
+        self.__n = 0
+        self.__shift = None
+        self.__sum = np.zeros (dim)
+        # Sums of x_t * x_{t - k} for k = 0, ..., max_lag
+        self.__lag_sums = np.zeros ((max_lag + 1, dim))
+        self.__first = np.zeros ((max_lag, dim))
+        self.__last = np.zeros ((max_lag, dim))
+
+        self.__n_blocks = n_blocks
+        self.__block_size = 1
+        self.__block = 0
+        self.__block_counts = np.zeros (n_blocks)
+        self.__block_means = np.zeros ((n_blocks, dim))
+        self.__block_M2s = np.zeros ((n_blocks, dim))
+
+        self.__n_window_accepted = 0
+        self.__n_window_jumps = 0
+        self.__acceptance_ratios = []
+
+
+    def add (self, values, accepted=None):
+        """ Adds an iteration of the chain.
+
+            Parameters
+                values: a list with the coordinates of the current
+                    state of the chain.
+                accepted: a boolean that tells if the jump proposed on
+                    this iteration was accepted, or None if no jump was
+                    proposed.
+        """
+        x = np.array (values, dtype=float)
+        if self.__shift is None:
+            # Values are shifted to reduce cancellation errors
+            self.__shift = x.copy ()
+        x = x - self.__shift
+        self.__add_to_lag_sums (x)
+        self.__add_to_blocks (x)
+        self.__n += 1
+
+        if accepted is not None:
+            self.__n_window_jumps += 1
+            self.__n_window_accepted += int (accepted)
+            if self.__n_window_jumps == self.window:
+                self.__acceptance_ratios.append (
+                        self.__n_window_accepted / self.window)
+                self.__n_window_jumps = 0
+                self.__n_window_accepted = 0
+
+
+    def __add_to_lag_sums (self, x):
+        """ Updates the sums of products of lagged values. """
+        n = self.__n
+        n_lags = min (n, self.max_lag)
+        # self.__last[i] is the value of iteration n - 1 - i
+        self.__lag_sums[0] += x * x
+        self.__lag_sums[1:n_lags + 1] += self.__last[:n_lags] * x
+        self.__sum += x
+        if n < self.max_lag:
+            self.__first[n] = x
+        if self.max_lag > 0:
+            self.__last[1:] = self.__last[:-1]
+            self.__last[0] = x
+
+
+    def __add_to_blocks (self, x):
+        """ Adds x to the current block, merging pairs of blocks when
+            all of them are full. """
+        i = self.__block
+        self.__block_counts[i] += 1
+        delta = x - self.__block_means[i]
+        self.__block_means[i] += delta / self.__block_counts[i]
+        self.__block_M2s[i] += delta * (x - self.__block_means[i])
+        if self.__block_counts[i] < self.__block_size:
+            return
+        self.__block += 1
+        if self.__block < self.__n_blocks:
+            return
+
+        half = self.__n_blocks // 2
+        counts = self.__block_counts
+        means = self.__block_means
+        M2s = self.__block_M2s
+        merged = [ChainDiagnostics.__merge_stats (counts[2 * j: 2 * j + 2],
+                means[2 * j: 2 * j + 2], M2s[2 * j: 2 * j + 2]) for j in \
+                range (half)]
+        counts[:] = 0
+        means[:] = 0
+        M2s[:] = 0
+        for j in range (half):
+            counts[j], means[j], M2s[j] = merged[j]
+        self.__block = half
+        self.__block_size *= 2
+
+
+    @staticmethod
+    def __merge_stats (counts, means, M2s):
+        """ Merges the counts, means and sums of squared deviations of
+            groups of values into the ones of their union. """
+        n = int (np.sum (counts))
+        if n == 0:
+            return 0, np.zeros (means.shape[1]), np.zeros (means.shape[1])
+        mean = np.dot (counts, means) / n
+        M2 = np.sum (M2s, axis=0) + np.dot (counts, (means - mean) ** 2)
+        return n, mean, M2
+
+
+    def get_size (self):
+        """ Returns the number of iterations added to the diagnostics.
+        """
+        return self.__n
+
+
+    def get_autocorrelations (self):
+        """ Returns a numpy array with shape (L + 1, dim), where L is
+            the smallest of max_lag and the size of the chain minus
+            one, with the autocorrelations of lags 0, ..., L of each
+            coordinate. Constant coordinates have autocorrelation
+            zero. """
+        n = self.__n
+        dim = len (self.__sum)
+        if n == 0:
+            return np.zeros ((1, dim))
+        mean = self.__sum / n
+        n_lags = min (n - 1, self.max_lag)
+        autocovs = np.zeros ((n_lags + 1, dim))
+        for k in range (n_lags + 1):
+            # Sums of x_t for t >= k and for t < n - k
+            head = self.__sum - np.sum (self.__first[:k], axis=0)
+            tail = self.__sum - np.sum (self.__last[:k], axis=0)
+            autocovs[k] = (self.__lag_sums[k] - mean * (head + tail) + \
+                    (n - k) * mean * mean) / n
+        autocorrs = np.zeros (autocovs.shape)
+        positive = autocovs[0] > 0
+        autocorrs[:, positive] = autocovs[:, positive] / \
+                autocovs[0, positive]
+        return autocorrs
+
+
+    def get_effective_sample_size (self):
+        """ Returns a numpy array with the effective sample size of
+            each coordinate, which is the size of the chain divided by
+            its integrated autocorrelation time. As in Stan, the 
+            autocorrelation time is at least 1 / log10 (n), where n is
+            the size of the chain. """
+        n = self.__n
+        autocorrs = self.get_autocorrelations ()
+        ess = np.zeros (autocorrs.shape[1])
+        for j in range (len (ess)):
+            rho = autocorrs[:, j]
+            if rho[0] == 0:
+                ess[j] = n
+                continue
+            tau = -1
+            last_pair = float ("inf")
+            for m in range (len (rho) // 2):
+                pair = rho[2 * m] + rho[2 * m + 1]
+                if pair <= 0:
+                    break
+                last_pair = min (pair, last_pair)
+                tau += 2 * last_pair
+            ess[j] = n / max (tau, 1 / np.log10 (max (n, 10)))
+        return ess
+
+
+    def get_acceptance_ratios (self):
+        """ Returns a list with the acceptance ratio of each complete
+            window of iterations. """
+        return list (self.__acceptance_ratios)
+
+
+    def get_halves (self):
+        """ Returns the size, mean and variance of each half of the
+            chain. Only complete blocks are used, so the most recent
+            iterations might be left out.
+
+            Returns
+                a list with two tuples (size, mean, variance), where
+                mean and variance are numpy arrays.
+        """
+        half = self.__block // 2
+        shift = self.__shift if self.__shift is not None else 0
+        halves = []
+        for k in range (2):
+            idxs = slice (k * half, (k + 1) * half)
+            n, mean, M2 = ChainDiagnostics.__merge_stats (
+                    self.__block_counts[idxs], self.__block_means[idxs],
+                    self.__block_M2s[idxs])
+            var = M2 / (n - 1) if n > 1 else np.zeros (len (M2))
+            halves.append ((n, mean + shift, var))
+        return halves
+
+
+    @staticmethod
+    def split_r_hat (diagnostics):
+        """ Calculates the split-R-hat of a group of chains sampling
+            the same distribution, as in "Bayesian Data Analysis"
+            (Third Edition), Gelman et al. Each chain is split in two
+            halves, and the variance between the halves is compared
+            with the variance within them.
+
+            Parameters
+                diagnostics: a list of ChainDiagnostics objects, one
+                    for each chain.
+
+            Returns
+                a numpy array with the split-R-hat of each coordinate,
+                which is inf if some chain is too short to be split.
+        """
+        halves = []
+        for diagnostic in diagnostics:
+            halves += diagnostic.get_halves ()
+        sizes = np.array ([h[0] for h in halves])
+        means = np.array ([h[1] for h in halves])
+        variances = np.array ([h[2] for h in halves])
+        if np.any (sizes < 2):
+            return np.full (means.shape[1], float ("inf"))
+        n = np.mean (sizes)
+        W = np.mean (variances, axis=0)
+        B = n * np.var (means, axis=0, ddof=1)
+        var_plus = (n - 1) / n * W + B / n
+        r_hat = np.ones (len (W))
+        positive = W > 0
+        r_hat[positive] = np.sqrt (var_plus[positive] / W[positive])
+        r_hat[~positive & (B > 0)] = float ("inf")
+        return r_hat
+
+
+    def has_converged (self, min_ess, max_r_hat):
+        """ Returns True if the effective sample size of every
+            coordinate is at least min_ess and their split-R-hat is at
+            most max_r_hat. Chains with less than 2 * max_lag
+            iterations never converge, since their autocorrelations are
+            not reliable. """
+        if self.__n < 2 * self.max_lag:
+            return False
+        if np.any (self.get_effective_sample_size () < min_ess):
+            return False
+        return bool (np.all (ChainDiagnostics.split_r_hat ([self]) <= \
+                max_r_hat))
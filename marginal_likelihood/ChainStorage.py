@@ -0,0 +1,154 @@
+import os
+from collections import deque
+import numpy as np
+
+class ChainStorage:
+    """ This class stores the states of a Markov chain, i.e. parameters
+        and their log-likelihoods, with a retention policy that bounds
+        the memory used by long chains:
+            - a ring buffer that keeps only the last max_size retained
+              states;
+            - thinning, which retains one of every thinning states;
+            - spilling, which writes the retained states to a file that
+              is read as a memory map, so they are not kept in memory.
+        The last state of the chain is always available, even if it is
+        not retained, since it is the current state of the sampler.
+
+        Attributes
+            max_size (int): the maximum number of retained states, or
+                zero if there is no maximum.
+            thinning (int): one of every thinning states is retained.
+            spill_file (string): the file to which the retained states
+                are written, or None if they are kept in memory.
+    """
+
+    def __init__ (self, max_size=0, thinning=1, spill_file=None):
+        """ Default constructor.
+
+            Parameters
+                max_size: the maximum number of retained states. If it
+                    is zero, every retained state is kept.
+                thinning: the interval between retained states.
+                spill_file: a file name. If it is provided, the
+                    retained states are written to this file, which is
+                    replaced.
+        """
+        if thinning < 1:
+            raise ValueError ("thinning should be a positive integer.")
+        self.max_size = max_size
+        self.thinning = thinning
+        self.spill_file = spill_file
+        self.__n = 0
+        self.__last = (None, None)
+        self.__template = None
+        maxlen = max_size if max_size > 0 else None
+        self.__thetas = deque (maxlen=maxlen)
+        self.__log_ls = deque (maxlen=maxlen)
+        self.__n_spilled = 0
+        if spill_file is not None:
+            open (spill_file, 'wb').close ()
+
+
+    def __len__ (self):
+        """ Returns the number of states added to the chain, including
+            the ones that were not retained. """
+        return self.__n
+
+
+    def append (self, theta, log_l):
+        """ Adds a state to the chain.
+
+            Parameters
+                theta: a RandomParameterList object.
+                log_l: the log-likelihood of theta.
+        """
+        retained = self.__n % self.thinning == 0
+        self.__n += 1
+        self.__last = (theta, log_l)
+        if not retained:
+            return
+        if self.spill_file is None:
+            self.__thetas.append (theta)
+            self.__log_ls.append (log_l)
+            return
+        if self.__template is None:
+            self.__template = theta.get_copy ()
+        row = np.array (theta.get_values () + [log_l], dtype=float)
+        with open (self.spill_file, 'ab') as f:
+            row.tofile (f)
+        self.__n_spilled += 1
+
+
+    def get_last (self):
+        """ Returns the last state of the chain and its log-likelihood.
+        """
+        if self.__n == 0:
+            raise ValueError ("The chain is empty.")
+        return self.__last
+
+
+    def get_n_retained (self):
+        """ Returns the number of retained states that can be read. """
+        if self.spill_file is None:
+            return len (self.__thetas)
+        if self.max_size > 0:
+            return min (self.__n_spilled, self.max_size)
+        return self.__n_spilled
+
+
+    def get_last_retained (self, N):
+        """ Returns the last N retained states (or all of them, if
+            there are less than N) and their log-likelihoods.
+
+            Returns
+                thetas: a list with copies of the retained parameters.
+                log_ls: a list with their log-likelihoods.
+        """
+        N = min (N, self.get_n_retained ())
+        if N <= 0:
+            return [], []
+        if self.spill_file is None:
+            first = len (self.__thetas) - N
+            thetas = [self.__thetas[i].get_copy () for i in \
+                    range (first, len (self.__thetas))]
+            log_ls = [self.__log_ls[i] for i in \
+                    range (first, len (self.__log_ls))]
+            return thetas, log_ls
+
+        m = self.__template.get_size ()
+        rows = np.memmap (self.spill_file, dtype=float, mode='r',
+                shape=(self.__n_spilled, m + 1))
+        last_rows = np.array (rows[-N:])
+        del rows
+        thetas = []
+        for row in last_rows:
+            theta = self.__template.get_copy ()
+            for p, value in zip (theta, row[:-1]):
+                p.value = value
+            thetas.append (theta)
+        return thetas, [float (log_l) for log_l in last_rows[:, -1]]
+
+
+    def __setstate__ (self, state):
+        """ Restores a serialized storage. If its states are spilled,
+            the rows written to the spill file after it was serialized
+            (e.g. by a run interrupted after a checkpoint) are 
+            discarded, so the storage can be appended again. """
+        self.__dict__.update (state)
+        if self.spill_file is None or \
+                not os.path.exists (self.spill_file):
+            return
+        row_size = 0
+        if self.__template is not None:
+            row_size = (self.__template.get_size () + 1) * \
+                    np.dtype (float).itemsize
+        os.truncate (self.spill_file, self.__n_spilled * row_size)
+
+
+    def remove_spill_file (self):
+        """ Removes the spill file, if there is one. Spilled states
+            can't be read afterwards. """
+        if self.spill_file is not None and \
+                os.path.exists (self.spill_file):
+            os.remove (self.spill_file)
+        self.__n_spilled = 0
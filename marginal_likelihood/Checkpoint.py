@@ -0,0 +1,62 @@
+import gzip
+import os
+import dill
+
+class Checkpoint:
+    """ This class saves and loads the states of a run in a directory,
+        so an interrupted run can be resumed. Each state is saved in a
+        gzip compressed file with a name, and it can contain any object
+        that can be serialized with dill (e.g. samplers, which keep
+        lambdas). States are written to a temporary file that replaces
+        the previous one, so an interruption while saving never leaves
+        a corrupted state.
+
+        Attributes
+            directory (string): the directory of the states.
+    """
+
+    __EXTENSION = ".ckpt.gz"
+
+    def __init__ (self, directory):
+        """ Default constructor. Creates the directory if it does not
+            exist. """
+        self.directory = directory
+        os.makedirs (directory, exist_ok=True)
+
+
+    def __get_file (self, name):
+        """ Returns the file of the state with the given name. """
+        return os.path.join (self.directory, name + \
+                Checkpoint.__EXTENSION)
+
+
+    def save (self, name, state):
+        """ Saves a state, replacing the previous state with the same
+            name.
+
+            Parameters
+                name: a string that can be part of a file name.
+                state: the object to be saved.
+        """
+        state_file = self.__get_file (name)
+        tmp_file = state_file + '.' + str (os.getpid ()) + '.tmp'
+        with gzip.open (tmp_file, 'wb', compresslevel=1) as f:
+            dill.dump (state, f)
+        os.replace (tmp_file, state_file)
+
+
+    def load (self, name):
+        """ Returns the saved state with the given name, or None if
+            there is no such state. """
+        state_file = self.__get_file (name)
+        if not os.path.exists (state_file):
+            return None
+        with gzip.open (state_file, 'rb') as f:
+            return dill.load (f)
+
+
+    def clear (self):
+        """ Removes every saved state. """
+        for file_name in os.listdir (self.directory):
+            if file_name.endswith (Checkpoint.__EXTENSION):
+                os.remove (os.path.join (self.directory, file_name))
@@ -5,19 +5,197 @@
 # Biochemical Species
 
 import numpy as np
-import math
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from parallel_map import parallel_map
 
 class LikelihoodFunction:
     """ This class defines a likelihood function for experimental data
         observed from dynamical systems that can be modeled by a sytem
-        of ODEs. """ 
-
+        of ODEs. 
         
-    def __init__ (self, ode):
+        The sums of squared residuals of evaluated parameters are kept
+        on a least recently used cache, keyed by a hash of the model, 
+        the values of its parameters, the integrator and the 
+        experimental data. The 
+        experimental error is not part of the key, so changing only
+        the experimental error never integrates the system again. 
+        Optionally, the sums are also stored on a directory shared by
+        every process, which keeps at most a given number of sums and
+        removes the least recently used ones (see set_cache_dir). """ 
+
+    # Default directory of the on-disk cache and greatest number of 
+    # sums kept on it
+    cache_dir = None
+    max_disk_entries = 100000
+
+    def __init__ (self, ode, tolerance_scale=1, cache_size=1000, 
+            cache_dir=None, max_disk_entries=None):
         """ Default constructor. ode is the system that rules the 
-            observed system. """
+            observed system. tolerance_scale multiplies the tolerances
+            used to integrate the system; with values greater than one
+            this object calculates a cheap approximation of the 
+            likelihood. cache_size is the greatest number of residual
+            sums kept in memory. cache_dir is the directory of the 
+            on-disk cache, which keeps at most max_disk_entries sums;
+            if they are None, the values defined with set_cache_dir 
+            are used. """
         self.__ode = ode
-        
+        self.__tolerance_scale = tolerance_scale
+        self.__cache_size = cache_size
+        if cache_dir is None:
+            cache_dir = LikelihoodFunction.cache_dir
+        if max_disk_entries is None:
+            max_disk_entries = LikelihoodFunction.max_disk_entries
+        if cache_dir is not None:
+            Path (cache_dir).mkdir (parents=True, exist_ok=True)
+        self.__cache_dir = cache_dir
+        self.__max_disk_entries = max_disk_entries
+        self.__n_disk_writes = 0
+        self.__cache = OrderedDict ()
+        self.__data_fingerprint = (None, None)
+        self.__cache_hits = 0
+        self.__disk_hits = 0
+        self.__cache_misses = 0
+
+
+    @staticmethod
+    def set_cache_dir (cache_dir, max_disk_entries=100000):
+        """ Defines the default directory in which the residual sums 
+            of LikelihoodFunction objects are stored, so they are 
+            shared between processes and runs. If cache_dir is None, 
+            only the memory cache is used. The directory keeps at most
+            max_disk_entries sums, and the least recently used ones 
+            are removed when it has more. """
+        if cache_dir is not None:
+            Path (cache_dir).mkdir (parents=True, exist_ok=True)
+            LikelihoodFunction.__evict_disk_entries (cache_dir, 
+                    max_disk_entries)
+        LikelihoodFunction.cache_dir = cache_dir
+        LikelihoodFunction.max_disk_entries = max_disk_entries
+
+
+    @staticmethod
+    def __evict_disk_entries (cache_dir, max_disk_entries):
+        """ Removes the files of cache_dir with the oldest 
+            modification times, so it keeps at most max_disk_entries
+            sums. Files that other processes write or remove meanwhile
+            are ignored. """
+        entries = []
+        for entry in os.scandir (cache_dir):
+            if entry.name.endswith (".tmp"):
+                continue
+            try:
+                entries.append ((entry.stat ().st_mtime_ns, entry.path))
+            except OSError:
+                pass
+        if len (entries) <= max_disk_entries:
+            return
+        entries.sort ()
+        for _, path in entries[:len (entries) - max_disk_entries]:
+            try:
+                os.remove (path)
+            except OSError:
+                pass
+
+
+    def get_cache_statistics (self):
+        """ Returns a dictionary with the number of residual sums found
+            on memory ("hits") and on disk ("disk_hits"), and the number
+            of sums that were calculated ("misses"). """
+        return {"hits": self.__cache_hits, 
+                "disk_hits": self.__disk_hits,
+                "misses": self.__cache_misses}
+
+
+    def __get_data_fingerprint (self, experiments):
+        """ Returns a string that identifies the experimental data. The
+            fingerprint of the last experiments object is kept. """
+        last_experiments, fingerprint = self.__data_fingerprint
+        if last_experiments is not experiments:
+            data = [(exp.measure_expression, [float (x) for x in 
+                exp.times], [float (x) for x in exp.values]) for exp in 
+                experiments]
+            fingerprint = repr (data)
+            self.__data_fingerprint = (experiments, fingerprint)
+        return fingerprint
+
+
+    def __get_cache_key (self, experiments, theta, integrator="odeint"):
+        """ Returns an exact hash of the model, its parameters with the
+            values of theta, the integrator and its tolerances and the
+            experimental data. Sums calculated with different 
+            integrators may differ up to their precision, so
+            they are kept apart. """
+        ode = self.__ode
+        params = dict (ode.get_all_parameters ())
+        for param in theta.get_model_parameters ():
+            params[param.name] = param.value
+        params = sorted ((name, float (params[name])) for name in 
+                params)
+        key = (ode.name, tuple (ode.rate_eq), tuple (float (x) for x in
+            ode.initial_state), tuple (params), integrator, 
+            self.__tolerance_scale, self.__get_data_fingerprint (
+            experiments))
+        return hashlib.sha1 (repr (key).encode ()).hexdigest ()
+
+
+    def __cache_lookup (self, key):
+        """ Returns the residual sums (rss, n_obs) of key, or None if 
+            they are not on the cache. """
+        if key in self.__cache:
+            self.__cache.move_to_end (key)
+            self.__cache_hits += 1
+            return self.__cache[key]
+
+        cache_dir = self.__cache_dir
+        if cache_dir is None:
+            return None
+        file_name = os.path.join (cache_dir, key)
+        try:
+            with open (file_name) as f:
+                rss, n_obs = f.read ().split ()
+            value = (float (rss), int (n_obs))
+        except (OSError, ValueError):
+            return None
+        # The modification time orders the eviction of the files
+        try:
+            os.utime (file_name)
+        except OSError:
+            pass
+        self.__disk_hits += 1
+        self.__cache_store (key, value, write_disk=False)
+        return value
+
+
+    def __cache_store (self, key, value, write_disk=True):
+        """ Stores residual sums on the cache, evicting the least 
+            recently used ones. """
+        self.__cache[key] = value
+        self.__cache.move_to_end (key)
+        while len (self.__cache) > self.__cache_size:
+            self.__cache.popitem (last=False)
+
+        cache_dir = self.__cache_dir
+        if write_disk and cache_dir is not None:
+            # Writing to a temporary file and renaming it is atomic, so
+            # other process never read a partial file
+            file_name = os.path.join (cache_dir, key)
+            tmp_name = file_name + "." + str (os.getpid ()) + ".tmp"
+            with open (tmp_name, "w") as f:
+                f.write (repr (value[0]) + " " + str (value[1]))
+            os.replace (tmp_name, file_name)
+            # Listing the directory is expensive, so the number of sums
+            # is checked after a tenth of the limit is written
+            self.__n_disk_writes += 1
+            if self.__n_disk_writes >= max (1, 
+                    self.__max_disk_entries // 10):
+                self.__n_disk_writes = 0
+                LikelihoodFunction.__evict_disk_entries (cache_dir, 
+                        self.__max_disk_entries)
+
     def __point_likelihood (self, mu, x, sigma):
         exp = np.exp (-0.5 * ((x - mu) / sigma) ** 2)
         return exp * (1 / (sigma * np.sqrt (2 * np.pi)))
@@ -48,28 +226,241 @@ class LikelihoodFunction:
             for param in theta.get_model_parameters ():
                 self.__ode.define_parameter (param.name, param.value)
     
-        return self.__ode.evaluate_exp_on (measure_expression, t)
+        return self.__ode.evaluate_exp_on (measure_expression, t,
+                tolerance_scale=self.__tolerance_scale)
+
+
+    def get_residual_sums (self, experiments, theta):
+        """ Calculates the sum of squared residuals between the system
+            measure and the observations of all experiments. The sums
+            are cached, so when the same model parameters are evaluated
+            again, e.g. when only the experimental error of theta 
+            changes, the system is not integrated again.
+
+            Parameters
+                experiments: a list of experiments, as expected by 
+                    get_log_likelihood.
+                theta: a RandomParameterList object.
+
+            Returns
+                rss: the sum of squared residuals, or inf if the system
+                    can't be evaluated on theta.
+                n_obs: the number of observations.
+        """
+        key = self.__get_cache_key (experiments, theta)
+        cached = self.__cache_lookup (key)
+        if cached is not None:
+            return cached
+
+        self.__cache_misses += 1
+        t = experiments[0].times
+        measure_expression = experiments[0].measure_expression
+        X_sys = self.__get_sys_measure (measure_expression, t, theta)
+        rss = 0
+        n_obs = 0
+        for exp in experiments:
+            residuals = np.array (exp.values) - np.array (X_sys)
+            rss += np.sum (residuals ** 2)
+            n_obs += len (residuals)
+        if not np.isfinite (rss):
+            rss = float ("inf")
+        self.__cache_store (key, (rss, n_obs))
+        return rss, n_obs
 
 
     def get_log_likelihood (self, experiments, theta):
         """ Given a list of independent experiments that happens all 
             with the same time intervals and with respect to the same 
             measure, calculates the likelihood of all expeirments. """
+        rss, n_obs = self.get_residual_sums (experiments, theta)
+        return self.__log_likelihood_from_sums (rss, n_obs, 
+                theta.get_experimental_error ())
+
+
+    @staticmethod
+    def __log_likelihood_from_sums (rss, n_obs, sigma):
+        """ Returns the log-likelihood of n_obs observations whose sum
+            of squared residuals is rss, given the experimental error 
+            sigma. """
+        if rss == float ("inf"):
+            return float ("-inf")
+        return -0.5 * rss / sigma ** 2 + \
+                n_obs * np.log (1 / (sigma * np.sqrt (2 * np.pi)))
+
+
+    def get_bounded_log_likelihood (self, experiments, theta, 
+            log_l_min):
+        """ Calculates the log-likelihood of all experiments, stopping
+            the integration of the system as soon as the log-likelihood
+            is certainly smaller than log_l_min. Since each observation
+            can only decrease the log-likelihood, the partial 
+            log-likelihood of the first time points, summed with the
+            normalization terms of all points, is an upper bound for it.
+            The system is integrated step by step (see 
+            ODES.iterate_exp_on), so the log-likelihood may differ from
+            the one of get_log_likelihood up to the integrator 
+            precision, and its residual sums are cached apart.
+
+            Parameters
+                experiments: a list of experiments, as expected by 
+                    get_log_likelihood.
+                theta: a RandomParameterList object.
+                log_l_min: the log-likelihood threshold.
+
+            Returns
+                the log-likelihood of the experiments, or -inf if it 
+                is smaller than log_l_min.
+        """
+        key = self.__get_cache_key (experiments, theta, "lsoda_steps")
+        sigma = theta.get_experimental_error ()
+        cached = self.__cache_lookup (key)
+        if cached is not None:
+            return self.__log_likelihood_from_sums (*cached, sigma)
+
+        self.__cache_misses += 1
+        for param in theta.get_model_parameters ():
+            self.__ode.define_parameter (param.name, param.value)
         t = experiments[0].times
         measure_expression = experiments[0].measure_expression
-        X_sys = self.__get_sys_measure (measure_expression, t, theta)
+        observations = np.array ([exp.values for exp in experiments])
+        n_obs = observations.size
+        log_l_max = n_obs * np.log (1 / (sigma * np.sqrt (2 * np.pi)))
 
-        for sys_val in X_sys:
-            if math.isnan (sys_val) or sys_val == float ("inf") or \
-                    sys_val == float ("-inf"):
+        rss = 0
+        X_sys = self.__ode.iterate_exp_on (measure_expression, t, 
+                tolerance_scale=self.__tolerance_scale)
+        for i, sys_val in enumerate (X_sys):
+            if not np.isfinite (sys_val):
+                rss = float ("inf")
+                break
+            rss += np.sum ((observations[:, i] - sys_val) ** 2)
+            if log_l_max - 0.5 * rss / sigma ** 2 < log_l_min:
                 return float ("-inf")
+        if not np.isfinite (rss):
+            rss = float ("inf")
+
+        self.__cache_store (key, (rss, n_obs))
+        return self.__log_likelihood_from_sums (rss, n_obs, sigma)
+
+
+    def get_log_likelihoods (self, experiments, thetas, n_process=1):
+        """ Calculates the log-likelihood of a batch of parameters.
+
+            Parameters
+                experiments: a list of experiments, as expected by 
+                    get_log_likelihood.
+                thetas: a list of RandomParameterList objects.
+                n_process: the number of process used to evaluate the
+                    batch. If it is greater than one, the evaluations
+                    are performed in parallel.
+
+            Returns
+                a list with the log-likelihood of each element of 
+                thetas.
+        """
+        log_l_f = lambda theta : self.get_log_likelihood (experiments, 
+                theta)
+        if n_process > 1:
+            return parallel_map (log_l_f, thetas, n_process)
+        return [log_l_f (theta) for theta in thetas]
+
+
+    def get_log_likelihood_gradient (self, experiments, theta):
+        """ Calculates the log-likelihood of all experiments and its 
+            gradient with respect to the parameters of theta. The 
+            derivatives of the system with respect to the model 
+            parameters are obtained by integrating the forward 
+            sensitivity equations of the model.
+
+            Parameters
+                experiments: a list of experiments, as expected by 
+                    get_log_likelihood.
+                theta: a RandomParameterList object.
+
+            Returns
+                log_l: the log-likelihood of the experiments.
+                gradient: a numpy array with the derivatives of log_l
+                    with respect to the parameters of theta, in the
+                    same order as theta.get_values (). If the 
+                    log-likelihood can't be calculated, log_l is -inf 
+                    and gradient is a zero array.
+        """
+        for param in theta.get_model_parameters ():
+            self.__ode.define_parameter (param.name, param.value)
+
+        t = experiments[0].times
+        measure_expression = experiments[0].measure_expression
+        X_sys, dX_sys = self.__ode.evaluate_exp_sensitivities_on (
+                measure_expression, t)
+        X_sys = np.array (X_sys)
+
+        gradient = np.zeros (theta.get_size ())
+        if not np.all (np.isfinite (X_sys)) or \
+                not np.all (np.isfinite (dX_sys)):
+            return float ("-inf"), gradient
 
         sigma = theta.get_experimental_error ()
-        #print ("\nX_sys: " + str (X_sys))
         log_l = 0
+        d_log_l_d_X = np.zeros (len (t))
+        d_log_l_d_sigma = 0
         for exp in experiments:
-            X_obs = exp.values
-            #print ("\tX_obs: " + str (X_obs))
-            log_l += self.__calculate_likelihood (X_sys, X_obs, sigma)
-            #print ("\tpartial log-likelihood: " + str (log_l))
-        return log_l
+            residuals = np.array (exp.values) - X_sys
+            log_l += self.__calculate_likelihood (X_sys, exp.values, 
+                    sigma)
+            d_log_l_d_X += residuals / sigma ** 2
+            d_log_l_d_sigma += np.sum (residuals ** 2 / sigma ** 3 \
+                    - 1 / sigma)
+
+        d_log_l_d_p = np.dot (d_log_l_d_X, dX_sys)
+        param_names = list (self.__ode.get_all_parameters ())
+        model_params = theta.get_model_parameters ()
+        for i in range (len (model_params)):
+            idx = param_names.index (model_params[i].name)
+            gradient[i] = d_log_l_d_p[idx]
+        gradient[-1] = d_log_l_d_sigma
+        return log_l, gradient
+
+
+    def get_fisher_information (self, experiments, theta):
+        """ Calculates the expected Fisher information matrix of the
+            experiments with respect to the parameters of theta. For
+            gaussian observations, the model parameters block is 
+                n_experiments * J^T J / sigma ^ 2,
+            where J is the matrix of derivatives of the measure with 
+            respect to the model parameters on each time point, and the
+            information of the experimental error is 
+                2 * n_observations / sigma ^ 2.
+
+            Parameters
+                experiments: a list of experiments, as expected by 
+                    get_log_likelihood.
+                theta: a RandomParameterList object.
+
+            Returns
+                a numpy matrix with the Fisher information, with rows
+                and columns in the same order as theta.get_values (). 
+                If the system can't be evaluated on theta, a zero 
+                matrix is returned.
+        """
+        for param in theta.get_model_parameters ():
+            self.__ode.define_parameter (param.name, param.value)
+
+        n = theta.get_size ()
+        t = experiments[0].times
+        measure_expression = experiments[0].measure_expression
+        _, dX_sys = self.__ode.evaluate_exp_sensitivities_on (
+                measure_expression, t)
+        if not np.all (np.isfinite (dX_sys)):
+            return np.zeros ((n, n))
+
+        param_names = list (self.__ode.get_all_parameters ())
+        model_params = theta.get_model_parameters ()
+        idxs = [param_names.index (p.name) for p in model_params]
+        J = dX_sys[:, idxs]
+        sigma = theta.get_experimental_error ()
+        n_experiments = len ([exp for exp in experiments])
+        fisher = np.zeros ((n, n))
+        fisher[:n - 1, :n - 1] = n_experiments * np.dot (J.T, J) \
+                / sigma ** 2
+        fisher[-1, -1] = 2 * n_experiments * len (t) / sigma ** 2
+        return fisher
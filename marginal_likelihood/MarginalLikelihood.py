@@ -8,9 +8,20 @@ from marginal_likelihood.samplers.AdaptingCovarianceMCMC import \
         AdaptingCovarianceMCMC
 from marginal_likelihood.samplers.FixedCovarianceMCMC import \
         FixedCovarianceMCMC
+from marginal_likelihood.samplers.LangevinMCMC import LangevinMCMC
 from marginal_likelihood.samplers.PopulationalMCMC import \
         PopulationalMCMC
+from marginal_likelihood.LikelihoodFunction import LikelihoodFunction
+from marginal_likelihood.SurrogateLikelihoodFunction import \
+        SurrogateLikelihoodFunction
+from marginal_likelihood.SampleFile import SampleWriter
+from marginal_likelihood.OnlineSummary import OnlineSummary
+from marginal_likelihood.ChainDiagnostics import ChainDiagnostics
+from marginal_likelihood.ChainStorage import ChainStorage
+from marginal_likelihood.Checkpoint import Checkpoint
 import multiprocessing
+import os
+import tempfile
 
 from parallel_map import parallel_map
 import seed_manager
@@ -22,30 +33,167 @@ class MarginalLikelihood:
     
     def __init__ (self, phase1_iterations, sigma_update_n, 
             phase2_iterations, phase3_iterations, n_strata, 
-            strata_size, verbose=False, n_process=0):
-        """ Default constructor. phase1_iterations is the number of 
-            iterations performed by the AcceptingRateAMCMC, which is
-            an adaptive sampler that performs independent MCMC on each
-            system variable and adapts the jump covariance with the goal
-            of having acceptance rate between 0.25 and 0.75. 
-            sigma_update_n is the number of iterations before updating 
-            sigma in intial phase. phase2_iterations is the number of 
-            iterations performed in the second phase of sampling with 
-            an adaptive sampling algorithm that has jumps distributed 
-            with a probability function that has as covariance matrix
-            a matrix of covariance estimated from the current sample.
-            phase3_iterations is the number of iterations performed by
-            the PopulationalMCMC algorithm. n_strata is the number of 
-            strata used in the populational algorithm, and strata_size 
-            is the number of individuals per strata."""
-        self.__phase1_iterations = phase1_iterations
-        self.__phase2_iterations = phase2_iterations
-        self.__phase3_iterations = phase3_iterations
-        self.__sigma_update_n = sigma_update_n
+            strata_size, verbose=False, n_process=0, 
+            warm_start_waves=0, prior_sample_size=0, 
+            importance_beta=0, fisher_update_n=0, noise_updates=0,
+            delayed_acceptance_scale=0, early_termination=False,
+            surrogate_screen=False, sample_file=None, target_ess=0,
+            max_r_hat=1.1, chains_per_temperature=1, retained_states=0,
+            thinning=1, spill_dir=None, checkpoint_dir=None,
+            checkpoint_n=100, resume=False, langevin_step_size=0):
+        """ Default constructor.
+
+            Parameters
+                phase1_iterations: the number of iterations performed 
+                    by the AcceptingRateAMCMC, an adaptive sampler that
+                    performs independent MCMC on each system variable 
+                    and adapts the jump covariance with the goal of 
+                    having acceptance rate between 0.25 and 0.75.
+                sigma_update_n: the number of iterations before updating
+                    sigma in the initial phase.
+                phase2_iterations: the number of iterations performed in
+                    the second phase, by an adaptive sampler whose jumps
+                    have as covariance matrix the covariance estimated 
+                    from the current sample.
+                phase3_iterations: the number of iterations performed by
+                    the PopulationalMCMC algorithm.
+                n_strata: the number of strata used in the populational
+                    algorithm.
+                strata_size: the number of individuals per strata.
+                verbose: if True, the progress of the sampling is 
+                    printed.
+                n_process: the number of process used to sample in 
+                    parallel; if it is zero, half of the CPUs are used.
+                warm_start_waves: the number of waves in which phases 1
+                    and 2 are run along the temperature ladder. When it
+                    is zero, every temperature starts its own sampler 
+                    from the priors; otherwise it must be at least 2, 
+                    and each temperature of a wave other than the first
+                    starts from the last point and proposal covariance 
+                    of its lower neighbouring temperature, sampled on 
+                    the previous wave.
+                prior_sample_size: the number of independent draws from
+                    the priors used for the temperature beta = 0 instead
+                    of MCMC; if it is zero, every temperature is sampled
+                    with MCMC.
+                importance_beta: the greatest temperature for which the
+                    expected log-likelihood is estimated by importance 
+                    sampling of the prior draws, skipping MCMC (only 
+                    used if prior_sample_size is positive).
+                fisher_update_n: the number of iterations between 
+                    updates of the first phase jump covariance, 
+                    calculated from the expected Fisher information of 
+                    the current point; if it is zero, the first phase 
+                    jumps are independent and scaled by the priors.
+                noise_updates: the number of updates of the experimental
+                    error alone performed after each iteration of the 
+                    MCMC phases; these updates reuse the residual sums 
+                    of the current parameter and don't integrate the 
+                    model.
+                delayed_acceptance_scale: the factor that multiplies the
+                    integration tolerances of the cheap likelihood used
+                    to screen the proposals of phases 2 and 3 with 
+                    delayed acceptance; if it is zero, delayed 
+                    acceptance is not used.
+                early_termination: if True, the integration of the 
+                    model for proposals of the MCMC phases stops as soon
+                    as their rejection is certain.
+                surrogate_screen: if True, phases 2 and 3 use delayed 
+                    acceptance and the proposals are screened with a 
+                    Gaussian process regression of the log-likelihoods 
+                    of the previous phases, which falls back to 
+                    integrating the model (with the tolerances scaled by
+                    delayed_acceptance_scale, if it's greater than one)
+                    when it is not confident; the integrated points 
+                    improve the regression during phase 2 only.
+                sample_file: if it is a file name, the sample of each 
+                    temperature is written to this file with a 
+                    SampleWriter: the temperatures sampled from the 
+                    priors as soon as they are drawn, and the 
+                    temperatures sampled with MCMC, which phase 3 
+                    samples together, when phase 3 ends.
+                target_ess: if it is positive, phases 1 and 2 stop as 
+                    soon as the effective sample size of every parameter
+                    is at least target_ess and their split-R-hat is at 
+                    most max_r_hat; their convergence is checked every 
+                    sigma_update_n iterations, and phase1_iterations and
+                    phase2_iterations become the maximum number of 
+                    iterations.
+                max_r_hat: the greatest split-R-hat of a converged 
+                    chain (only used if target_ess is positive).
+                chains_per_temperature: the number of independent chains
+                    that sample each temperature; the chains of a 
+                    temperature are sampled in parallel and pooled in 
+                    the estimate of its expected log-likelihood, and 
+                    phase 3 runs one PopulationalMCMC per chain.
+                retained_states: if it is positive, the samplers of 
+                    phases 1 and 2 only keep their last retained_states
+                    parameters (so phase 2 starts from the last ones of
+                    phase 1).
+                thinning: phase 3 samplers only keep one of every 
+                    thinning parameters of the last quarter of the 
+                    phase.
+                spill_dir: if it is a directory, the parameters kept by
+                    phase 3 samplers are written to temporary files on 
+                    it instead of being kept in memory.
+                checkpoint_dir: if it is a directory, the state of the 
+                    run is saved on it with a Checkpoint: the draws of 
+                    the priors, and the samplers and random number 
+                    generator state of every chain of every phase. The
+                    states are removed when the estimate is finished.
+                checkpoint_n: the number of iterations between saves of
+                    the state of a chain, which is also saved when the 
+                    chain finishes its phases.
+                resume: if True, the run continues from the states saved
+                    on checkpoint_dir, giving the same estimate an 
+                    uninterrupted run would give, as long as it uses the
+                    same sampling settings and seed; otherwise the saved
+                    states are replaced.
+                langevin_step_size: if it is positive, phase 3 samples 
+                    each temperature with a LangevinMCMC whose initial 
+                    step size is langevin_step_size, instead of a random
+                    walk with the jump covariance of phase 2; these 
+                    samplers ignore delayed_acceptance_scale, 
+                    early_termination and surrogate_screen.
+
+            Notes
+                The options that change the sampled chains are kept in 
+                a single settings dictionary, which is given to the 
+                phases and compared with the one of the checkpoint when 
+                a run is resumed.
+        """
+        if warm_start_waves < 0 or warm_start_waves == 1:
+            raise ValueError ("warm_start_waves should be 0 or at " \
+                    + "least 2.")
+        self.__settings = {"phase1_iterations": phase1_iterations,
+                "sigma_update_n": sigma_update_n,
+                "phase2_iterations": phase2_iterations,
+                "phase3_iterations": phase3_iterations,
+                "warm_start_waves": warm_start_waves,
+                "prior_sample_size": prior_sample_size,
+                "importance_beta": importance_beta,
+                "fisher_update_n": fisher_update_n,
+                "noise_updates": noise_updates,
+                "delayed_acceptance_scale": delayed_acceptance_scale,
+                "early_termination": early_termination,
+                "surrogate_screen": surrogate_screen,
+                "target_ess": target_ess,
+                "max_r_hat": max_r_hat,
+                "chains_per_temperature": chains_per_temperature,
+                "retained_states": retained_states,
+                "thinning": thinning,
+                "langevin_step_size": langevin_step_size}
         self.__n_strata = n_strata
         self.__strata_size = strata_size
         self.__verbose = verbose
+        self.__sample_file = sample_file
+        self.__spill_dir = spill_dir
+        self.__checkpoint_dir = checkpoint_dir
+        self.__checkpoint_n = checkpoint_n
+        self.__resume = resume
         self.__sample = None
+        self.__summaries = None
+        self.__diagnostics = None
 
         if n_process == 0:
             self.__n_process = max (1, \
@@ -58,40 +206,317 @@ class MarginalLikelihood:
     
     @staticmethod
     def __run_phase_one_and_two (temp, experiments, model, theta_prior,
-            n_acc, n_adap_cov, n_sigma_update, verbose):
-        """ Map function to run phase 2 and 3 for each temperature. """
+            settings, verbose=False, neighbour=None, chain=0, 
+            checkpoint=None, checkpoint_n=0):
+        """ Map function to run phase 2 and 3 for each temperature. 
+            settings is the dictionary of sampling settings built by 
+            the constructor. If neighbour, the phase 3 sampler of a 
+            neighbouring temperature, is provided, phase 1 starts from
+            its last sampled point and with its jump variances. chain 
+            is the index of the chain among the chains of the same 
+            temperature. If checkpoint is a Checkpoint, the state of 
+            the chain is saved every checkpoint_n iterations and when 
+            it finishes, and the chain continues from its saved state,
+            if there is one.
+
+            Returns the phase 3 sampler and a list with the 
+            ChainDiagnostics of phases 1 and 2. """
         # We then take the last used seed (be careful, setting the last
         # used seed as the current seed won't make us "continue" the
         # random number generator, we are just using it so the seed
         # argument used in SigNetMS can actually control this part of
         # the program.
-        current_seed = seed_manager.get_seed ()
-        # Every thread must have a different seed...
-        thread_seed = current_seed + int(temp * 1e5)
-        np.random.seed (thread_seed)
+        name = "phases_1_2_" + str (chain) + "_" + str (temp)
+        state = None
+        if checkpoint is not None:
+            state = checkpoint.load (name)
+        if state is not None and "result" in state:
+            return state["result"]
+        save_f = None
+        if checkpoint is not None:
+            save_f = lambda : checkpoint.save (name, dict (state, 
+                rng=np.random.get_state ()))
+
+        if state is None:
+            current_seed = seed_manager.get_seed ()
+            # Every thread must have a different seed...
+            thread_seed = current_seed + int(temp * 1e5)
+            if chain == 0:
+                np.random.seed (thread_seed)
+            else:
+                np.random.seed ([thread_seed, chain])
+
+            acc_mcmc = AcceptingRateAMCMC (theta_prior, model, 
+                    experiments, settings["sigma_update_n"], 
+                    verbose=verbose, 
+                    fisher_update_n=settings["fisher_update_n"])
+            acc_mcmc.set_temperature (temp)
+            acc_mcmc.set_storage (ChainStorage (
+                settings["retained_states"]))
+            acc_mcmc.set_noise_updates (settings["noise_updates"])
+            acc_mcmc.set_early_termination (
+                    settings["early_termination"])
+            if neighbour is None:
+                acc_mcmc.start_sample_from_prior ()
+            else:
+                start_theta, start_likeli = neighbour.get_current ()
+                acc_mcmc.define_start_sample ([start_theta], 
+                        [start_likeli])
+                neighbour_S = neighbour.get_jump_covariance ()
+                acc_mcmc.set_jump_S (neighbour_S.diagonal ())
+            acc_mcmc.set_diagnostics (ChainDiagnostics (
+                theta_prior.get_size ()))
+            state = {"phase": 1, "n_sampled": 0, "acc_mcmc": acc_mcmc}
+        else:
+            np.random.set_state (state["rng"])
 
         # Phase 1
-        acc_mcmc = AcceptingRateAMCMC (theta_prior, model, experiments, 
-                n_sigma_update, verbose=verbose)
-        acc_mcmc.set_temperature (temp)
-        acc_mcmc.start_sample_from_prior ()
-        sample, likelis = acc_mcmc.get_sample (n_acc)
+        acc_mcmc = state["acc_mcmc"]
+        if state["phase"] == 1:
+            n_sampled = MarginalLikelihood.__run_phase (acc_mcmc, 
+                    settings["phase1_iterations"], settings, state, 
+                    save_f, checkpoint_n)
+            sample, likelis = acc_mcmc.get_last_sampled (n_sampled)
+
+            adap_cov_mcmc = AdaptingCovarianceMCMC (theta_prior, model,
+                    experiments, settings["sigma_update_n"], 
+                    verbose=verbose)
+            adap_cov_mcmc.set_temperature (temp)
+            adap_cov_mcmc.set_storage (ChainStorage (
+                settings["retained_states"]))
+            adap_cov_mcmc.set_noise_updates (settings["noise_updates"])
+            adap_cov_mcmc.set_early_termination (
+                    settings["early_termination"])
+            # Phases 2 and 3 share the exact likelihood with the 
+            # approximations integrated with the same tolerances, so
+            # the second stage of delayed acceptance reuses their values
+            exact_l_f = LikelihoodFunction (model)
+            adap_cov_mcmc.set_likelihood_function (exact_l_f)
+            approx_l_f = None
+            surrogate = None
+            delayed_acceptance_scale = \
+                    settings["delayed_acceptance_scale"]
+            tolerance_scale = max (delayed_acceptance_scale, 1)
+            coarse_l_f = exact_l_f
+            if tolerance_scale != 1:
+                coarse_l_f = LikelihoodFunction (model, 
+                        tolerance_scale=tolerance_scale)
+            if settings["surrogate_screen"]:
+                surrogate = SurrogateLikelihoodFunction (model, 
+                        likelihood_f=coarse_l_f)
+                surrogate.add_points (sample, likelis)
+                approx_l_f = lambda theta : \
+                        surrogate.get_log_likelihood (experiments, 
+                        theta)
+            elif delayed_acceptance_scale > 0:
+                approx_l_f = lambda theta : \
+                        coarse_l_f.get_log_likelihood (experiments, 
+                        theta)
+            adap_cov_mcmc.set_delayed_acceptance (approx_l_f)
+            adap_cov_mcmc.define_start_sample (sample, likelis)
+            adap_cov_mcmc.set_diagnostics (ChainDiagnostics (
+                theta_prior.get_size ()))
+            # The surrogate and approx_l_f are saved together with the
+            # sampler, so its lambda still refers to the same surrogate
+            state.update ({"phase": 2, "n_sampled": 0, 
+                "adap_cov_mcmc": adap_cov_mcmc, "surrogate": surrogate,
+                "approx_l_f": approx_l_f, "exact_l_f": exact_l_f})
 
         # Phase 2
-        adap_cov_mcmc = AdaptingCovarianceMCMC (theta_prior, model, 
-                experiments, n_sigma_update, verbose=verbose)
-        adap_cov_mcmc.set_temperature (temp)
-        adap_cov_mcmc.define_start_sample (sample, likelis)
-        sample, likelis = adap_cov_mcmc.get_sample (n_adap_cov)
+        adap_cov_mcmc = state["adap_cov_mcmc"]
+        surrogate = state["surrogate"]
+        approx_l_f = state["approx_l_f"]
+        n_sampled = MarginalLikelihood.__run_phase (adap_cov_mcmc,
+                settings["phase2_iterations"], settings, state, save_f,
+                checkpoint_n)
+        sample, likelis = adap_cov_mcmc.get_last_sampled (n_sampled)
+        # The surrogate stops learning, so phase 3 samples the power
+        # posterior exactly
+        if surrogate is not None:
+            surrogate.add_points (sample, likelis)
+            surrogate.freeze ()
 
         # Construct phase 3 local temperature sampler
-        S = adap_cov_mcmc.get_jump_covariance ()
-        fc_mcmc = FixedCovarianceMCMC (theta_prior, model, experiments, 
-                S, t=temp, verbose=verbose)
+        if settings["langevin_step_size"] > 0:
+            fc_mcmc = LangevinMCMC (theta_prior, model, experiments, 
+                    settings["langevin_step_size"], t=temp, 
+                    verbose=verbose)
+        else:
+            S = adap_cov_mcmc.get_jump_covariance ()
+            fc_mcmc = FixedCovarianceMCMC (theta_prior, model, 
+                    experiments, S, t=temp, verbose=verbose)
+            fc_mcmc.set_likelihood_function (state["exact_l_f"])
+            fc_mcmc.set_early_termination (
+                    settings["early_termination"])
+            fc_mcmc.set_delayed_acceptance (approx_l_f)
+        fc_mcmc.set_noise_updates (settings["noise_updates"])
         theta = sample[-1]
         log_likeli = likelis[-1]
         fc_mcmc.define_start_sample ([theta], [log_likeli])
-        return fc_mcmc
+        result = (fc_mcmc, [acc_mcmc.get_diagnostics (), 
+                adap_cov_mcmc.get_diagnostics ()])
+        if checkpoint is not None:
+            checkpoint.save (name, {"result": result})
+        return result
+
+
+    @staticmethod
+    def __run_phase (mcmc, n, settings, state, save_f=None, 
+            checkpoint_n=0):
+        """ Samples at most n iterations with mcmc, continuing from the
+            state["n_sampled"] iterations already sampled. If the 
+            target_ess of settings is positive, sampling stops as soon
+            as the diagnostics of the sampler, checked every 
+            sigma_update_n iterations, show that it has converged. If
+            save_f is provided, it is called every checkpoint_n 
+            iterations, after state["n_sampled"] is updated.
+
+            Returns the number of sampled iterations.
+        """
+        n_sampled = state["n_sampled"]
+        target_ess = settings["target_ess"]
+        check_n = max (settings["sigma_update_n"], 1) if \
+                target_ess > 0 else n
+        if save_f is None or checkpoint_n <= 0:
+            checkpoint_n = n
+        while n_sampled < n:
+            next_check = (n_sampled // check_n + 1) * check_n
+            next_save = (n_sampled // checkpoint_n + 1) * checkpoint_n
+            n_step = min (next_check, next_save, n) - n_sampled
+            mcmc.sample (n_step)
+            n_sampled += n_step
+            state["n_sampled"] = n_sampled
+            if target_ess > 0 and n_sampled % check_n == 0 and \
+                    mcmc.get_diagnostics ().has_converged (target_ess, 
+                    settings["max_r_hat"]):
+                break
+            if n_sampled % checkpoint_n == 0 and n_sampled < n and \
+                    save_f is not None:
+                save_f ()
+        return n_sampled
+
+
+    def __run_warm_started_phase_one_and_two (self, betas, 
+            phase_1_n_2_f):
+        """ Runs phases 1 and 2 in waves along the temperature ladder.
+
+            Parameters
+                betas: the sorted list of temperatures.
+                phase_1_n_2_f: a function that receives a temperature,
+                    a neighbour sampler (or None) and the index of a 
+                    chain and returns the phase 3 sampler of that chain
+                    and the diagnostics of its phases 1 and 2.
+
+            Returns
+                a list with, for each chain, a list with the phase 3 
+                sampler and the diagnostics of phases 1 and 2 of each 
+                temperature.
+
+            Notes
+                The i-th temperature is sampled on wave i mod n_waves.
+                Temperatures of the first wave start from the priors, 
+                while the others are warm started by their lower 
+                neighbour on the same chain, which was sampled on the 
+                previous wave. All temperatures and chains of a wave are
+                sampled in parallel.
+        """
+        n_waves = min (self.__settings["warm_start_waves"], 
+                len (betas))
+        n_chains = self.__settings["chains_per_temperature"]
+        results = [[None] * len (betas) for _ in range (n_chains)]
+        for wave in range (n_waves):
+            wave_idxs = [(c, i) for c in range (n_chains) for i in \
+                    range (wave, len (betas), n_waves)]
+            wave_args = []
+            for c, i in wave_idxs:
+                neighbour = results[c][i - 1][0] if wave > 0 else None
+                wave_args.append ((betas[i], neighbour, c))
+            if self.__verbose:
+                print ("Warm start wave " + str (wave) + " with " + \
+                        str (len (wave_idxs)) + " chains.")
+            wave_f = lambda args : phase_1_n_2_f (args[0], args[1], 
+                    args[2])
+            wave_results = parallel_map (wave_f, wave_args, 
+                    self.__n_process)
+            for (c, i), result in zip (wave_idxs, wave_results):
+                results[c][i] = result
+        return results
+
+
+    def __is_prior_sampled (self, beta):
+        """ Returns True if the temperature beta is estimated with
+            independent draws from the priors instead of MCMC. """
+        if self.__settings["prior_sample_size"] <= 0:
+            return False
+        return beta == 0 or beta <= self.__settings["importance_beta"]
+
+
+    def __sample_from_prior (self, experiments, model, theta_prior):
+        """ Draws independent parameters from the priors and calculates
+            their log-likelihoods in parallel.
+
+            Returns
+                thetas: a list of RandomParameterList objects drawn from
+                    the priors.
+                log_ls: a list with the log-likelihood of each element 
+                    of thetas.
+
+            Notes
+                Draws with log-likelihood -inf (e.g. when the ODE 
+                integration fails) are discarded, which is the same as
+                what the MCMC samplers do, since they never accept 
+                jumps to such points.
+        """
+        n = self.__settings["prior_sample_size"]
+        thetas = [theta_prior.get_random_copy () for _ in range (n)]
+        l_f = LikelihoodFunction (model)
+        log_ls = l_f.get_log_likelihoods (experiments, thetas, 
+                self.__n_process)
+        finite_thetas = []
+        finite_log_ls = []
+        for theta, log_l in zip (thetas, log_ls):
+            if log_l > float ("-inf"):
+                finite_thetas.append (theta)
+                finite_log_ls.append (log_l)
+        if len (finite_thetas) == 0:
+            raise ValueError ("All parameters drawn from the priors " \
+                    + "have zero likelihood.")
+        return finite_thetas, finite_log_ls
+
+
+    def __importance_sample (self, beta, thetas, log_ls):
+        """ Uses a sample of the priors to estimate the expected 
+            log-likelihood of the power posterior of temperature beta.
+
+            Parameters
+                beta: the temperature.
+                thetas: a list of parameters drawn from the priors.
+                log_ls: the log-likelihoods of thetas.
+
+            Returns
+                exp_log_l: the self-normalized importance sampling 
+                    estimate of the expected log-likelihood.
+                beta_thetas: a sample of the power posterior, obtained
+                    by resampling thetas according to the importance 
+                    weights (thetas itself when beta = 0).
+                beta_log_ls: the log-likelihoods of beta_thetas.
+        """
+        log_ls = np.array (log_ls)
+        log_w = beta * (log_ls - log_ls.max ())
+        w = np.exp (log_w)
+        w /= w.sum ()
+        exp_log_l = float (np.dot (w, log_ls))
+        if self.__verbose:
+            print ("Importance sampling for t = " + str (beta) + \
+                    " has effective sample size " + \
+                    str (1 / np.dot (w, w)))
+
+        if beta == 0:
+            return exp_log_l, list (thetas), list (log_ls)
+        idxs = np.random.choice (len (thetas), len (thetas), p=w)
+        beta_thetas = [thetas[i].get_copy () for i in idxs]
+        beta_log_ls = [float (log_ls[i]) for i in idxs]
+        return exp_log_l, beta_thetas, beta_log_ls
 
 
     def __set_sample (self, betas, thetas, log_ls):
@@ -162,17 +587,78 @@ class MarginalLikelihood:
                 if output_file:
                     file_obj.write (print_str + "\n")
 
+
+    def get_posterior_summaries (self):
+        """ Returns the summaries of the sample of each temperature,
+            computed during the last call of 
+            estimate_marginal_likelihood.
+
+            Returns
+                a list of tuples (temperature, OnlineSummary), in 
+                increasing order of temperature. The summaries of 
+                temperatures sampled with MCMC contain the states of the
+                chain on the iterations of phase 3 whose parameters are
+                kept in the sample.
+        """
+        if self.__summaries == None:
+            raise ValueError ("Summaries are undefined, you should" \
+                    + " first call the method" \
+                    + " estimate_marginal_likelihood.")
+        return list (self.__summaries)
+
+
+    def get_chain_diagnostics (self):
+        """ Returns the diagnostics of the chains of the last call of
+            estimate_marginal_likelihood.
+
+            Returns
+                a list of tuples (temperature, diagnostics), one for
+                each temperature sampled with MCMC, where diagnostics is
+                a list with, for phases 1, 2 and 3, a list with the 
+                ChainDiagnostics of each chain of the temperature. The
+                diagnostics are calculated on the log-scaled 
+                parameters.
+        """
+        if self.__diagnostics == None:
+            raise ValueError ("Diagnostics are undefined, you should" \
+                    + " first call the method" \
+                    + " estimate_marginal_likelihood.")
+        return list (self.__diagnostics)
+
+
+    def print_chain_diagnostics (self):
+        """ Prints, for each phase of each temperature, the number of
+            iterations, the smallest effective sample size of the 
+            parameters (summed over the chains), their greatest 
+            split-R-hat (calculated with the halves of all chains, so it
+            compares the variance between chains with the variance 
+            within them), and the mean acceptance ratio of the last 
+            window of iterations of the chains. """
+        for beta, diagnostics in self.get_chain_diagnostics ():
+            for phase, chains in enumerate (diagnostics):
+                ess = sum ([d.get_effective_sample_size () for d in \
+                        chains])
+                r_hat = ChainDiagnostics.split_r_hat (chains)
+                windows = [d.get_acceptance_ratios ()[-1] for d in \
+                        chains if d.get_acceptance_ratios ()]
+                print ("t = " + str (beta) + " phase " + str (phase + 1)\
+                        + ": iterations = " + \
+                        str (sum ([d.get_size () for d in chains])) + \
+                        ", min ESS = " + str (np.min (ess)) + \
+                        ", max split-R-hat = " + str (np.max (r_hat)) + \
+                        ", last acceptance = " + \
+                        (str (np.mean (windows)) if windows else "-"))
+
         
     def estimate_marginal_likelihood (self, experiments, model, 
             theta_prior):
         """ This function estimates the marginal likelihood of a  model.
         """
-        n_pop = self.__phase3_iterations
         n_strata = self.__n_strata
         strata_size = self.__strata_size
-        verbose = self.__verbose
-        n_process = self.__n_process
         self.__sample = None
+        self.__summaries = None
+        self.__diagnostics = []
 
         # initialize ODEs function and jacobian
         model.evaluate_on ([experiments[0].times[0]])
@@ -181,60 +667,270 @@ class MarginalLikelihood:
 
         betas = PopulationalMCMC.sample_scheduled_betas (n_strata * 
                 strata_size)
-        print ("Phase 1 and 2 starts.")
-        phase_1_n_2_f = lambda temp : \
-                MarginalLikelihood.__run_phase_one_and_two (temp, \
-                experiments, model, theta_prior, 
-                self.__phase1_iterations, self.__phase2_iterations,
-                self.__sigma_update_n, self.__verbose) 
-        fc_mcmcs = parallel_map (phase_1_n_2_f, betas, n_process)
-                       
-        print ("Phase 3 starts.")
-        # Phase 3
-        pop_mcmc = PopulationalMCMC (n_strata, strata_size, fc_mcmcs,
-                betas=betas, verbose=verbose)
-        pop_mcmc.get_sample (n_pop)
-        betas, thetas, log_ls = pop_mcmc.get_last_sampled (n_pop // 4)
+        prior_betas = [b for b in betas if self.__is_prior_sampled (b)]
+        mcmc_betas = betas[len (prior_betas):]
+        thetas = []
+        log_ls = []
+        exp_log_ls = []
+        names = [p.name for p in theta_prior]
+        summaries = []
+        writer = None
+        if self.__sample_file:
+            writer = SampleWriter (self.__sample_file, {"betas": betas,
+                "parameters": names})
+        checkpoint = None
+        prior_state = None
+        if self.__checkpoint_dir is not None:
+            checkpoint = self.__open_checkpoint (betas, names)
+            prior_state = checkpoint.load ("prior")
+
+        if prior_state is not None:
+            print ("Resuming the samples of the priors.")
+            thetas, log_ls, exp_log_ls, summaries = prior_state["result"]
+            np.random.set_state (prior_state["rng"])
+        elif len (prior_betas) > 0:
+            print ("Sampling from the priors.")
+            prior_thetas, prior_log_ls = self.__sample_from_prior (
+                    experiments, model, theta_prior)
+            for beta in prior_betas:
+                exp_log_l, beta_thetas, beta_log_ls = \
+                        self.__importance_sample (beta, prior_thetas, 
+                        prior_log_ls)
+                thetas.append (beta_thetas)
+                log_ls.append (beta_log_ls)
+                exp_log_ls.append (exp_log_l)
+                summary = OnlineSummary (names)
+                for theta, log_l in zip (beta_thetas, beta_log_ls):
+                    summary.add (theta.get_values (), log_l)
+                summaries.append ((beta, summary))
+            if checkpoint is not None:
+                checkpoint.save ("prior", {"result": (thetas, log_ls,
+                    exp_log_ls, summaries), "rng": np.random.get_state ()})
+        if writer:
+            for i in range (len (prior_betas)):
+                writer.write (prior_betas[i], thetas[i], log_ls[i])
+
+        if len (mcmc_betas) > 0:
+            mcmc_thetas, mcmc_log_ls, mcmc_summaries, diagnostics = \
+                    self.__run_mcmc_phases (mcmc_betas, experiments, 
+                    model, theta_prior, checkpoint)
+            summaries += list (zip (mcmc_betas, mcmc_summaries))
+            self.__diagnostics = list (zip (mcmc_betas, diagnostics))
+            for i in range (len (mcmc_betas)):
+                exp_log_ls.append (np.mean (mcmc_log_ls[i]))
+                if writer:
+                    writer.write (mcmc_betas[i], mcmc_thetas[i], 
+                            mcmc_log_ls[i])
+            thetas += mcmc_thetas
+            log_ls += mcmc_log_ls
+
         self.__set_sample (betas, thetas, log_ls)
+        self.__summaries = summaries
+        if checkpoint is not None:
+            checkpoint.clear ()
         print ("Sampling ended.")
         
         if self.__verbose:
             print ("Here are the sampled parameters separated by" \
                     " temperature.")
             self.print_sample ()
+            self.print_chain_diagnostics ()
             
-        ml = self.__calculate_marginal_likelihood (betas, thetas, 
-                log_ls)
+        ml = self.__calculate_marginal_likelihood (betas, exp_log_ls)
         return ml
 
+
+    def __open_checkpoint (self, betas, names):
+        """ Opens the Checkpoint of the run on checkpoint_dir. If the 
+            run is resumed, checks if its states were saved by a run 
+            with the same sampling settings; otherwise, they are 
+            removed. """
+        checkpoint = Checkpoint (self.__checkpoint_dir)
+        settings = {"betas": betas, "parameters": names, 
+                "seed": seed_manager.get_seed (), 
+                "sampling": dict (self.__settings)}
+        if not self.__resume:
+            checkpoint.clear ()
+        elif checkpoint.load ("settings") not in [None, settings]:
+            raise ValueError ("The checkpoint was saved by a run with " \
+                    + "different arguments.")
+        checkpoint.save ("settings", settings)
+        return checkpoint
+
+
+    def __run_mcmc_phases (self, betas, experiments, model, 
+            theta_prior, checkpoint=None):
+        """ Samples the power posteriors of temperatures betas using the
+            three phases of MCMC. If checkpoint is a Checkpoint, the 
+            chains of every phase are saved on it and continued from it.
+
+            Returns
+                thetas: a list with the sample of each temperature, 
+                    pooled from its chains.
+                log_ls: a list with the log-likelihoods of the sample of
+                    each temperature.
+                summaries: a list with the OnlineSummary of the sample
+                    of each temperature, merged from its chains.
+                diagnostics: a list with, for each temperature, a list
+                    with the ChainDiagnostics of each chain of phases 
+                    1, 2 and 3.
+        """
+        n_chains = self.__settings["chains_per_temperature"]
+        print ("Phase 1 and 2 starts.")
+        phase_1_n_2_f = lambda temp, neighbour=None, chain=0 : \
+                MarginalLikelihood.__run_phase_one_and_two (temp, \
+                experiments, model, theta_prior, self.__settings, 
+                verbose=self.__verbose, neighbour=neighbour, 
+                chain=chain, checkpoint=checkpoint, 
+                checkpoint_n=self.__checkpoint_n)
+        if self.__settings["warm_start_waves"] > 0:
+            results = self.__run_warm_started_phase_one_and_two (betas,
+                    phase_1_n_2_f)
+        else:
+            args = [(beta, c) for c in range (n_chains) for beta in \
+                    betas]
+            flat_results = parallel_map (lambda a : phase_1_n_2_f (a[0],
+                None, a[1]), args, self.__n_process)
+            results = [flat_results[c * len (betas): (c + 1) * \
+                    len (betas)] for c in range (n_chains)]
+                       
+        print ("Phase 3 starts.")
+        phase_3_f = lambda c : MarginalLikelihood.__run_phase_three (
+                [result[0] for result in results[c]], betas, 
+                theta_prior, self.__settings, verbose=self.__verbose, 
+                chain=c, spill_dir=self.__spill_dir, 
+                checkpoint=checkpoint, checkpoint_n=self.__checkpoint_n)
+        if n_chains == 1:
+            chain_outputs = [phase_3_f (0)]
+        else:
+            chain_outputs = parallel_map (phase_3_f, range (n_chains),
+                    self.__n_process)
+
+        thetas = []
+        log_ls = []
+        summaries = []
+        diagnostics = []
+        for i in range (len (betas)):
+            thetas.append (sum ([out[0][i] for out in chain_outputs], []))
+            log_ls.append (sum ([out[1][i] for out in chain_outputs], []))
+            summary = chain_outputs[0][2][i]
+            for out in chain_outputs[1:]:
+                summary.merge (out[2][i])
+            summaries.append (summary)
+            phase_diagnostics = [[], [], []]
+            for c in range (n_chains):
+                phase_diagnostics[0].append (results[c][i][1][0])
+                phase_diagnostics[1].append (results[c][i][1][1])
+                phase_diagnostics[2].append (chain_outputs[c][3][i])
+            diagnostics.append (phase_diagnostics)
+        return thetas, log_ls, summaries, diagnostics
+
+
+    @staticmethod
+    def __run_phase_three (fc_mcmcs, betas, theta_prior, settings, 
+            verbose=False, chain=0, spill_dir=None, checkpoint=None,
+            checkpoint_n=0):
+        """ Runs phase 3 of a chain, a PopulationalMCMC with the phase
+            3 samplers of its temperatures, for the phase3_iterations of
+            settings. Chains other than the first are run on other 
+            process, so they are seeded with their index. The samplers
+            only keep one of every thinning (of settings) parameters 
+            of the last quarter of the phase, in memory or, if 
+            spill_dir is provided, in temporary files on spill_dir.
+            If checkpoint is a Checkpoint, the samplers are saved every
+            checkpoint_n iterations, and the phase continues from the
+            saved ones, if there are any.
+
+            Returns
+                thetas: a list with the sample of each temperature.
+                log_ls: a list with the log-likelihoods of the sample of
+                    each temperature.
+                summaries: a list with the OnlineSummary of the sample
+                    of each temperature.
+                diagnostics: a list with the phase 3 ChainDiagnostics 
+                    of each temperature.
+        """
+        name = "phase_3_" + str (chain)
+        state = None
+        if checkpoint is not None:
+            state = checkpoint.load (name)
+        if state is not None and "result" in state:
+            return state["result"]
+        n_pop = settings["phase3_iterations"]
+        thinning = settings["thinning"]
+        n_kept = n_pop // 4
+        n_burnin = n_pop - n_kept
+        n_retained = -(-n_kept // thinning)
+        if state is None:
+            if chain > 0:
+                np.random.seed ([seed_manager.get_seed (), chain])
+            for fc_mcmc in fc_mcmcs:
+                fc_mcmc.set_diagnostics (ChainDiagnostics (
+                    theta_prior.get_size ()))
+                spill_file = None
+                if spill_dir is not None:
+                    fd, spill_file = tempfile.mkstemp (suffix=".chain", 
+                            dir=spill_dir)
+                    os.close (fd)
+                fc_mcmc.set_storage (ChainStorage (max (n_retained, 1),
+                    thinning, spill_file))
+            state = {"n_sampled": 0, "fc_mcmcs": fc_mcmcs}
+        else:
+            np.random.set_state (state["rng"])
+        fc_mcmcs = state["fc_mcmcs"]
+        if checkpoint is None or checkpoint_n <= 0:
+            checkpoint_n = n_pop
+
+        # Some temperatures might be sampled from the priors, so the 
+        # population is a single strata with the MCMC ones
+        pop_mcmc = PopulationalMCMC (1, len (betas), fc_mcmcs,
+                betas=betas, verbose=verbose)
+        while True:
+            # Only the iterations whose parameters are kept are 
+            # summarized
+            if state["n_sampled"] >= n_burnin and \
+                    fc_mcmcs[0].get_summary () is None:
+                for fc_mcmc in fc_mcmcs:
+                    fc_mcmc.set_summary (OnlineSummary (
+                        [p.name for p in theta_prior]))
+            n_sampled = state["n_sampled"]
+            if n_sampled >= n_pop:
+                break
+            end = n_burnin if n_sampled < n_burnin else n_pop
+            end = min (end, (n_sampled // checkpoint_n + 1) * \
+                    checkpoint_n)
+            pop_mcmc.sample (end - n_sampled)
+            state["n_sampled"] = end
+            if checkpoint is not None and end % checkpoint_n == 0 and \
+                    end < n_pop:
+                checkpoint.save (name, dict (state, 
+                    rng=np.random.get_state ()))
+
+        _, thetas, log_ls = pop_mcmc.get_last_sampled (n_retained)
+        summaries = [fc_mcmc.get_summary () for fc_mcmc in fc_mcmcs]
+        diagnostics = [fc_mcmc.get_diagnostics () for fc_mcmc in \
+                fc_mcmcs]
+        result = (thetas, log_ls, summaries, diagnostics)
+        if checkpoint is not None:
+            checkpoint.save (name, {"result": result})
+        for fc_mcmc in fc_mcmcs:
+            fc_mcmc.get_storage ().remove_spill_file ()
+        return result
+
     
-    def __calculate_marginal_likelihood (self, betas, thetas, \
-            likelihoods):
-        """ Given a list with samples, calculates the marginal 
-            likelihood. """
+    def __calculate_marginal_likelihood (self, betas, exp_log_ls):
+        """ Given the expected log-likelihood of each power posterior,
+            calculates the marginal likelihood. """
         ml = 0
         
         if self.__verbose:
             print ("Estimating marginal likelihood")
 
-        exp_gv_tip1 = 0
-        power_sample_ip1 = thetas[0]
-        for j in range (len (power_sample_ip1)):
-            log_l = likelihoods[0][j]
-            exp_gv_tip1 += log_l
-        exp_gv_tip1 /= len (power_sample_ip1)
-
         for i in range (len (betas) - 1):
             tip1 = betas[i + 1]
             ti = betas[i]
-                        
-            exp_gv_ti = exp_gv_tip1
-            exp_gv_tip1 = 0
-            power_sample_ip1 = thetas[i + 1]
-            for j in range (len (power_sample_ip1)):
-                log_l = likelihoods[i + 1][j]
-                exp_gv_tip1 += log_l
-            exp_gv_tip1 /= len (power_sample_ip1)
+            exp_gv_ti = exp_log_ls[i]
+            exp_gv_tip1 = exp_log_ls[i + 1]
 
             ml += (tip1 - ti) * (exp_gv_tip1 + exp_gv_ti)
             
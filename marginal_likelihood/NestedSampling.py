@@ -0,0 +1,273 @@
+# In this module we calculate the marginal likelihood of models given
+# observed data using Nested Sampling, as presented in "Nested sampling
+# for general Bayesian computation", John Skilling. A set of live points
+# drawn from the priors is evolved by repeatedly replacing the points of
+# lowest likelihood by new draws from the priors constrained to higher
+# likelihoods, while the prior volume enclosed by the likelihood
+# contours shrinks geometrically.
+from marginal_likelihood.samplers.ConstrainedPriorMCMC import \
+        ConstrainedPriorMCMC
+from marginal_likelihood.LikelihoodFunction import LikelihoodFunction
+import multiprocessing
+
+from parallel_map import parallel_map
+import numpy as np
+
+class NestedSampling:
+    """ This class is able to estimate the marginal likelihood of a
+        model given experimental data using Nested Sampling. """
+
+    def __init__ (self, n_live_points, n_moves, batch_size=None,
+            dlogz=.1, max_iterations=100000, verbose=False,
+            n_process=0):
+        """ Default constructor. n_live_points is the number of live
+            points. n_moves is the number of Metropolis-Hastings
+            iterations used to draw each new point from the constrained
+            priors. batch_size is the number of live points replaced
+            on each iteration, whose new draws are calculated in
+            parallel; by default it is the number of process. The
+            sampling stops when the live points can increase the log
+            marginal likelihood by at most dlogz, or after
+            max_iterations iterations. """
+        if n_process == 0:
+            self.__n_process = max (1, \
+                    multiprocessing.cpu_count () // 2)
+            if verbose:
+                print ("Using automatic number of process.")
+        else:
+            self.__n_process = n_process
+
+        if batch_size is None:
+            batch_size = self.__n_process
+        if not 0 < batch_size < n_live_points:
+            raise ValueError ("batch_size should be positive and " \
+                    + "smaller than n_live_points.")
+
+        self.__n_live_points = n_live_points
+        self.__n_moves = n_moves
+        self.__batch_size = batch_size
+        self.__dlogz = dlogz
+        self.__max_iterations = max_iterations
+        self.__verbose = verbose
+        self.__log_ml_error = None
+        self.__points = None
+
+
+    def get_log_evidence_error (self):
+        """ Returns the estimated standard deviation of the log marginal
+            likelihood calculated on the last call of
+            estimate_marginal_likelihood. """
+        return self.__log_ml_error
+
+
+    def get_posterior_sample (self, n=None):
+        """ Returns an equally weighted sample of the posterior
+            distribution, obtained by resampling the discarded and
+            the final live points according to their weights.
+
+            Parameters
+                n: the size of the sample. By default it is the number
+                    of live points.
+
+            Returns
+                thetas: a list with the sampled parameters.
+                log_ls: a list with the log-likelihoods of thetas.
+
+            Note
+                This method should only be called after a succesful call
+                of estimate_marginal_likelihood.
+        """
+        if self.__points == None:
+            raise ValueError ("Sample is undefined, you should first" \
+                    + " call the method estimate_marginal_likelihood.")
+        if n is None:
+            n = self.__n_live_points
+
+        log_w = np.array ([log_w for _, _, log_w in self.__points])
+        w = np.exp (log_w - np.max (log_w))
+        w /= np.sum (w)
+        idxs = np.random.choice (len (self.__points), n, p=w)
+        thetas = [self.__points[i][0].get_copy () for i in idxs]
+        log_ls = [self.__points[i][1] for i in idxs]
+        return thetas, log_ls
+
+
+    def print_sample (self, output_file=None):
+        """ Prints a sample of the posterior distribution.
+
+            Parameters
+                output_file: a string with a filename. If this is
+                    provided, the sample is also printed this file.
+            Note
+                This method should only be called after a succesful call
+                of estimate_marginal_likelihood.
+        """
+        if self.__points == None:
+            raise ValueError ("Sample is undefined, before printing" \
+                    + " sample, you should first call the method" \
+                    + " estimate_marginal_likelihood.")
+
+        if output_file:
+            file_obj = open (output_file, "w")
+
+        print_str = "Sample for t = 1"
+        print (print_str)
+        if output_file:
+            file_obj.write (print_str + "\n")
+        for theta, log_l in zip (*self.get_posterior_sample ()):
+            print_str = "parameter = " + str (theta.get_values ()) \
+                    + " likelihood = " + str (log_l)
+            print (print_str)
+            if output_file:
+                file_obj.write (print_str + "\n")
+
+        if output_file:
+            file_obj.close ()
+
+
+    @staticmethod
+    def __log_add_exp (a, b):
+        """ Returns log (exp (a) + exp (b)) avoiding overflows. """
+        if not a > float ("-inf"):
+            return b
+        if not b > float ("-inf"):
+            return a
+        return max (a, b) + np.log1p (np.exp (-abs (a - b)))
+
+
+    @staticmethod
+    def __get_move_covariance (live_points):
+        """ Estimates the covariance of the log of the parameters of the
+            live points and scales it as recommended for random walk
+            Metropolis. """
+        log_values = np.log ([theta.get_values () for theta in
+            live_points])
+        n = log_values.shape[1]
+        S = np.array (np.cov (log_values, rowvar=False), ndmin=2)
+        S = S * (2.38 ** 2) / n + np.eye (n) * 1e-8
+        return S
+
+
+    @staticmethod
+    def __draw_constrained (start, start_l, log_l_min, S, seed,
+            experiments, model, theta_prior, n_moves):
+        """ Map function that draws a point from the priors constrained
+            to log-likelihoods greater than log_l_min, starting a random
+            walk from a live point. """
+        # The random state is restored so drawing on this process does
+        # not change the numbers generated after the draw
+        random_state = np.random.get_state ()
+        np.random.seed (seed)
+        cp_mcmc = ConstrainedPriorMCMC (theta_prior, model, experiments,
+                S, log_l_min)
+        cp_mcmc.define_start_sample ([start], [start_l])
+        cp_mcmc.get_sample (n_moves)
+        sample, likelis = cp_mcmc.get_last_sampled (1)
+        np.random.set_state (random_state)
+        return sample[0], likelis[0]
+
+
+    def __replace_points (self, live_points, log_ls, worst, experiments,
+            model, theta_prior):
+        """ Replaces the live points of indexes worst by new draws from
+            the priors constrained to log-likelihoods greater than the
+            greatest log-likelihood of the replaced points. """
+        log_l_min = log_ls[worst[-1]]
+        survivors = [i for i in range (len (live_points)) if i not in
+                worst and log_ls[i] > log_l_min]
+        if len (survivors) == 0:
+            survivors = [i for i in range (len (live_points)) if i not
+                    in worst]
+
+        S = NestedSampling.__get_move_covariance (live_points)
+        starts = np.random.choice (survivors, len (worst))
+        seeds = np.random.randint (2 ** 31, size=len (worst))
+        draw_f = lambda args : NestedSampling.__draw_constrained (
+                live_points[args[0]], log_ls[args[0]], log_l_min, S,
+                args[1], experiments, model, theta_prior,
+                self.__n_moves)
+        draw_args = list (zip (starts, seeds))
+        if self.__n_process > 1:
+            new_points = parallel_map (draw_f, draw_args,
+                    self.__n_process)
+        else:
+            new_points = [draw_f (args) for args in draw_args]
+
+        for i, (theta, log_l) in zip (worst, new_points):
+            live_points[i] = theta
+            log_ls[i] = log_l
+
+
+    def estimate_marginal_likelihood (self, experiments, model,
+            theta_prior):
+        """ This function estimates the marginal likelihood of a model.
+        """
+        n = self.__n_live_points
+        k = self.__batch_size
+        self.__points = None
+
+        # initialize ODEs function and jacobian
+        model.evaluate_on ([experiments[0].times[0]])
+        model.get_system_jacobian ()
+        print ("Initialized ODEs")
+
+        live_points = [theta_prior.get_random_copy () for _ in
+                range (n)]
+        l_f = LikelihoodFunction (model)
+        log_ls = np.array (l_f.get_log_likelihoods (experiments,
+            live_points, self.__n_process))
+        if not np.max (log_ls) > float ("-inf"):
+            raise ValueError ("All parameters drawn from the priors " \
+                    + "have zero likelihood.")
+
+        # points is a list of (theta, log-likelihood, log-weight)
+        points = []
+        log_X = 0
+        log_ml = float ("-inf")
+        for iteration in range (self.__max_iterations):
+            # Removing the k worst points is the same as removing them
+            # one at a time from a set with n, n - 1, ... live points
+            worst = list (np.argsort (log_ls)[:k])
+            for j, i in enumerate (worst):
+                log_X_new = log_X - 1 / (n - j)
+                log_dX = log_X + np.log (-np.expm1 (log_X_new - log_X))
+                log_w = log_ls[i] + log_dX
+                points.append ((live_points[i], log_ls[i], log_w))
+                log_ml = NestedSampling.__log_add_exp (log_ml, log_w)
+                log_X = log_X_new
+
+            # Maximum increase of log_ml given by the live points
+            log_remaining = np.max (log_ls) + log_X
+            dlogz = NestedSampling.__log_add_exp (0, log_remaining -
+                    log_ml)
+            if self.__verbose:
+                print ("Nested sampling iteration " + str (iteration) +
+                        ", log X = " + str (log_X) + ", partial log " +
+                        "marginal likelihood = " + str (log_ml))
+            if dlogz < self.__dlogz:
+                remaining = [i for i in range (n) if i not in worst]
+                break
+
+            self.__replace_points (live_points, log_ls, worst,
+                    experiments, model, theta_prior)
+        else:
+            remaining = list (range (n))
+
+        # The remaining live points share the remaining volume
+        for i in remaining:
+            log_w = log_ls[i] + log_X - np.log (len (remaining))
+            points.append ((live_points[i], log_ls[i], log_w))
+            log_ml = NestedSampling.__log_add_exp (log_ml, log_w)
+
+        # Information (negative relative entropy) of the posterior with
+        # respect to the prior, used to estimate the error of log_ml
+        H = 0
+        for _, log_l, log_w in points:
+            if log_w > float ("-inf"):
+                H += np.exp (log_w - log_ml) * (log_l - log_ml)
+        self.__log_ml_error = np.sqrt (max (H, 0) / n)
+        self.__points = points
+        print ("Sampling ended.")
+        print ("Calculated log marginal likelihood: " + str (log_ml) +
+                " +- " + str (self.__log_ml_error))
+        return log_ml
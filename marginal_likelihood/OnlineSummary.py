@@ -0,0 +1,262 @@
+import numpy as np
+
+class OnlineSummary:
+    """ This class summarizes a sample of parameters while it is
+        sampled, without storing it. It keeps the running mean and
+        covariance of the parameters (Welford's algorithm), the running
+        mean and variance of their log-likelihoods and, for each
+        parameter, a histogram with a fixed number of bins whose range
+        grows with the sample. Quantiles are interpolated from the
+        histograms, so their error is at most the width of a bin.
+
+        Attributes
+            names (list): the names of the parameters.
+            n_bins (int): the number of bins of each histogram.
+    """
+
+    def __init__ (self, names, n_bins=64):
+        """ Default constructor.
+
+            Parameters
+                names: a list with the names of the parameters.
+                n_bins: the number of bins of the histograms. It must
+                    be even, since the range of a histogram is doubled
+                    by merging pairs of bins.
+        """
+        if n_bins < 2 or n_bins % 2 != 0:
+            raise ValueError ("The number of bins should be a positive" \
+                    + " even number.")
+        self.names = list (names)
+        self.n_bins = n_bins
+        m = len (self.names)
+        self.__n = 0
+        self.__mean = np.zeros (m)
+        self.__M2 = np.zeros ((m, m))
+        self.__n_log_ls = 0
+        self.__log_l_mean = 0
+        self.__log_l_M2 = 0
+        # The first values are kept until the histograms are created
+        self.__buffer = []
+        self.__counts = None
+        self.__lows = None
+        self.__widths = None
+
+
+    def add (self, values, log_l=None):
+        """ Adds a sampled parameter to the summary.
+
+            Parameters
+                values: a list with the values of the parameters.
+                log_l: the log-likelihood of the parameter. Infinite
+                    log-likelihoods are not summarized.
+        """
+        x = np.array (values, dtype=float)
+        self.__n += 1
+        delta = x - self.__mean
+        self.__mean += delta / self.__n
+        self.__M2 += np.outer (delta, x - self.__mean)
+
+        if log_l is not None and np.isfinite (log_l):
+            self.__n_log_ls += 1
+            delta_l = log_l - self.__log_l_mean
+            self.__log_l_mean += delta_l / self.__n_log_ls
+            self.__log_l_M2 += delta_l * (log_l - self.__log_l_mean)
+
+        if self.__counts is None:
+            self.__buffer.append (x)
+            if len (self.__buffer) >= self.n_bins:
+                self.__create_histograms ()
+        else:
+            self.__add_to_histograms (x)
+
+
+    def __create_histograms (self):
+        """ Creates the histograms with the range of the buffered
+            values and adds these values to them. """
+        buffered = np.array (self.__buffer)
+        lows = buffered.min (axis=0)
+        spans = buffered.max (axis=0) - lows
+        spans[spans == 0] = np.maximum (np.abs (lows[spans == 0]),
+                1) * 1e-6
+        self.__lows = lows
+        # The range is slightly larger, so the maximum is in the last
+        # bin
+        self.__widths = spans * (1 + 1e-9) / self.n_bins
+        self.__counts = np.zeros ((len (self.names), self.n_bins))
+        for x in self.__buffer:
+            self.__add_to_histograms (x)
+        self.__buffer = []
+
+
+    def __add_to_histograms (self, x):
+        """ Adds the values of x to the histograms of each parameter.
+        """
+        for j in range (len (x)):
+            self.__add_to_histogram (j, x[j], 1)
+
+
+    def __add_to_histogram (self, j, value, count):
+        """ Adds count occurrences of value to the histogram of the
+            j-th parameter, doubling its range until it contains the
+            value. """
+        if not np.isfinite (value):
+            return
+        half = self.n_bins // 2
+        while value < self.__lows[j] or value >= self.__lows[j] + \
+                self.__widths[j] * self.n_bins:
+            merged = self.__counts[j, 0::2] + self.__counts[j, 1::2]
+            self.__counts[j] = 0
+            if value < self.__lows[j]:
+                self.__counts[j, half:] = merged
+                self.__lows[j] -= self.__widths[j] * self.n_bins
+            else:
+                self.__counts[j, :half] = merged
+            self.__widths[j] *= 2
+        i = int ((value - self.__lows[j]) / self.__widths[j])
+        self.__counts[j, min (i, self.n_bins - 1)] += count
+
+
+    def merge (self, other):
+        """ Adds the parameters summarized by other, an OnlineSummary
+            of the same parameters, to this summary. The mean, 
+            covariance and log-likelihood statistics are the ones of 
+            the union of both samples. The values in the histograms of
+            other are added as if they were on the center of their 
+            bins, so quantiles lose up to the width of a bin of other.
+        """
+        if other.names != self.names:
+            raise ValueError ("Only summaries of the same parameters" \
+                    + " can be merged.")
+        if other.__n == 0:
+            return
+        n = self.__n + other.__n
+        delta = other.__mean - self.__mean
+        self.__M2 += other.__M2 + np.outer (delta, delta) * self.__n * \
+                other.__n / n
+        self.__mean += delta * other.__n / n
+        self.__n = n
+
+        n_log_ls = self.__n_log_ls + other.__n_log_ls
+        if other.__n_log_ls > 0:
+            delta_l = other.__log_l_mean - self.__log_l_mean
+            self.__log_l_M2 += other.__log_l_M2 + delta_l ** 2 * \
+                    self.__n_log_ls * other.__n_log_ls / n_log_ls
+            self.__log_l_mean += delta_l * other.__n_log_ls / n_log_ls
+            self.__n_log_ls = n_log_ls
+
+        if self.__counts is None and other.__counts is not None:
+            # The histograms of other are usually wider than the ones
+            # created from the buffer
+            buffer = self.__buffer
+            self.__buffer = []
+            self.__lows = other.__lows.copy ()
+            self.__widths = other.__widths.copy ()
+            self.__counts = other.__counts.copy ()
+            for x in buffer:
+                self.__add_to_histograms (x)
+            return
+        for x in other.__buffer:
+            if self.__counts is None:
+                self.__buffer.append (x)
+                if len (self.__buffer) >= self.n_bins:
+                    self.__create_histograms ()
+            else:
+                self.__add_to_histograms (x)
+        if other.__counts is not None:
+            for j in range (len (self.names)):
+                edges, counts = other.get_histogram (j)
+                centers = (edges[:-1] + edges[1:]) / 2
+                for center, count in zip (centers, counts):
+                    if count > 0:
+                        self.__add_to_histogram (j, center, count)
+
+
+    def get_size (self):
+        """ Returns the number of summarized parameters. """
+        return self.__n
+
+
+    def get_mean (self):
+        """ Returns a numpy array with the mean of each parameter. """
+        return self.__mean.copy ()
+
+
+    def get_covariance (self):
+        """ Returns the sample covariance matrix of the parameters. """
+        if self.__n < 2:
+            return np.zeros (self.__M2.shape)
+        return self.__M2 / (self.__n - 1)
+
+
+    def get_log_likelihood_mean (self):
+        """ Returns the mean of the finite log-likelihoods. """
+        return self.__log_l_mean
+
+
+    def get_log_likelihood_variance (self):
+        """ Returns the sample variance of the finite log-likelihoods.
+        """
+        if self.__n_log_ls < 2:
+            return 0
+        return self.__log_l_M2 / (self.__n_log_ls - 1)
+
+
+    def get_histogram (self, j):
+        """ Returns the histogram of a parameter.
+
+            Parameters
+                j: the index of the parameter.
+
+            Returns
+                edges: a numpy array with the n_bins + 1 edges of the
+                    bins.
+                counts: a numpy array with the number of values of each
+                    bin.
+        """
+        if self.__counts is None:
+            if len (self.__buffer) == 0:
+                return np.zeros (self.n_bins + 1), np.zeros (self.n_bins)
+            values = np.array (self.__buffer)[:, j]
+            counts, edges = np.histogram (values, self.n_bins)
+            return edges, counts.astype (float)
+        edges = self.__lows[j] + self.__widths[j] * \
+                np.arange (self.n_bins + 1)
+        return edges, self.__counts[j].copy ()
+
+
+    def get_density (self, j):
+        """ Returns the centers of the bins of the histogram of a
+            parameter and the estimated probability density on each of
+            them. """
+        edges, counts = self.get_histogram (j)
+        widths = np.diff (edges)
+        total = np.sum (counts)
+        density = np.zeros (len (counts))
+        if total > 0:
+            positive = widths > 0
+            density[positive] = counts[positive] / (total *
+                    widths[positive])
+        return (edges[:-1] + edges[1:]) / 2, density
+
+
+    def get_quantiles (self, qs):
+        """ Returns the quantiles of each parameter.
+
+            Parameters
+                qs: a list of probabilities.
+
+            Returns
+                a numpy array of shape (len (qs), number of parameters).
+        """
+        quantiles = np.zeros ((len (qs), len (self.names)))
+        for j in range (len (self.names)):
+            if self.__counts is None:
+                if len (self.__buffer) > 0:
+                    values = np.array (self.__buffer)[:, j]
+                    quantiles[:, j] = np.quantile (values, qs)
+                continue
+            edges, counts = self.get_histogram (j)
+            cumulative = np.concatenate (([0], np.cumsum (counts)))
+            cumulative /= cumulative[-1]
+            quantiles[:, j] = np.interp (qs, cumulative, edges)
+        return quantiles
@@ -0,0 +1,115 @@
+# Binary files with the samples of power posteriors. A sample file is a
+# zip archive of numpy arrays (which can also be opened with numpy.load)
+# with a JSON member of metadata. Samples are written in blocks, and the
+# archive is closed after each block, so an interrupted run leaves a
+# readable file with every block written before the interruption.
+import json
+import zipfile
+import numpy as np
+
+class SampleWriter:
+    """ This class writes the samples of power posteriors to a
+        compressed binary file, block by block. The blocks of a
+        temperature can be written at different moments; they are
+        concatenated when the file is read by read_sample_file. """
+
+    def __init__ (self, file_name, metadata=None):
+        """ Default constructor. Creates the file, replacing any file
+            with the same name.
+
+            Parameters
+                file_name: the path of the sample file.
+                metadata: a dictionary, that can be written as JSON,
+                    with information about the sample (e.g. the model
+                    name).
+        """
+        self.__file_name = file_name
+        self.__metadata = dict (metadata or {})
+        self.__n_blocks = 0
+        with zipfile.ZipFile (file_name, 'w', zipfile.ZIP_DEFLATED) \
+                as archive:
+            archive.writestr ("metadata.json",
+                    json.dumps (self.__metadata))
+
+
+    def write (self, beta, thetas, log_ls):
+        """ Appends a block to the sample of a temperature.
+
+            Parameters
+                beta: the temperature of the sample.
+                thetas: a list of RandomParameterList objects.
+                log_ls: a list with the log-likelihoods of thetas.
+        """
+        if len (thetas) != len (log_ls):
+            raise ValueError ("thetas and log_ls should have the same" \
+                    + " size.")
+        names = [p.name for p in thetas[0]] if len (thetas) > 0 else []
+        values = np.array ([theta.get_values () for theta in thetas],
+                dtype=float).reshape (len (thetas), len (names))
+        block = "block_" + str (self.__n_blocks) + "_"
+        with zipfile.ZipFile (self.__file_name, 'a',
+                zipfile.ZIP_DEFLATED) as archive:
+            SampleWriter.__write_array (archive, block + "beta",
+                    np.array (beta, dtype=float))
+            SampleWriter.__write_array (archive, block + "names",
+                    np.array (names, dtype=str))
+            SampleWriter.__write_array (archive, block + "thetas",
+                    values)
+            SampleWriter.__write_array (archive, block + "log_ls",
+                    np.array (log_ls, dtype=float))
+        self.__n_blocks += 1
+
+
+    @staticmethod
+    def __write_array (archive, name, array):
+        """ Writes a numpy array as a member of a zip archive. """
+        with archive.open (name + ".npy", 'w') as f:
+            np.lib.format.write_array (f, array, allow_pickle=False)
+
+
+def read_sample_file (file_name):
+    """ Reads a file written by SampleWriter.
+
+        Parameters
+            file_name: the path of the sample file.
+
+        Returns
+            a dictionary with the keys
+                betas: a list with the temperatures of the file, in
+                    the order they were first written.
+                names: a list with the names of the parameters.
+                thetas: a list with a numpy array of shape (n, m) for
+                    each temperature, whose rows are the sampled
+                    parameters.
+                log_ls: a list with a numpy array with the
+                    log-likelihoods of the sample of each temperature.
+                metadata: the metadata of the file.
+    """
+    betas = []
+    names = []
+    thetas = {}
+    log_ls = {}
+    with zipfile.ZipFile (file_name) as archive:
+        metadata = json.loads (archive.read ("metadata.json").decode ())
+    with np.load (file_name, allow_pickle=False) as arrays:
+        n_blocks = sum ([1 for f in arrays.files if f.endswith ("_beta")])
+        for i in range (n_blocks):
+            block = "block_" + str (i) + "_"
+            beta = float (arrays[block + "beta"])
+            if beta not in thetas:
+                betas.append (beta)
+                thetas[beta] = []
+                log_ls[beta] = []
+            if len (arrays[block + "names"]) > 0:
+                names = [str (n) for n in arrays[block + "names"]]
+                thetas[beta].append (arrays[block + "thetas"])
+                log_ls[beta].append (arrays[block + "log_ls"])
+
+    m = len (names)
+    return {"betas": betas,
+            "names": names,
+            "thetas": [np.concatenate (thetas[b] + [np.zeros ((0, m))])
+                for b in betas],
+            "log_ls": [np.concatenate (log_ls[b] + [np.zeros (0)])
+                for b in betas],
+            "metadata": metadata}
@@ -0,0 +1,249 @@
+# In this module we calculate the marginal likelihood of models given
+# observed data using a Sequential Monte Carlo sampler with adaptive
+# tempering, as presented in "Sequential Monte Carlo samplers", Del
+# Moral, Doucet and Jasra, and "Adaptive Tempering" of Jasra et. al.
+# A population of particles is moved from the priors to the posterior
+# through a sequence of power posteriors, and the marginal likelihood is
+# obtained as a by-product of the particle reweighting.
+from marginal_likelihood.samplers.FixedCovarianceMCMC import \
+        FixedCovarianceMCMC
+from marginal_likelihood.LikelihoodFunction import LikelihoodFunction
+import multiprocessing
+
+from parallel_map import parallel_map
+from utils import safe_log
+import numpy as np
+
+class SequentialMonteCarlo:
+    """ This class is able to estimate the marginal likelihood of a
+        model given experimental data using a Sequential Monte Carlo
+        sampler. """
+
+    def __init__ (self, n_particles, n_moves, ess_ratio=.5,
+            verbose=False, n_process=0):
+        """ Default constructor. n_particles is the number of particles
+            of the population. n_moves is the number of Metropolis-
+            Hastings iterations performed on each particle after every
+            resampling. ess_ratio is the fraction of n_particles that
+            the effective sample size of the particle weights should
+            have on every temperature; the next temperature is chosen so
+            that this is true. """
+        if not 0 < ess_ratio < 1:
+            raise ValueError ("ess_ratio should be in (0, 1).")
+        self.__n_particles = n_particles
+        self.__n_moves = n_moves
+        self.__ess_ratio = ess_ratio
+        self.__verbose = verbose
+        self.__betas = None
+        self.__sample = None
+
+        if n_process == 0:
+            self.__n_process = max (1, \
+                    multiprocessing.cpu_count () // 2)
+            if verbose:
+                print ("Using automatic number of process.")
+        else:
+            self.__n_process = n_process
+
+
+    def get_betas (self):
+        """ Returns the list of temperatures chosen by the sampler on
+            the last call of estimate_marginal_likelihood. """
+        return self.__betas
+
+
+    def get_posterior_sample (self):
+        """ Returns the particles of the posterior distribution (beta =
+            1) and a list with their log-likelihoods.
+
+            Note
+                This method should only be called after a succesful call
+                of estimate_marginal_likelihood.
+        """
+        if self.__sample == None:
+            raise ValueError ("Sample is undefined, you should first" \
+                    + " call the method estimate_marginal_likelihood.")
+        thetas = [theta.get_copy () for theta, _ in self.__sample]
+        log_ls = [log_l for _, log_l in self.__sample]
+        return thetas, log_ls
+
+
+    def print_sample (self, output_file=None):
+        """ Prints the particles of the posterior distribution.
+
+            Parameters
+                output_file: a string with a filename. If this is
+                    provided, the sample is also printed this file.
+            Note
+                This method should only be called after a succesful call
+                of estimate_marginal_likelihood.
+        """
+        if self.__sample == None:
+            raise ValueError ("Sample is undefined, before printing" \
+                    + " sample, you should first call the method" \
+                    + " estimate_marginal_likelihood.")
+
+        if output_file:
+            file_obj = open (output_file, "w")
+
+        print_str = "Sample for t = 1"
+        print (print_str)
+        if output_file:
+            file_obj.write (print_str + "\n")
+        for theta, log_l in self.__sample:
+            print_str = "parameter = " + str (theta.get_values ()) \
+                    + " likelihood = " + str (log_l)
+            print (print_str)
+            if output_file:
+                file_obj.write (print_str + "\n")
+
+        if output_file:
+            file_obj.close ()
+
+
+    @staticmethod
+    def __get_ess (log_w):
+        """ Returns the effective sample size of a list of
+            log-weights. """
+        if not np.max (log_w) > float ("-inf"):
+            return 0
+        w = np.exp (log_w - np.max (log_w))
+        return np.sum (w) ** 2 / np.sum (w * w)
+
+
+    @staticmethod
+    def __log_mean_exp (log_w):
+        """ Returns log (mean (exp (log_w))) avoiding overflows. """
+        max_log_w = np.max (log_w)
+        if not max_log_w > float ("-inf"):
+            return float ("-inf")
+        return max_log_w + safe_log (np.mean (np.exp (log_w -
+            max_log_w)))
+
+
+    def __find_next_beta (self, beta, log_ls):
+        """ Finds, by bisection, the next temperature for which the
+            weights of the particles have the wanted effective sample
+            size.
+
+            Parameters
+                beta: the current temperature.
+                log_ls: a numpy array with the log-likelihoods of the
+                    particles.
+
+            Returns
+                the next temperature.
+        """
+        target_ess = self.__ess_ratio * len (log_ls)
+        get_ess = SequentialMonteCarlo.__get_ess
+        if get_ess ((1 - beta) * log_ls) >= target_ess:
+            return 1
+
+        low = beta
+        high = 1
+        for _ in range (50):
+            mid = (low + high) / 2
+            if get_ess ((mid - beta) * log_ls) >= target_ess:
+                low = mid
+            else:
+                high = mid
+        # we never want to get stuck on the same temperature
+        return max (low, beta + 1e-12)
+
+
+    @staticmethod
+    def __get_move_covariance (particles, w):
+        """ Estimates the covariance of the log of the parameters of
+            weighted particles and scales it as recommended for random
+            walk Metropolis. """
+        log_values = np.log ([theta.get_values () for theta in
+            particles])
+        n = log_values.shape[1]
+        S = np.cov (log_values, rowvar=False, aweights=w)
+        S = np.array (S, ndmin=2)
+        S = S * (2.38 ** 2) / n + np.eye (n) * 1e-8
+        return S
+
+
+    @staticmethod
+    def __move_particle (particle, log_l, beta, S, seed, experiments,
+            model, theta_prior, n_moves):
+        """ Map function that moves a particle with Metropolis-Hastings
+            iterations that have the power posterior of temperature beta
+            as target. """
+        # The random state is restored so moving the particles on this
+        # process does not change the numbers generated after the move
+        random_state = np.random.get_state ()
+        np.random.seed (seed)
+        fc_mcmc = FixedCovarianceMCMC (theta_prior, model, experiments,
+                S, t=beta)
+        fc_mcmc.define_start_sample ([particle], [log_l])
+        fc_mcmc.get_sample (n_moves)
+        sample, likelis = fc_mcmc.get_last_sampled (1)
+        np.random.set_state (random_state)
+        return sample[0], likelis[0]
+
+
+    def estimate_marginal_likelihood (self, experiments, model,
+            theta_prior):
+        """ This function estimates the marginal likelihood of a model.
+        """
+        n = self.__n_particles
+        n_process = self.__n_process
+        self.__sample = None
+
+        # initialize ODEs function and jacobian
+        model.evaluate_on ([experiments[0].times[0]])
+        model.get_system_jacobian ()
+        print ("Initialized ODEs")
+
+        particles = [theta_prior.get_random_copy () for _ in range (n)]
+        l_f = LikelihoodFunction (model)
+        log_ls = np.array (l_f.get_log_likelihoods (experiments,
+            particles, n_process))
+        if not np.max (log_ls) > float ("-inf"):
+            raise ValueError ("All parameters drawn from the priors " \
+                    + "have zero likelihood.")
+
+        beta = 0
+        betas = [beta]
+        log_ml = 0
+        while beta < 1:
+            next_beta = self.__find_next_beta (beta, log_ls)
+            log_w = (next_beta - beta) * log_ls
+            log_ml += SequentialMonteCarlo.__log_mean_exp (log_w)
+            w = np.exp (log_w - np.max (log_w))
+            w /= np.sum (w)
+            beta = next_beta
+            betas.append (beta)
+            if self.__verbose:
+                print ("SMC temperature " + str (beta) + \
+                        ", partial log marginal likelihood = " + \
+                        str (log_ml))
+
+            # Resample
+            S = SequentialMonteCarlo.__get_move_covariance (particles,
+                    w)
+            idxs = np.random.choice (n, n, p=w)
+            particles = [particles[i].get_copy () for i in idxs]
+            log_ls = log_ls[idxs]
+
+            # Move
+            seeds = np.random.randint (2 ** 31, size=n)
+            move_f = lambda args : \
+                    SequentialMonteCarlo.__move_particle (args[0],
+                    args[1], beta, S, args[2], experiments, model,
+                    theta_prior, self.__n_moves)
+            move_args = list (zip (particles, log_ls, seeds))
+            if n_process > 1:
+                moved = parallel_map (move_f, move_args, n_process)
+            else:
+                moved = [move_f (args) for args in move_args]
+            particles = [theta for theta, _ in moved]
+            log_ls = np.array ([log_l for _, log_l in moved])
+
+        self.__betas = betas
+        self.__sample = list (zip (particles, log_ls))
+        print ("Sampling ended.")
+        print ("Calculated log marginal likelihood: " + str (log_ml))
+        return log_ml
@@ -0,0 +1,225 @@
+# A surrogate of the likelihood function, which is a Gaussian process
+# regression of log-likelihoods already calculated, as presented in
+# "Gaussian Processes for Machine Learning", Rasmussen and Williams. The
+# regression is performed on the log of the parameters. When the
+# regression is not confident about a parameter, the likelihood is
+# calculated by integrating the model and, until the surrogate is
+# frozen, the new point is used to improve the regression.
+
+import numpy as np
+from scipy.linalg import cho_factor
+from scipy.linalg import cho_solve
+from scipy.linalg import solve_triangular
+from marginal_likelihood.LikelihoodFunction import LikelihoodFunction
+
+class SurrogateLikelihoodFunction:
+    """ This class defines an approximation of the likelihood function
+        of a model that is learned from evaluated points. It has the
+        same interface of LikelihoodFunction. """
+
+    # Candidates of length scale of the kernel, as multiples of the
+    # square root of the number of parameters
+    LENGTH_SCALES = [.25, .5, 1, 2, 4]
+
+    def __init__ (self, ode, max_std=1, min_points=20, max_points=500,
+            nugget=1e-3, tolerance_scale=1, likelihood_f=None):
+        """ Default constructor.
+
+            Parameters
+                ode: the system that rules the observed system.
+                max_std: the greatest standard deviation of the
+                    predicted log-likelihood for which the prediction
+                    is used; otherwise, the model is integrated.
+                min_points: the number of points needed before the
+                    regression is used.
+                max_points: the greatest number of points used on the
+                    regression. When there are more points, the oldest
+                    ones are forgotten.
+                nugget: the variance of the noise of the standardized
+                    log-likelihoods, which accounts for the integration
+                    error and makes the regression stable.
+                tolerance_scale: the tolerance scale of the likelihood
+                    function used when the model is integrated.
+                likelihood_f: the LikelihoodFunction used when the 
+                    model is integrated. If None, a LikelihoodFunction
+                    with tolerance_scale is created; sharing the one of
+                    a sampler avoids integrating its proposals again.
+        """
+        if likelihood_f is None:
+            likelihood_f = LikelihoodFunction (ode, tolerance_scale)
+        self.__l_f = likelihood_f
+        self.__max_std = max_std
+        self.__min_points = min_points
+        self.__max_points = max_points
+        self.__nugget = nugget
+        self.__X = []
+        self.__y = []
+        self.__gp = None
+        self.__is_frozen = False
+        self.__n_model_evaluations = 0
+        self.__n_surrogate_evaluations = 0
+
+
+    def get_n_model_evaluations (self):
+        """ Returns the number of likelihoods calculated by integrating
+            the model. """
+        return self.__n_model_evaluations
+
+
+    def get_n_surrogate_evaluations (self):
+        """ Returns the number of likelihoods predicted by the
+            regression. """
+        return self.__n_surrogate_evaluations
+
+
+    def freeze (self):
+        """ Stops adding the points integrated by get_log_likelihood 
+            and get_log_likelihoods to the regression. A frozen 
+            surrogate is a fixed function of the parameters, which 
+            delayed acceptance needs to keep the target distribution 
+            unchanged. """
+        self.__is_frozen = True
+
+
+    def add_points (self, thetas, log_ls):
+        """ Adds evaluated points to the regression. Points with
+            infinite log-likelihood are ignored.
+
+            Parameters
+                thetas: a list of RandomParameterList objects.
+                log_ls: a list with the log-likelihoods of thetas.
+        """
+        for theta, log_l in zip (thetas, log_ls):
+            if not np.isfinite (log_l):
+                continue
+            self.__X.append (np.log (theta.get_values ()))
+            self.__y.append (log_l)
+        self.__X = self.__X[-self.__max_points:]
+        self.__y = self.__y[-self.__max_points:]
+        self.__gp = None
+
+
+    def __fit_length_scale (self, X, y, length_scale):
+        """ Returns the Cholesky factor of the kernel matrix of X, the
+            weights of the regression and the log marginal likelihood of
+            the regression with the given length scale. """
+        sq_dists = np.sum ((X[:, None, :] - X[None, :, :]) ** 2,
+                axis=2)
+        K = np.exp (-.5 * sq_dists / length_scale ** 2)
+        K += np.eye (len (y)) * self.__nugget
+        try:
+            L = cho_factor (K, lower=True)
+        except np.linalg.LinAlgError:
+            return None, None, float ("-inf")
+        alpha = cho_solve (L, y)
+        log_ml = -.5 * np.dot (y, alpha) - \
+                np.sum (np.log (np.diagonal (L[0])))
+        return L, alpha, log_ml
+
+
+    def __fit (self):
+        """ Fits the regression to the current points. The parameters
+            and log-likelihoods are standardized and the length scale
+            is the candidate of greatest marginal likelihood. """
+        X = np.array (self.__X)
+        y = np.array (self.__y)
+        x_mean = X.mean (axis=0)
+        x_std = X.std (axis=0) + 1e-8
+        y_mean = y.mean ()
+        y_std = y.std () + 1e-8
+        X = (X - x_mean) / x_std
+        y = (y - y_mean) / y_std
+
+        best = None
+        for scale in SurrogateLikelihoodFunction.LENGTH_SCALES:
+            length_scale = scale * np.sqrt (X.shape[1])
+            L, alpha, log_ml = self.__fit_length_scale (X, y,
+                    length_scale)
+            if best is None or log_ml > best[3]:
+                best = (length_scale, L, alpha, log_ml)
+        length_scale, L, alpha, _ = best
+        self.__gp = (X, x_mean, x_std, y_mean, y_std, length_scale, L,
+                alpha)
+
+
+    def predict (self, theta):
+        """ Predicts the log-likelihood of theta with the regression.
+
+            Returns
+                mean: the predicted log-likelihood.
+                std: the standard deviation of the prediction. It is
+                    inf if there are not enough points.
+        """
+        if len (self.__y) < self.__min_points:
+            return float ("nan"), float ("inf")
+        if self.__gp is None:
+            self.__fit ()
+        X, x_mean, x_std, y_mean, y_std, length_scale, L, alpha = \
+                self.__gp
+        if L is None:
+            return float ("nan"), float ("inf")
+
+        x = (np.log (theta.get_values ()) - x_mean) / x_std
+        sq_dists = np.sum ((X - x) ** 2, axis=1)
+        k = np.exp (-.5 * sq_dists / length_scale ** 2)
+        mean = y_mean + y_std * np.dot (k, alpha)
+        v = solve_triangular (L[0], k, lower=True)
+        var = max (1 + self.__nugget - np.dot (v, v), 0)
+        return mean, y_std * np.sqrt (var)
+
+
+    def get_log_likelihood (self, experiments, theta):
+        """ Returns the predicted log-likelihood of theta if the
+            regression is confident enough, or calculates it by
+            integrating the model otherwise. In the latter case, theta
+            is added to the regression, unless the surrogate is 
+            frozen. """
+        mean, std = self.predict (theta)
+        if std <= self.__max_std:
+            self.__n_surrogate_evaluations += 1
+            return mean
+
+        log_l = self.__l_f.get_log_likelihood (experiments, theta)
+        self.__n_model_evaluations += 1
+        if not self.__is_frozen:
+            self.add_points ([theta], [log_l])
+        return log_l
+
+
+    def get_log_likelihoods (self, experiments, thetas, n_process=1):
+        """ Calculates the log-likelihood of a batch of parameters. The
+            parameters for which the regression is not confident are
+            integrated in parallel if n_process is greater than one, and
+            are added to the regression after the whole batch is
+            evaluated, unless the surrogate is frozen.
+
+            Parameters
+                experiments: a list of experiments, as expected by
+                    get_log_likelihood.
+                thetas: a list of RandomParameterList objects.
+                n_process: the number of process used to integrate the
+                    model.
+
+            Returns
+                a list with the log-likelihood of each element of
+                thetas.
+        """
+        log_ls = [None] * len (thetas)
+        to_integrate = []
+        for i in range (len (thetas)):
+            mean, std = self.predict (thetas[i])
+            if std <= self.__max_std:
+                self.__n_surrogate_evaluations += 1
+                log_ls[i] = mean
+            else:
+                to_integrate.append (i)
+
+        integrated = self.__l_f.get_log_likelihoods (experiments,
+                [thetas[i] for i in to_integrate], n_process)
+        self.__n_model_evaluations += len (to_integrate)
+        for i, log_l in zip (to_integrate, integrated):
+            log_ls[i] = log_l
+        if not self.__is_frozen:
+            self.add_points ([thetas[i] for i in to_integrate], 
+                    integrated)
+        return log_ls
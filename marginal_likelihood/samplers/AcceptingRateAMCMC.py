@@ -19,15 +19,25 @@ class AcceptingRateAMCMC (MetropolisHastings):
         Biochemical Species", Tian-Rui Xu et. al. """
 
     def __init__ (self, theta, model, experiments, sigma_update_n, 
-            verbose=False, t=1):
-        """ Default constructor. """
+            verbose=False, t=1, fisher_update_n=0):
+        """ Default constructor. If fisher_update_n is positive, the
+            jumps are correlated and have as covariance matrix the 
+            inverse of the tempered Fisher information of the current
+            point (see __calc_fisher_S), which is recalculated every
+            fisher_update_n iterations. """
         super ().__init__ (theta, verbose=verbose)
         self.__model = model
         self.__experiments = experiments
         self.__sigma_update_n = sigma_update_n
         self._jump_S = self.__init_jump_S ()
+        self.__prior_jump_S = list (self._jump_S)
         self.__l_f = LikelihoodFunction (model)
         self._t = t
+        self.__fisher_update_n = fisher_update_n
+        # The covariance of the jumps calculated from the Fisher 
+        # information, which is None when it is not used
+        self._fisher_S = None
+        self._fisher_scale = 1
     
 
     def _open_trace_file (self):
@@ -68,16 +78,57 @@ class AcceptingRateAMCMC (MetropolisHastings):
             jump_S.append (sigma2)
         return jump_S
 
-    
+
+    def set_jump_S (self, jump_S):
+        """ Defines the variances of the jump distribution, replacing
+            the ones estimated from the priors. This is useful when a
+            good guess of the jump variances is already available, e.g.
+            from a sampler of a neighbouring temperature.
+
+            Parameters
+                jump_S: a list with the variance of the log-scaled jump
+                    of each parameter.
+        """
+        if len (jump_S) != self._theta.get_size ():
+            raise ValueError ("jump_S should have one variance for " \
+                    + "each parameter.")
+        self._jump_S = list (jump_S)
+
+
+    def __calc_fisher_S (self, theta):
+        """ Calculates the covariance matrix of the jumps from the 
+            expected Fisher information of theta, F. On the log scale,
+            the information is D F D, where D = diag (theta), and the
+            covariance is
+                (2.38 ^ 2 / n) * inv (t * D F D + P)
+            where t is the temperature and P is a diagonal matrix with
+            the inverse of the log-scaled prior variances, so the jumps
+            are never wider than the priors. """
+        n = theta.get_size ()
+        values = np.array (theta.get_values ())
+        fisher = self.__l_f.get_fisher_information (self.__experiments,
+                theta)
+        log_fisher = values[:, None] * fisher * values[None, :]
+        precision = self._t * log_fisher + \
+                np.diag (1 / np.array (self.__prior_jump_S))
+        return np.linalg.inv (precision) * (2.38 ** 2) / n
+
+
+    def get_jump_covariance (self):
+        """ Returns the covariance matrix of the log-scaled jumps. """
+        if self._fisher_S is not None:
+            return self._fisher_S * self._fisher_scale
+        return np.diag (self._jump_S)
+
+
     def _create_jump_dist (self, theta_t):
         """ The jump distribution is Multivariate Lognormal with a 
             diagonal covariance matrix, i.e the jumps on each parameter
-            are independent. """
-        n = theta_t.get_size ()
+            are independent. If the Fisher information is used, the
+            covariance matrix is the one calculated on the last 
+            update. """
         t_vals = np.array (theta_t.get_values ())
-        S = np.eye (n)
-        for i in range (n):
-            S[i, i] = self._jump_S[i]
+        S = self.get_jump_covariance ()
         mu = np.array (np.log (t_vals))
         dist = MultivariateLognormal (mu, S)
         return dist
@@ -88,6 +139,15 @@ class AcceptingRateAMCMC (MetropolisHastings):
         self._t = t
 
 
+    def sample (self, N):
+        """ Performs N iterations of the chain. """
+        if self.__fisher_update_n > 0 and self._fisher_S is None \
+                and len (self._sample) > 0:
+            self._fisher_S = self.__calc_fisher_S (
+                    self._sample.get_last ()[0])
+        super ().sample (N)
+
+
     def _calc_mh_ratio (self, new_t, new_l, old_t, old_l):
         """ In this case, the MH ratio should be:
             [p (y | t*) / p (y | t)] * [p (t*) / p(t)] * 
@@ -131,9 +191,20 @@ class AcceptingRateAMCMC (MetropolisHastings):
         return self.__l_f.get_log_likelihood (self.__experiments, theta)
 
 
+    def _calc_bounded_log_likelihood (self, theta, log_l_min):
+        """ Calculates the log of p (experiments | theta, model), or 
+            -inf if it is smaller than log_l_min. """
+        return self.__l_f.get_bounded_log_likelihood (
+                self.__experiments, theta, log_l_min)
+
+
     def _iteration_update (self):
         if self._n_jumps % self.__sigma_update_n == 0:
             self.__update_Sigma ()
+        if self.__fisher_update_n > 0 and \
+                self._n_jumps % self.__fisher_update_n == 0:
+            self._fisher_S = self.__calc_fisher_S (
+                    self._sample.get_last ()[0])
         
     
     def __update_Sigma (self):
@@ -145,6 +216,10 @@ class AcceptingRateAMCMC (MetropolisHastings):
         acceptance_rate = self.get_acceptance_ratio ()
         jump_S = self._jump_S
         # print (jump_S)
+        if acceptance_rate > .4 and self._fisher_scale < 10:
+            self._fisher_scale *= 1.5
+        if acceptance_rate < .25 and self._fisher_scale > 1e-3:
+            self._fisher_scale *= .5
         for i in range (len (jump_S)):
             if acceptance_rate > .4 and jump_S[i] < 10:
                 jump_S[i] += jump_S[i] * .5
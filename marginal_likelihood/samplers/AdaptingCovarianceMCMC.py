@@ -3,7 +3,6 @@ from marginal_likelihood.samplers.MetropolisHastings import \
         MetropolisHastings
 from marginal_likelihood.LikelihoodFunction import LikelihoodFunction
 from distributions.MultivariateLognormal import MultivariateLognormal
-from covariance_estimate import calc_covariance
 from utils import safe_log
 from utils import safe_pow_exp_ratio
 from utils import get_current_datetime
@@ -41,11 +40,29 @@ class AdaptingCovarianceMCMC (MetropolisHastings):
         self.__experiments = experiments
         self._jump_S = None
         self._jump_scale = 1
+        # Running mean and sum of squared deviations of the log-scaled
+        # sample, from which jump_S is calculated. They are only 
+        # updated by samplers that adapt jump_S
+        self._adapts_covariance = True
+        self.__n_log_values = 0
+        self.__log_mean = None
+        self.__log_M2 = None
         self._covariance_rescale_n = covariance_rescale_n
         self.__l_f = LikelihoodFunction (model)
         self._t = t
 
 
+    def set_likelihood_function (self, likelihood_f):
+        """ Defines the LikelihoodFunction used to calculate the 
+            log-likelihoods of the parameters, so its cache can be 
+            shared with other samplers and likelihood approximations.
+        
+            Parameters
+                likelihood_f: a LikelihoodFunction of the model.
+        """
+        self.__l_f = likelihood_f
+
+
     def set_temperature (self, t):
         """ Defines the tempering parameter.
         
@@ -65,14 +82,30 @@ class AdaptingCovarianceMCMC (MetropolisHastings):
         self._trace_file = open (file_name, 'w')
 
 
+    def _add_to_sample (self, theta, log_l):
+        """ Adds a parameter to the sample and updates the running 
+            mean and covariance of the log-scaled sample, so the sample
+            doesn't have to be kept to calculate jump_S. """
+        super ()._add_to_sample (theta, log_l)
+        if not self._adapts_covariance:
+            return
+        log_values = np.array ([safe_log (x) for x in \
+                theta.get_values ()])
+        if self.__log_mean is None:
+            self.__log_mean = np.zeros (len (log_values))
+            self.__log_M2 = np.zeros ((len (log_values), 
+                len (log_values)))
+        self.__n_log_values += 1
+        delta = log_values - self.__log_mean
+        self.__log_mean += delta / self.__n_log_values
+        self.__log_M2 += np.outer (delta, log_values - self.__log_mean)
+
+
     def __calc_jump_S (self):
         """ Calculates jump_S, an estimate of the covariance of 
-            parameters. """
-        sample_l_values = []
-        for t in self._sample:
-            log_values = [safe_log (x) for x in t.get_values ()]
-            sample_l_values.append (log_values)
-        self._jump_S = calc_covariance (sample_l_values)
+            parameters. This is the same as calc_covariance of the 
+            log-scaled sample. """
+        self._jump_S = self.__log_M2 / (self.__n_log_values - 1)
     
     
     def get_jump_covariance (self):
@@ -101,15 +134,15 @@ class AdaptingCovarianceMCMC (MetropolisHastings):
         return dist
 
 
-    def get_sample (self, N):
-        """ Get a sample of size N. """
+    def sample (self, N):
+        """ Performs N iterations of the chain. """
         if len (self._sample) == 0:
             raise ValueError ("The current sample can't be empty. " \
                     + "Try using the start_sample_from_prior () " \
                     + "method.")
 
         self.__calc_jump_S ()
-        return super ().get_sample (N)
+        super ().sample (N)
 
     def _calc_mh_ratio (self, new_t, new_l, old_t, old_l):
         """ In this case, the MH ratio should be:
@@ -164,6 +197,13 @@ class AdaptingCovarianceMCMC (MetropolisHastings):
         return self.__l_f.get_log_likelihood (self.__experiments, theta)
 
 
+    def _calc_bounded_log_likelihood (self, theta, log_l_min):
+        """ Calculates the log of p (experiments | theta, model), or 
+            -inf if it is smaller than log_l_min. """
+        return self.__l_f.get_bounded_log_likelihood (
+                self.__experiments, theta, log_l_min)
+
+
     def _iteration_update (self):
         """ At the end of each sampling iteration, we should update the
             Covariance Matrix. """
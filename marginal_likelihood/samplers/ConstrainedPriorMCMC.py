@@ -0,0 +1,57 @@
+from marginal_likelihood.samplers.FixedCovarianceMCMC import \
+        FixedCovarianceMCMC
+from utils import get_current_datetime
+from pathlib import Path
+
+class ConstrainedPriorMCMC (FixedCovarianceMCMC):
+    """ Objects of this class are able to return a sample of theta from
+        the prior distribution constrained to the region in which the
+        log-likelihood is greater than a threshold. This is the
+        distribution from which new points are drawn in nested sampling.
+        The proposal distribution is Multivariate Lognormal and it's
+        shape is defined on the constructor through a covariance
+        matrix. """
+
+    def __init__ (self, theta, model, experiments, covar, log_l_min,
+            verbose=False):
+        """ Default constructor.
+
+            Parameters
+                theta: a RandomParameterList with the parameter priors.
+                model: an ODES object with the model.
+                experiments: an ExperimentSet object with the
+                    experimental data.
+                covar: the covariance matrix of the log-scaled jumps.
+                log_l_min: the log-likelihood threshold. Only points
+                    with log-likelihood strictly greater than log_l_min
+                    are accepted.
+                verbose: boolean indicating if verbosity is wanted.
+        """
+        super ().__init__ (theta, model, experiments, covar, t=0,
+                verbose=verbose)
+        self._log_l_min = log_l_min
+
+
+    def set_noise_updates (self, n_updates, jump_variance=.1):
+        """ Updates of the experimental error alone are not supported,
+            since they would ignore the likelihood constraint. """
+        raise ValueError ("ConstrainedPriorMCMC does not support " \
+                + "experimental error updates.")
+
+
+    def _open_trace_file (self):
+        """ Open a file to write trace. Every draw of a run is
+            appended to the same file. """
+        Path ("trace").mkdir (parents=True, exist_ok=True)
+        file_name = "trace/" + get_current_datetime () + "_" \
+                + "constrained_prior"
+        self._trace_file = open (file_name, 'a')
+
+
+    def _calc_mh_ratio (self, new_t, new_l, old_t, old_l):
+        """ Proposals that do not satisfy the likelihood constraint are
+            rejected; otherwise the ratio is the one of the sampler of
+            the priors (temperature zero). """
+        if not new_l > self._log_l_min:
+            return 0
+        return super ()._calc_mh_ratio (new_t, new_l, old_t, old_l)
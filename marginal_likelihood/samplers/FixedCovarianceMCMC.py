@@ -3,6 +3,7 @@ from marginal_likelihood.samplers.MetropolisHastings import \
 from marginal_likelihood.samplers.AdaptingCovarianceMCMC import \
         AdaptingCovarianceMCMC
 from utils import get_current_datetime
+from pathlib import Path
 
 class FixedCovarianceMCMC (AdaptingCovarianceMCMC):
     """ Objects of this class are able to return a sample of theta using
@@ -16,17 +17,21 @@ class FixedCovarianceMCMC (AdaptingCovarianceMCMC):
         super ().__init__ (theta, model, experiments, 1e10, t=t, 
                 verbose=verbose)
         self._jump_S = covar 
+        self._adapts_covariance = False
 
 
     def _open_trace_file (self):
         """ Open a file to write trace. """
+        Path ("trace").mkdir (parents=True, exist_ok=True)
         file_name = "trace/" + get_current_datetime () + "_" \
                 + str (self._t) + "_" + "3rd_phase"
         self._trace_file = open (file_name, 'w')
 
 
-    def get_sample (self, N):
-        return MetropolisHastings.get_sample (self, N)
+    def sample (self, N):
+        """ Performs N iterations of the chain, without recalculating
+            the jump covariance. """
+        MetropolisHastings.sample (self, N)
 
 
     def _iteration_update (self):
@@ -0,0 +1,181 @@
+import numpy as np
+from marginal_likelihood.samplers.MetropolisHastings import \
+        MetropolisHastings
+from marginal_likelihood.LikelihoodFunction import LikelihoodFunction
+from distributions.MultivariateLognormal import MultivariateLognormal
+from utils import safe_exp
+from utils import get_current_datetime
+from pathlib import Path
+
+class LangevinMCMC (MetropolisHastings):
+    """ This class is able to return a sample of theta using the
+        Metropolis-adjusted Langevin algorithm (MALA), as presented in
+        "Exponential convergence of Langevin distributions and their
+        discrete approximations", Roberts and Tweedie. The random walk
+        is performed on the log of the parameters and the proposals are
+        shifted towards regions of higher posterior density using the
+        gradient of the target, which is calculated with the forward
+        sensitivities of the model. The proposal distribution is
+        Multivariate Lognormal with mean
+            log (theta) + (step_size ^ 2 / 2) * gradient
+        and covariance matrix step_size ^ 2 * I. """
+
+    # Optimal acceptance rate of MALA, "Optimal scaling of discrete
+    # approximations to Langevin diffusions", Roberts and Rosenthal.
+    TARGET_ACCEPTANCE = .574
+
+    def __init__ (self, theta, model, experiments, step_size, t=1,
+            adapt_step_size=True, verbose=False):
+        """ Default constructor.
+
+            Parameters
+                theta: a RandomParameterList with the parameter priors.
+                model: an ODES object with the model.
+                experiments: an ExperimentSet object with the
+                    experimental data.
+                step_size: the initial size of the log-scaled jumps.
+                t: the temperature of the power posterior that is the
+                    target distribution.
+                adapt_step_size: if True, the step size is updated on
+                    each iteration so the acceptance rate approaches
+                    TARGET_ACCEPTANCE.
+                verbose: boolean indicating if verbosity is wanted.
+        """
+        super ().__init__ (theta, verbose=verbose)
+        self.__model = model
+        self.__experiments = experiments
+        self.__l_f = LikelihoodFunction (model)
+        self.__log_step_size = np.log (step_size)
+        self.__adapt_step_size = adapt_step_size
+        self.__last_n_accepted = 0
+        # list of (theta, gradient) of the last evaluated parameters
+        self.__gradients = []
+        self._t = t
+
+
+    def _open_trace_file (self):
+        """ Open a file to write trace. """
+        trace_dir = "trace/" + self.__model.name
+        Path (trace_dir).mkdir (parents=True, exist_ok=True)
+        file_name = trace_dir + "/" + get_current_datetime () + "_" \
+                + str (self._t) + "_" + "langevin"
+        self._trace_file = open (file_name, 'w')
+
+
+    def set_temperature (self, t):
+        """ Defines a temperature parameter for this sampler. """
+        self._t = t
+        self.__gradients = []
+
+
+    def get_step_size (self):
+        """ Returns the current size of the log-scaled jumps. """
+        return np.exp (self.__log_step_size)
+
+
+    def get_jump_covariance (self):
+        """ Returns the covariance matrix of the log-scaled jumps, 
+            without the shift of the gradient. """
+        n = self._sample.get_last ()[0].get_size ()
+        return np.eye (n) * self.get_step_size () ** 2
+
+
+    def __cache_gradient (self, theta, gradient):
+        """ Keeps the gradient of the log-likelihood of theta, so it's
+            not calculated again when theta is the current parameter or
+            is compared with the current parameter. """
+        self.__gradients.append ((theta, gradient))
+        self.__gradients = self.__gradients[-3:]
+
+
+    def __get_gradient (self, theta):
+        """ Returns the gradient of the log-likelihood of theta. """
+        for cached_theta, gradient in self.__gradients:
+            if cached_theta is theta:
+                return gradient
+        _, gradient = self._calc_log_likelihood_gradient (theta)
+        self.__cache_gradient (theta, gradient)
+        return gradient
+
+
+    def __get_log_target_gradient (self, theta):
+        """ Returns the gradient of the log of the target density of the
+            log-scaled parameters, i.e. of
+                t * log p (y | theta) + log p (theta) + sum (log theta).
+        """
+        values = np.array (theta.get_values ())
+        l_gradient = self.__get_gradient (theta)
+        prior_gradient = np.array (theta.get_log_p_gradient ())
+        gradient = values * (self._t * l_gradient + prior_gradient) + 1
+        return np.nan_to_num (gradient)
+
+
+    def _create_jump_dist (self, theta_t):
+        """ The jump distribution is Multivariate Lognormal with the
+            mean of the underlying normal shifted by the gradient of the
+            log-scaled target. """
+        n = theta_t.get_size ()
+        step_size = self.get_step_size ()
+        log_values = np.log (np.array (theta_t.get_values ()))
+        gradient = self.__get_log_target_gradient (theta_t)
+        mu = log_values + (step_size ** 2 / 2) * gradient
+        S = np.eye (n) * step_size ** 2
+        return MultivariateLognormal (mu, S)
+
+
+    def _calc_mh_ratio (self, new_t, new_l, old_t, old_l):
+        """ In this case, the MH ratio should be:
+            [p (y | t*) / p (y | t)] ^ temperature * [p (t*) / p(t)] *
+            [J (t | t*) / J (t* | t)]
+            where t is the current parameter, t* is the proposed
+            parameter, and y is the observations from the experiment.
+            The ratio is calculated on log scale since the jump
+            densities are not symmetric and may be very small.
+        """
+        if not new_l > float ("-inf"):
+            return 0
+        new_log_p = new_t.get_log_p ()
+        if not new_log_p > float ("-inf"):
+            return 0
+        j_gv_old = self._create_jump_dist (old_t)
+        j_gv_new = self._create_jump_dist (new_t)
+        log_new_gv_old = j_gv_old.log_pdf (new_t.get_values ())
+        log_old_gv_new = j_gv_new.log_pdf (old_t.get_values ())
+        log_ratio = self._t * (new_l - old_l) + new_log_p \
+                - old_t.get_log_p () + log_old_gv_new - log_new_gv_old
+        if self._is_verbose:
+            self._trace_file.write ("\nstep size = " +
+                    str (self.get_step_size ()))
+        if np.isnan (log_ratio):
+            return 0
+        return safe_exp (log_ratio)
+
+
+    def _calc_log_likelihood (self, theta):
+        """ Calculates the log of p (experiments | theta, model). The
+            gradient of the log-likelihood is calculated alongside and
+            kept for the construction of the jump distribution. """
+        log_l, gradient = self._calc_log_likelihood_gradient (theta)
+        self.__cache_gradient (theta, gradient)
+        return log_l
+
+
+    def _calc_log_likelihood_gradient (self, theta):
+        """ Calculates the log of p (experiments | theta, model) and
+            its gradient with respect to theta. """
+        return self.__l_f.get_log_likelihood_gradient (
+                self.__experiments, theta)
+
+
+    def _iteration_update (self):
+        """ Updates the step size with a Robbins-Monro step towards the
+            target acceptance rate. The steps decrease over time, so
+            the adaptation vanishes. """
+        accepted = 1 if self._n_accepted > self.__last_n_accepted \
+                else 0
+        self.__last_n_accepted = self._n_accepted
+        if not self.__adapt_step_size:
+            return
+        gain = 1 / (self._n_jumps ** .6)
+        self.__log_step_size += gain * (accepted - \
+                LangevinMCMC.TARGET_ACCEPTANCE)
@@ -1,4 +1,7 @@
 import numpy as np
+from utils import safe_exp
+from utils import safe_log
+from marginal_likelihood.ChainStorage import ChainStorage
 
 class MetropolisHastings:
     """ This class is an interface that should be used as base for 
@@ -10,12 +13,21 @@ class MetropolisHastings:
     def __init__ (self, theta, verbose=False):
         """ Default constructor. """
         self._theta = theta.get_copy ()
-        self._sample = []
-        self._sample_log_likelds = []
+        self._sample = ChainStorage ()
         self._n_accepted = 0
         self._n_jumps = 0
         self._is_verbose = verbose
         self._trace_file = None
+        self._t = 1
+        self._noise_updates = 0
+        self._noise_jump_variance = .1
+        self._approx_log_likelihood_f = None
+        self._n_first_stage_rejections = 0
+        self._early_termination = False
+        self._summary = None
+        self._diagnostics = None
+        # (theta, approximate log-likelihood) of the current parameter
+        self.__current_approx = (None, None)
         
     
     def _create_jump_dist (self, theta_t):
@@ -58,6 +70,7 @@ class MetropolisHastings:
         """ Closes the trace file. """
         if self._trace_file is not None:
             self._trace_file.close()
+            self._trace_file = None
 
 
     def propose_jump (self, c_theta):
@@ -72,6 +85,210 @@ class MetropolisHastings:
         return new_theta
 
 
+    def set_noise_updates (self, n_updates, jump_variance=.1):
+        """ Defines a number of Metropolis-Hastings updates of the 
+            experimental error alone that are performed after each 
+            iteration of get_sample. These updates don't change the
+            model parameters, so their likelihoods can be calculated 
+            from the residual sums of the current parameter, without 
+            integrating the system again. 
+
+            Parameters
+                n_updates: the number of experimental error updates per
+                    iteration.
+                jump_variance: the variance of the log-scaled jumps of
+                    the experimental error.
+        """
+        self._noise_updates = n_updates
+        self._noise_jump_variance = jump_variance
+
+
+    def set_delayed_acceptance (self, approx_log_likelihood_f):
+        """ Enables delayed acceptance, as presented in "Markov chain 
+            Monte Carlo using an approximation", Christen and Fox. Each
+            proposal is first screened with a cheap approximation of 
+            the log-likelihood, and the exact log-likelihood is only 
+            calculated for proposals that pass this first stage. A 
+            second acceptance step corrects for the approximation, so
+            the target distribution is unchanged.
+
+            Parameters
+                approx_log_likelihood_f: a function that receives a
+                    parameter and returns an approximation of its 
+                    log-likelihood. If None, delayed acceptance is 
+                    disabled.
+        """
+        self._approx_log_likelihood_f = approx_log_likelihood_f
+        self.__current_approx = (None, None)
+
+
+    def set_summary (self, summary):
+        """ Defines an OnlineSummary to which the current parameter
+            and its log-likelihood are added at the end of each
+            iteration of get_sample.
+
+            Parameters
+                summary: an OnlineSummary object, or None to stop 
+                    summarizing the chain.
+        """
+        self._summary = summary
+
+
+    def get_summary (self):
+        """ Returns the OnlineSummary of the chain, or None if it was
+            not defined. """
+        return self._summary
+
+
+    def set_diagnostics (self, diagnostics):
+        """ Defines a ChainDiagnostics to which the log-scaled values
+            of the current parameter and the acceptance of the proposed
+            jump are added at the end of each iteration of get_sample.
+
+            Parameters
+                diagnostics: a ChainDiagnostics object, or None to stop
+                    the diagnostics of the chain.
+        """
+        self._diagnostics = diagnostics
+
+
+    def get_diagnostics (self):
+        """ Returns the ChainDiagnostics of the chain, or None if it 
+            was not defined. """
+        return self._diagnostics
+
+
+    def set_storage (self, storage):
+        """ Defines the ChainStorage in which the sampled parameters
+            are kept, which defines how many of them are retained. The
+            current parameter, if there is one, is added to the new 
+            storage.
+
+            Parameters
+                storage: a ChainStorage object.
+        """
+        if len (self._sample) > 0:
+            storage.append (*self._sample.get_last ())
+        self._sample = storage
+
+
+    def get_storage (self):
+        """ Returns the ChainStorage of the sampled parameters. """
+        return self._sample
+
+
+    def _add_to_sample (self, theta, log_l):
+        """ Adds a parameter to the sample; it becomes the current 
+            parameter of the chain. """
+        self._sample.append (theta, log_l)
+
+
+    def get_first_stage_rejection_ratio (self):
+        """ Returns the ratio # jumps rejected by the first stage of 
+            delayed acceptance / # jumps. """
+        return self._n_first_stage_rejections / self._n_jumps
+
+
+    def __get_approx_log_likelihood (self, theta):
+        """ Returns the approximate log-likelihood of theta, reusing the
+            one of the current parameter. """
+        cached_theta, approx_l = self.__current_approx
+        if cached_theta is not theta:
+            approx_l = self._approx_log_likelihood_f (theta)
+            self.__current_approx = (theta, approx_l)
+        return approx_l
+
+
+    def __delayed_acceptance_step (self, new_t, old_t, old_l):
+        """ Performs the two stages of delayed acceptance for the 
+            proposal new_t.
+
+            Returns
+                new_l: the exact log-likelihood of new_t, or None if it
+                    was not calculated.
+                r: the probability of accepting new_t on the second
+                    stage, which is zero if new_t is rejected on the 
+                    first stage.
+        """
+        old_approx_l = self.__get_approx_log_likelihood (old_t)
+        if not old_approx_l > float ("-inf"):
+            # The first stage can't screen proposals from here
+            new_l = self._calc_log_likelihood (new_t)
+            return new_l, self._calc_mh_ratio (new_t, new_l, old_t, 
+                    old_l)
+
+        new_approx_l = self._approx_log_likelihood_f (new_t)
+        r1 = self._calc_mh_ratio (new_t, new_approx_l, old_t, 
+                old_approx_l)
+        if np.random.uniform () > r1:
+            self._n_first_stage_rejections += 1
+            return None, 0
+
+        new_l = self._calc_log_likelihood (new_t)
+        if not new_l > float ("-inf"):
+            return new_l, 0
+        self.__current_approx = (new_t, new_approx_l)
+        log_r2 = self._t * ((new_l - old_l) - (new_approx_l - 
+            old_approx_l))
+        return new_l, safe_exp (log_r2)
+
+
+    def set_early_termination (self, early_termination):
+        """ Enables the early termination of the likelihood calculation
+            of proposals. The uniform number of the acceptance test is
+            drawn before the likelihood is calculated, which defines a
+            threshold that the log-likelihood of the proposal must 
+            exceed to be accepted; the integration of the system stops
+            as soon as this is impossible. The system is integrated 
+            step by step, so the likelihoods, and thus the sampled 
+            chain, only match the ones without early termination up to
+            the integrator precision. This option is ignored
+            when delayed acceptance is used or the temperature is zero.
+
+            Parameters
+                early_termination: a boolean.
+        """
+        self._early_termination = early_termination
+
+
+    def __get_log_likelihood_threshold (self, new_t, old_t, old_l, u):
+        """ Returns the smallest log-likelihood for which new_t is 
+            accepted given that the uniform number of the acceptance 
+            test is u. This assumes that the MH ratio is 
+            (p (y | new_t) / p (y | old_t)) ^ t times terms that don't
+            depend on the likelihood, which are calculated as the ratio
+            of a proposal with the same likelihood as old_t. """
+        r0 = self._calc_mh_ratio (new_t, old_l, old_t, old_l)
+        if not r0 > 0:
+            return float ("inf")
+        threshold = old_l + (np.log (u) - np.log (r0)) / self._t
+        if np.isnan (threshold):
+            return float ("-inf")
+        return threshold
+
+
+    def _noise_update (self):
+        """ Performs a Metropolis-Hastings update of the experimental
+            error of the current parameter, which is the last parameter
+            of the list. The jump is log-normal and the target is the
+            tempered posterior. """
+        old_t, old_l = self._sample.get_last ()
+        new_t = old_t.get_copy ()
+        old_sigma = old_t.get_experimental_error ()
+        jump = np.random.normal (0, np.sqrt (self._noise_jump_variance))
+        new_t[-1].value = old_sigma * np.exp (jump)
+        new_l = self._calc_log_likelihood (new_t)
+        if not new_l > float ("-inf"):
+            return
+
+        # The log-normal jump ratio J (old | new) / J (new | old) is 
+        # new_sigma / old_sigma
+        log_r = self._t * (new_l - old_l) + new_t.get_log_p () \
+                - old_t.get_log_p () + jump
+        if np.log (np.random.uniform ()) <= log_r:
+            self._add_to_sample (new_t, new_l)
+
+
     def get_acceptance_ratio (self):
         """ Returns the ratio  # accepted jumps / # jumps. """
         return self._n_accepted / self._n_jumps 
@@ -79,15 +296,14 @@ class MetropolisHastings:
 
     def define_start_sample (self, sample, log_likelds):
         """ Inserts sampled parameters and its log-likelihoods at the 
-            end of the self._sample array..
+            end of the sample.
             """
         if len (sample) != len (log_likelds):
             raise ValueError ("sample and log_likelds should have " \
                     + "same dimensions.")
     
-        self._sample = self._sample + sample
-        self._sample_log_likelds = self._sample_log_likelds + \
-                log_likelds
+        for theta, log_l in zip (sample, log_likelds):
+            self._add_to_sample (theta, log_l)
 
     
     def start_sample_from_prior (self):
@@ -97,34 +313,55 @@ class MetropolisHastings:
         for p in new_t:
             p.set_rand_value ()
         new_l = self._calc_log_likelihood (new_t)
-        self._sample.append (new_t)
-        self._sample_log_likelds.append (new_l)
+        self._add_to_sample (new_t, new_l)
 
 
     def manual_jump (self, theta, log_likeli):
         """ Manually jump from current theta to theta. If there's no
             current parameter, then theta becomes the first sample. """
-        self._sample.append (theta)
-        self._sample_log_likelds.append (log_likeli)
+        self._add_to_sample (theta, log_likeli)
         self._n_jumps += 1
         self._n_accepted += 1
 
 
     def get_sample (self, N):
         """ Get a sample of size N. """
+        self.sample (N)
+        return self.get_last_sampled (N)
+
+
+    def sample (self, N):
+        """ Performs N iterations of the chain without returning the
+            sampled parameters. Copies of parameters draw random values
+            (see RandomParameter), so, unlike get_sample, calling this 
+            method n times with N = 1 leaves the random number 
+            generator in the same state as calling it once with N = n.
+        """
         if len (self._sample) == 0:
             raise ValueError ("The current sample can't be empty. " \
                     + "Try using the start_sample_from_prior () " \
                     + "method.")
 
-        self._open_trace_file ()
+        if self._is_verbose:
+            self._open_trace_file ()
         trace_file = self._trace_file
 
         for _ in range (N):
-            old_t = self._sample[-1]
-            old_l = self._sample_log_likelds[-1]
+            old_t, old_l = self._sample.get_last ()
             new_t = self.propose_jump (old_t)
-            new_l = self._calc_log_likelihood (new_t)
+            u = None
+            if self._approx_log_likelihood_f is None and \
+                    self._early_termination and self._t > 0:
+                u = np.random.uniform ()
+                threshold = self.__get_log_likelihood_threshold (new_t,
+                        old_t, old_l, u)
+                new_l = self._calc_bounded_log_likelihood (new_t, 
+                        threshold)
+            elif self._approx_log_likelihood_f is None:
+                new_l = self._calc_log_likelihood (new_t)
+            else:
+                new_l, r = self.__delayed_acceptance_step (new_t, 
+                        old_t, old_l)
             
             if self._is_verbose:
                 # print ("old_t:", end=' ')
@@ -154,46 +391,52 @@ class MetropolisHastings:
                 trace_file.write ("\nProposed log_l = " + str(new_l))
 
 
-            r = self._calc_mh_ratio (new_t, new_l, old_t, old_l)
+            if self._approx_log_likelihood_f is None:
+                r = self._calc_mh_ratio (new_t, new_l, old_t, old_l)
             if self._is_verbose:
                 # print ("r = " + str (r), end="\n\n")
                 trace_file.write ("\nMH ratio = " + str(r))
-            if np.random.uniform () <= r:
+            if u is None:
+                u = np.random.uniform ()
+            accepted = u <= r
+            if accepted:
                 old_t = new_t
                 old_l = new_l
                 self._n_accepted += 1
-                self._sample.append (old_t)
-                self._sample_log_likelds.append (old_l)
+                self._add_to_sample (old_t, old_l)
                 if self._is_verbose:
                     trace_file.write ("\nAccepted\n")
             else:
                 if self._is_verbose:
                     trace_file.write ("\nRejected\n")
             self._n_jumps += 1
+            for _ in range (self._noise_updates):
+                self._noise_update ()
+            current_t, current_l = self._sample.get_last ()
+            if self._summary is not None:
+                self._summary.add (current_t.get_values (), current_l)
+            if self._diagnostics is not None:
+                log_values = [safe_log (x) for x in \
+                        current_t.get_values ()]
+                self._diagnostics.add (log_values, accepted)
             self._iteration_update ()
 
         self._close_trace_file ()
-        return self.get_last_sampled (N)
     
 
     def get_last_sampled (self, N):
         """ Returns the N last sampled parameters and a list of its
-            log-likelihoods. """
-        sample = []
-        log_likelds = []
-        
-        i = -N
-        if N > len (self._sample):
-            i = -len (self._sample)
+            log-likelihoods. Only the parameters retained by the storage
+            of the sampler (see set_storage) are returned. """
+        return self._sample.get_last_retained (N)
 
-        while i < 0:
-            t = self._sample[i]
-            l = self._sample_log_likelds[i]
-            sample.append (t.get_copy ())
-            log_likelds.append (l)
-            i += 1
 
-        return (sample, log_likelds)
+    def get_current (self):
+        """ Returns a copy of the current parameter of the chain and 
+            its log-likelihood. Unlike get_last_sampled, this doesn't
+            depend on which parameters are retained. """
+        theta, log_l = self._sample.get_last ()
+        return theta.get_copy (), log_l
 
 
     def _calc_mh_ratio (self, new_t, new_l, old_t, old_l):
@@ -211,6 +454,14 @@ class MetropolisHastings:
         raise NotImplementedError
 
 
+    def _calc_bounded_log_likelihood (self, theta, log_l_min):
+        """ Should calculate the log-likelihood of a parameter theta, 
+            and may return -inf as soon as it is certain that the 
+            log-likelihood is smaller than log_l_min. By default, the
+            log-likelihood is always calculated. """
+        return self._calc_log_likelihood (theta)
+
+
     def _iteration_update (self):
         """ Method called at the end of each iteration on get_sample.
         """
@@ -76,6 +76,20 @@ class PopulationalMCMC:
 
     def get_sample (self, N):
         """ Get a sample of size N. """
+        self.sample (N)
+        sample = []
+        likls  = []
+        for i in range (len (self.__betas)):
+            theta, likeli = self.__fc_mcmcs[i].get_current ()
+            sample.append (theta)
+            likls.append (likeli)
+        return (self.__betas, sample, likls)
+
+
+    def sample (self, N):
+        """ Performs N iterations without returning the current 
+            parameters of the temperatures (see 
+            MetropolisHastings.sample). """
         betas = self.__betas
         fc_mcmcs = self.__fc_mcmcs
         for i in range (N):
@@ -89,10 +103,8 @@ class PopulationalMCMC:
             k = temp_jump_dist.rvs () - 1
             inv_temp_jump_dist = DiscreteLaplacian (len (betas), k + 1)
             
-            sample, likelihoods = fc_mcmcs[j].get_last_sampled (1)
-            thetaj, thetaj_l = sample[0], likelihoods[0]
-            sample, likelihoods = fc_mcmcs[k].get_last_sampled (1)
-            thetak, thetak_l = sample[0], likelihoods[0]
+            thetaj, thetaj_l = fc_mcmcs[j].get_current ()
+            thetak, thetak_l = fc_mcmcs[k].get_current ()
             tjotk = safe_exp_ratio (thetaj_l, thetak_l)
             tkotj = safe_exp_ratio (thetak_l, thetaj_l)
             j_gv_k = inv_temp_jump_dist.pdf (j + 1)
@@ -112,14 +124,6 @@ class PopulationalMCMC:
                     print ("Inverted j and k.")
                 fc_mcmcs[j].manual_jump (thetak.get_copy (), thetak_l)
                 fc_mcmcs[k].manual_jump (thetaj.get_copy (), thetaj_l)
-        
-        sample = []
-        likls  = []
-        for i in range (len (betas)):
-            sub_sample, likeli = fc_mcmcs[i].get_last_sampled (1)
-            sample.append (sub_sample[0])
-            likls.append (likeli[0])
-        return (betas, sample, likls)
 
 
     def get_last_sampled (self, N):
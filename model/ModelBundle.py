@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+from model.ODES import ODES
+
+class ModelBundle:
+    """ This class contains a model read from an SBML file, converted to
+        a system of ordinary differential equations. The model is saved
+        on disk together with the compiled functions of the system, so
+        later runs load it without reading the SBML file and without
+        sympy. The bundle is built again when the SBML file changes.
+
+        A ModelBundle has the methods get_all_param and
+        get_original_param_name of SBML objects, so it can be used to
+        define the priors of the model parameters.
+
+        Attributes
+            odes (ODES): the system of differential equations of the
+                model.
+            sbml_hash (string): the sha1 digest of the SBML file from
+                which the model was built.
+            __params (list): a list with the names of the parameters of
+                the SBML model, in the order of SBML.get_all_param.
+            __original_names (dict): a dictionary that maps the names
+                of the parameters to their names on the SBML file.
+    """
+
+    # Version of the format of the bundle files. Bundles of other
+    # versions are built again
+    FORMAT_VERSION = 1
+
+    def __init__ (self, odes, params, original_names, sbml_hash):
+        """ Default constructor.
+
+            Parameters
+                odes: an ODES object with the system of the model.
+                params: a list with the names of the parameters of the
+                    SBML model.
+                original_names: a dictionary that maps the names of the
+                    parameters to their names on the SBML file.
+                sbml_hash: the sha1 digest of the SBML file.
+        """
+        self.odes = odes
+        self.sbml_hash = sbml_hash
+        self.__params = list (params)
+        self.__original_names = dict (original_names)
+
+
+    def get_all_param (self):
+        """ Gets all parameters of the SBML model.
+
+            Returns a dictionary with parameter names and values.
+        """
+        return {param: self.odes.param_table[param] for param in
+                self.__params}
+
+
+    def get_original_param_name (self, param):
+        """ Gets the name of a parameter on the SBML file. """
+        return self.__original_names[param]
+
+
+    @staticmethod
+    def load (sbml_file, bundle_dir, reduce_conservation_laws=False):
+        """ Loads the bundle of an SBML model. If there is no bundle of
+            the current content of the file, the model is read,
+            converted, compiled and saved on bundle_dir.
+
+            Parameters
+                sbml_file: the path of the SBML file.
+                bundle_dir: the directory in which bundles are kept.
+                reduce_conservation_laws: the option of the same name
+                    of sbml_to_odes.
+
+            Returns a ModelBundle object.
+        """
+        with open (sbml_file, 'rb') as f:
+            sbml_hash = hashlib.sha1 (f.read ()).hexdigest ()
+        key = (sbml_hash, bool (reduce_conservation_laws),
+                ModelBundle.FORMAT_VERSION)
+        digest = hashlib.sha1 (repr (key).encode ()).hexdigest ()
+        path = os.path.join (bundle_dir, digest)
+
+        bundle = ModelBundle.__read (path, sbml_hash)
+        if bundle is None:
+            bundle = ModelBundle.__build (sbml_file, path, sbml_hash,
+                    reduce_conservation_laws)
+            bundle.__write (path)
+        return bundle
+
+
+    @staticmethod
+    def __build (sbml_file, path, sbml_hash, reduce_conservation_laws):
+        """ Reads an SBML file and converts it to a bundle whose system
+            is compiled on path. """
+        from model.SBML import SBML
+        from model.SBMLtoODES import sbml_to_odes
+        sbml = SBML ()
+        if not sbml.load_file (sbml_file):
+            raise ValueError ("Could not read the SBML model of " + \
+                    sbml_file + ".")
+        odes = sbml_to_odes (sbml, reduce_conservation_laws)
+        odes.compiled_dir = path
+        odes.compile ()
+        params = list (sbml.get_all_param ())
+        original_names = {}
+        for param in params:
+            original_names[param] = sbml.get_original_param_name (param)
+        return ModelBundle (odes, params, original_names, sbml_hash)
+
+
+    def __write (self, path):
+        """ Writes the model of the bundle on path. The system of the
+            bundle must have been compiled on the same path. """
+        odes = self.odes
+        model = {"format_version": ModelBundle.FORMAT_VERSION,
+                 "sbml_hash": self.sbml_hash,
+                 "name": odes.name,
+                 "species": list (odes.index_map),
+                 "rate_eq": list (odes.rate_eq),
+                 "initial_state": list (odes.initial_state),
+                 "algebraic_eq": odes.algebraic_eq,
+                 "param_table": list (odes.param_table.items ()),
+                 "params": self.__params,
+                 "original_names": self.__original_names}
+        # The file is written with a temporary name and renamed, so
+        # other process never read a partial bundle
+        model_file = os.path.join (path, 'model.json')
+        tmp_file = model_file + '.' + str (os.getpid ()) + '.tmp'
+        os.makedirs (path, exist_ok=True)
+        with open (tmp_file, 'w') as f:
+            json.dump (model, f)
+        os.replace (tmp_file, model_file)
+
+
+    @staticmethod
+    def __read (path, sbml_hash):
+        """ Reads the bundle written on path, or returns None if there
+            is no valid bundle of the SBML file with digest sbml_hash.
+        """
+        try:
+            with open (os.path.join (path, 'model.json')) as f:
+                model = json.load (f)
+        except (OSError, ValueError):
+            return None
+        if model.get ("format_version") != ModelBundle.FORMAT_VERSION \
+                or model.get ("sbml_hash") != sbml_hash:
+            return None
+
+        odes = ODES ()
+        odes.name = model["name"]
+        odes.compiled_dir = path
+        for i in range (len (model["species"])):
+            var = model["species"][i]
+            odes.add_equation (var, model["rate_eq"][i])
+            odes.define_initial_value (var, model["initial_state"][i])
+        for param, value in model["param_table"]:
+            odes.define_parameter (param, value)
+        for var in model["algebraic_eq"]:
+            odes.add_algebraic_equation (var, model["algebraic_eq"][var])
+        return ModelBundle (odes, model["params"],
+                model["original_names"], sbml_hash)
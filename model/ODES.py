@@ -1,14 +1,19 @@
-import matplotlib
-matplotlib.use('Agg') #uncomment when running on server
-
+# Sympy and matplotlib are only imported when the system is compiled
+# or plotted, so systems that were already compiled are loaded and 
+# integrated without them.
 from scipy.integrate import odeint
 import scipy.integrate as spi
-import sympy as sym
-from sympy.parsing.sympy_parser import parse_expr
-from sympy.utilities.autowrap import autowrap
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import reverse_cuthill_mckee
 from asteval import Interpreter
-import matplotlib.pyplot as plt
 import numpy as np
+import filecmp
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import sys
 
 class ODES:
     """ This class contains a representation for systems of ordinary
@@ -21,14 +26,33 @@ class ODES:
                 differential equations associated to variables.
             initial_state (list of floats): the initial values for each 
                 variable.
+            algebraic_eq (dict): a map from variables that are not 
+                integrated to formulas that define them as functions of
+                the other variables and of the parameters.
             param_table (dict): a map for model parameters and its
                 values.
             name (string): models name.
+            compiled_dir (string): the directory in which the code of
+                the system is generated and compiled. If empty, the
+                current directory is used.
             sys_function: a sympy function object that represents the
                 system function, that is, the right hand side of the
                 system of differential equations.
             sys_jacobian: a sympy function object that represents the 
                 jacobian of the system function.
+            jacobian_sparsity: a boolean numpy array with the non-zero
+                entries of the jacobian of the system function.
+            band_structure: a tuple (perm, ml, mu) with a reordering of
+                the variables that gives the jacobian a narrow band, 
+                and the lower and upper bandwidths of the reordered 
+                jacobian. All values are None if the system is 
+                integrated with a dense jacobian.
+            sys_param_jacobian: a sympy function object that represents
+                the jacobian of the system function with respect to the
+                parameters.
+            exp_derivatives: a dictionary that maps expressions of
+                the system to python functions that evaluate the
+                expression and its partial derivatives.
             sys_eq: a sympy object that has the equality defined by the
                 system of differential equations. 
             sys_vars: a sympy object that is a list of variables, used
@@ -37,6 +61,14 @@ class ODES:
                 used  in sys_eq.
     """
 
+    # Systems with at least this number of variables are integrated with
+    # banded jacobians, if the reordered bandwidth is small enough
+    BANDED_MIN_SIZE = 10
+
+    # Greatest number of outputs of each compiled function. Larger 
+    # functions are split, so the C compiler time stays bounded
+    MAX_FUNCTION_SIZE = 500
+
     def __init__ (self):
         """ Default constructor. """
         # A map var -> var index
@@ -47,12 +79,18 @@ class ODES:
         
         # The initial state of a var
         self.initial_state = []
+
+        # A map var -> formula of variables that are not integrated
+        self.algebraic_eq = {}
     
         # A hash table with values of parameters
         self.param_table = {}
 
         # The model's name
         self.name = ''
+
+        # The directory of the generated code
+        self.compiled_dir = ''
     
         # The function that represents the system
         self.sys_function = None
@@ -60,6 +98,19 @@ class ODES:
         # The function that represents the system jacobian
         self.sys_jacobian = None
 
+        # The non-zero entries of the system jacobian
+        self.jacobian_sparsity = None
+
+        # The reordering and bandwidths used by the banded integration
+        self.band_structure = None
+
+        # The function that represents the system jacobian with respect
+        # to the parameters
+        self.sys_param_jacobian = None
+
+        # Functions that evaluate expressions and its derivatives
+        self.exp_derivatives = {}
+
         # A sympy object that represents the system
         self.sys_eq = None
 
@@ -85,12 +136,19 @@ class ODES:
         for var in self.index_map:
             print ("d" + var + "/dt = ", end="")
             print (self.rate_eq[self.index_map[var]], end='\n\n')
+        for var in self.algebraic_eq:
+            print (var + " = ", end="")
+            print (self.algebraic_eq[var], end='\n\n')
 
 
     def __erase_sympy_objects (self):
         """ Sets to None all sympy objects that model the system. """
         self.sys_function = None
         self.sys_jacobian = None
+        self.jacobian_sparsity = None
+        self.band_structure = None
+        self.sys_param_jacobian = None
+        self.exp_derivatives = {}
         self.sys_eq = None
         self.sys_vars = None
         self.sys_params = None
@@ -114,6 +172,20 @@ class ODES:
         self.__erase_sympy_objects ()
 
 
+    def add_algebraic_equation (self, var, formula):
+        """ Adds a variable that is not integrated, but defined by a 
+            formula of the other variables and of the parameters. Its
+            values are calculated after the system is integrated and it
+            can be used on expressions as any other variable.
+
+            Parameters
+                var: a string with the variable name.
+                formula: the formula that defines var.
+        """
+        self.algebraic_eq[var] = formula
+        self.__erase_sympy_objects ()
+
+
     def define_initial_value (self, var, value):
         """ Defines the initial value of a variable. 
             
@@ -151,8 +223,16 @@ class ODES:
         return self.param_table
 
 
+    def compile (self):
+        """ Compiles the system function and its jacobian, which are 
+            needed to integrate the system, if they were not compiled
+            yet. """
+        self.__get_system_function ()
+        self.get_system_jacobian ()
+
+
     def __integrate_with_odeint (self, sys_f, initial_state, 
-            time_points):
+            time_points, tolerance_scale=1):
         """ Integrates using scipy odeint. 
             
             Parameters
@@ -165,6 +245,8 @@ class ODES:
                 initial_state: is also an array, defining the starting
                     value for each variable.
                 time_points: a list of time points for integration.
+                tolerance_scale: a factor that multiplies the absolute
+                    and relative tolerances of the integrator.
 
             Return
                 y: the values integrated
@@ -174,17 +256,30 @@ class ODES:
                 that would imply on writing and compiling the system
                 function and jacobian. However, if the system is not
                 changed, there will be no need to rewrite C files and
-                compile them, making the call much faster.
+                compile them, making the call much faster. Large systems
+                with sparse jacobians are integrated with their 
+                variables reordered and a banded jacobian.
         """
         # The order of iterations of a dict in python will not change
         # if nothing has been added (if that is true, the system is 
         # rewritten). This is importatnt for args definition.
         args = [self.param_table[param] for param in self.param_table]
         jacobian = self.get_system_jacobian ()
-        y, _ = odeint (sys_f, initial_state, time_points, args=(args,),
-                Dfun=jacobian, full_output=True,
-                tfirst=True, atol=1e-1, rtol=1e-2)
-        return y
+        perm, ml, mu = self.__get_band_structure ()
+        if perm is None:
+            y, _ = odeint (sys_f, initial_state, time_points, 
+                    args=(args,), Dfun=jacobian, full_output=True,
+                    tfirst=True, atol=1e-1 * tolerance_scale, 
+                    rtol=1e-2 * tolerance_scale)
+            return y
+
+        banded_f, banded_jac = self.__get_banded_functions (sys_f)
+        z0 = np.array (initial_state, dtype='d')[perm]
+        z, _ = odeint (banded_f, z0, time_points, args=(args,),
+                Dfun=banded_jac, ml=ml, mu=mu, full_output=True,
+                tfirst=True, atol=1e-1 * tolerance_scale, 
+                rtol=1e-2 * tolerance_scale)
+        return z[:, np.argsort (perm)]
 
 
     def __integrate_with_stiff_alg (self, sys_f, initial_state, 
@@ -220,7 +315,23 @@ class ODES:
         return np.array (y)
 
 
-    def evaluate_on (self, time_points, initial_state_map=None):
+    def __get_initial_state (self, initial_state_map):
+        """ Returns the initial state of the system with the values of
+            initial_state_map, a dictionary with variables as keys and
+            initial values as values. """
+        initial_state = self.initial_state.copy ()
+        if initial_state_map != None:
+            for var in initial_state_map:
+                if var in self.algebraic_eq:
+                    raise ValueError ("The initial value of " + var + \
+                            " is defined by its algebraic equation.")
+                idx = self.index_map[var]
+                initial_state[idx] = initial_state_map[var]
+        return initial_state
+
+
+    def evaluate_on (self, time_points, initial_state_map=None,
+            tolerance_scale=1):
         """ Returns the state of the systems variables at the specified
             time points. 
             
@@ -229,6 +340,9 @@ class ODES:
                     system should be evaluated.
                 initial_state_map: a dictionary that contains variables
                     as keys and initial values as values.
+                tolerance_scale: a factor that multiplies the 
+                    tolerances of the integrator. Values greater than 
+                    one give cheaper and less accurate evaluations.
             
             Returns values_map, a dictionary with variables as keys and
             a list as value. The list contains the values of a variable
@@ -240,15 +354,11 @@ class ODES:
             time_points = np.insert (time_points, 0, 0)
             zeroed_times = True
 
-        initial_state = self.initial_state.copy ()
-        if initial_state_map != None:
-            for var in initial_state_map:
-                idx = self.index_map[var]
-                initial_state[idx] = initial_state_map[var]
+        initial_state = self.__get_initial_state (initial_state_map)
 
         sys_function = self.__get_system_function ()
         y = self.__integrate_with_odeint (sys_function, 
-                initial_state, time_points)
+                initial_state, time_points, tolerance_scale)
         
         values_map = {}
         for var in self.index_map:
@@ -258,11 +368,115 @@ class ODES:
                 values_map[var] = list (y[1:, idx])
             else:
                 values_map[var] = list (y[:, idx])
+        self.__add_algebraic_values (values_map)
         return values_map
 
 
-    def evaluate_exp_on (self, exp, time_points, 
+    def __add_algebraic_values (self, values_map):
+        """ Calculates the values of the algebraic variables given the
+            values of the integrated variables, and adds them to 
+            values_map. """
+        if len (self.algebraic_eq) == 0:
+            return
+        aeval = Interpreter ()
+        for param in self.param_table:
+            aeval.symtable[param] = self.param_table[param]
+        for var in self.index_map:
+            aeval.symtable[var] = np.array (values_map[var])
+        n_values = len (values_map[next (iter (self.index_map))])
+        for var in self.algebraic_eq:
+            value = aeval (self.algebraic_eq[var])
+            values_map[var] = list (np.broadcast_to (value, 
+                (n_values,)))
+
+
+    def evaluate_sensitivities_on (self, time_points, 
             initial_state_map=None):
+        """ Returns the state of the system variables and their 
+            derivatives with respect to the parameters (forward 
+            sensitivities) at the specified time points.
+
+            Parameters
+                time_points: the list of time points for which the
+                    system should be evaluated.
+                initial_state_map: a dictionary that contains variables
+                    as keys and initial values as values.
+
+            Returns 
+                values_map: a dictionary with variables as keys and a
+                    list with the values of the variable over the time
+                    points as values.
+                sensitivities_map: a dictionary with variables as keys
+                    and, as values, numpy arrays of shape 
+                    (len (time_points), m), where m is the number of 
+                    parameters. The element [i, j] is the derivative of
+                    the variable on the i-th time point with respect to
+                    the j-th parameter, in the order of 
+                    get_all_parameters.
+
+            Notes
+                The sensitivities s = dy/dp are integrated together 
+                with the system, as ds/dt = J s + df/dp, where J is 
+                the system jacobian and df/dp is the jacobian of the
+                system function with respect to the parameters. The
+                initial state does not depend on the parameters.
+        """
+        time_points = np.array (time_points)
+        zeroed_times = False
+        if time_points[0] != 0:
+            time_points = np.insert (time_points, 0, 0)
+            zeroed_times = True
+
+        initial_state = self.__get_initial_state (initial_state_map)
+
+        n = len (self.rate_eq)
+        m = len (self.param_table)
+        sys_f = self.__get_system_function ()
+        jacobian = self.get_system_jacobian ()
+        param_jacobian = self.get_system_parameter_jacobian ()
+
+        def augmented_f (t, z, args):
+            y = z[:n]
+            sens = z[n:].reshape (n, m)
+            dy = np.array (sys_f (t, y, args), ndmin=1)
+            J = np.array (jacobian (t, y, args)).reshape (n, n)
+            dsens = np.dot (J, sens) + param_jacobian (t, y, args)
+            return np.concatenate ((dy, dsens.ravel ()))
+
+        def augmented_jacobian (t, z, args):
+            # The sensitivities equations depend on y, but we only need
+            # an approximation of the jacobian on the Newton iterations
+            J = np.array (jacobian (t, z[:n], args)).reshape (n, n)
+            aug_J = np.zeros ((n + n * m, n + n * m))
+            aug_J[:n, :n] = J
+            aug_J[n:, n:] = np.kron (J, np.eye (m))
+            return aug_J
+
+        args = [self.param_table[param] for param in self.param_table]
+        z0 = np.concatenate ((np.array (initial_state, dtype='d'), 
+            np.zeros (n * m)))
+        z, _ = odeint (augmented_f, z0, time_points, args=(args,),
+                Dfun=augmented_jacobian, full_output=True, tfirst=True,
+                atol=1e-1, rtol=1e-2)
+
+        first = 1 if zeroed_times else 0
+        values_map = {}
+        sensitivities_map = {}
+        for var in self.index_map:
+            idx = self.index_map[var]
+            values_map[var] = list (z[first:, idx])
+            sens_idxs = n + idx * m + np.arange (m)
+            sensitivities_map[var] = z[first:, sens_idxs]
+        for var in self.algebraic_eq:
+            values, sens = self.__get_exp_sensitivities (var, 
+                    values_map, sensitivities_map)
+            values_map[var] = values
+            sensitivities_map[var] = sens
+        return values_map, sensitivities_map
+
+
+    def evaluate_exp_on (self, exp, time_points, 
+            initial_state_map=None, tolerance_scale=1):
         """ Evaluates some expression of variables of the system on
             given time points.
 
@@ -272,9 +486,11 @@ class ODES:
                     should be evaluated.
                 initial_state_map: a dictionary with variables as keys
                     and initial concentrations as values.
+                tolerance_scale: a factor that multiplies the 
+                    tolerances of the integrator.
         """
         system_states = self.evaluate_on (time_points, \
-                initial_state_map)
+                initial_state_map, tolerance_scale)
         aeval = Interpreter ()
         values = []
         for i in range (len (time_points)):
@@ -285,6 +501,173 @@ class ODES:
         return values
 
 
+    def iterate_exp_on (self, exp, time_points, initial_state_map=None,
+            tolerance_scale=1):
+        """ Evaluates some expression of variables of the system on
+            given time points, integrating the system only up to the 
+            next time point on each step. This allows the caller to 
+            stop the integration as soon as the remaining points are
+            not needed.
+
+            Parameters
+                exp: a string representing the expression.
+                time_points: a list time points for which the expression
+                    should be evaluated.
+                initial_state_map: a dictionary with variables as keys
+                    and initial concentrations as values.
+                tolerance_scale: a factor that multiplies the 
+                    tolerances of the integrator.
+
+            Returns
+                a generator of the values of the expression on each 
+                time point.
+
+            Notes
+                The system is integrated with the same LSODA algorithm 
+                and tolerances of evaluate_on, and the integrator is not
+                restarted between time points, so the values are the 
+                same up to the integrator precision.
+        """
+        initial_state = self.__get_initial_state (initial_state_map)
+
+        sys_function = self.__get_system_function ()
+        jacobian = self.get_system_jacobian ()
+        args = [self.param_table[param] for param in self.param_table]
+        initial_state = np.array (initial_state, dtype='d')
+        perm, ml, mu = self.__get_band_structure ()
+        if perm is None:
+            ode = spi.ode (sys_function, jacobian)
+            ode.set_integrator ('lsoda', atol=1e-1 * tolerance_scale, 
+                    rtol=1e-2 * tolerance_scale)
+            inv_perm = slice (None)
+        else:
+            banded_f, banded_jac = self.__get_banded_functions (
+                    sys_function)
+            ode = spi.ode (banded_f, banded_jac)
+            ode.set_integrator ('lsoda', atol=1e-1 * tolerance_scale, 
+                    rtol=1e-2 * tolerance_scale, lband=ml, uband=mu)
+            initial_state = initial_state[perm]
+            inv_perm = np.argsort (perm)
+        ode.set_initial_value (initial_state, 0)
+        ode.set_f_params (args)
+        ode.set_jac_params (args)
+
+        aeval = Interpreter ()
+        for param in self.param_table:
+            aeval.symtable[param] = self.param_table[param]
+        for t in time_points:
+            if t != ode.t:
+                y = np.array (ode.integrate (t), ndmin=1)[inv_perm]
+            else:
+                y = np.array (ode.y, ndmin=1)[inv_perm]
+            for var in self.index_map:
+                aeval.symtable[var] = y[self.index_map[var]]
+            for var in self.algebraic_eq:
+                aeval.symtable[var] = aeval (self.algebraic_eq[var])
+            yield aeval (exp)
+
+
+    def evaluate_exp_sensitivities_on (self, exp, time_points, 
+            initial_state_map=None):
+        """ Evaluates some expression of variables of the system and 
+            its derivatives with respect to the parameters on given 
+            time points.
+
+            Parameters
+                exp: a string representing the expression. It may have
+                    variables and parameters of the system.
+                time_points: a list time points for which the expression
+                    should be evaluated.
+                initial_state_map: a dictionary with variables as keys
+                    and initial concentrations as values.
+
+            Returns
+                values: a list with the values of the expression on 
+                    each time point.
+                sensitivities: a numpy array of shape 
+                    (len (time_points), m), where m is the number of 
+                    parameters. The element [i, j] is the derivative of
+                    the expression on the i-th time point with respect 
+                    to the j-th parameter, in the order of 
+                    get_all_parameters.
+        """
+        states, states_sens = self.evaluate_sensitivities_on (
+                time_points, initial_state_map)
+        return self.__get_exp_sensitivities (exp, states, states_sens)
+
+
+    def __get_exp_sensitivities (self, exp, states, states_sens):
+        """ Calculates the values of an expression and its derivatives
+            with respect to the parameters, given the values and the 
+            sensitivities of the integrated variables. """
+        exp_f, var_derivatives, param_derivatives = \
+                self.__get_exp_derivatives (exp)
+        n_times = len (states_sens[next (iter (self.index_map))])
+        args = [np.array (states[var]) for var in self.index_map]
+        args += [self.param_table[param] for param in self.param_table]
+
+        values = np.broadcast_to (exp_f (*args), (n_times,))
+        sensitivities = np.zeros ((n_times, len (self.param_table)))
+        for var in self.index_map:
+            d_exp = var_derivatives[self.index_map[var]] (*args)
+            d_exp = np.broadcast_to (d_exp, (n_times,))
+            sensitivities += d_exp[:, None] * states_sens[var]
+        for j in range (len (param_derivatives)):
+            d_exp = param_derivatives[j] (*args)
+            sensitivities[:, j] += np.broadcast_to (d_exp, (n_times,))
+        return list (values), sensitivities
+
+
+    def __get_exp_derivatives (self, exp):
+        """ Creates python functions that evaluate an expression of the
+            system and its partial derivatives with respect to each 
+            variable and each parameter. All functions receive the 
+            values of the variables followed by the values of the 
+            parameters. 
+
+            Returns
+                exp_f: the function that evaluates the expression.
+                var_derivatives: a list with the derivatives with 
+                    respect to each variable, in the order of index_map.
+                param_derivatives: a list with the derivatives with
+                    respect to each parameter, in the order of 
+                    param_table.
+        """
+        if exp in self.exp_derivatives:
+            return self.exp_derivatives[exp]
+
+        import sympy as sym
+        from sympy.parsing.sympy_parser import parse_expr
+
+        local_dict = {}
+        var_symbols = []
+        for var in self.index_map:
+            var_sym = sym.symbols (var)
+            var_symbols.append (var_sym)
+            local_dict[var] = var_sym
+        param_symbols = []
+        for param in self.param_table:
+            p_symbol = sym.symbols (param)
+            param_symbols.append (p_symbol)
+            local_dict[param] = p_symbol
+        # algebraic variables are replaced by their formulas
+        for var in self.algebraic_eq:
+            local_dict[var] = parse_expr (self.algebraic_eq[var].replace (
+                'pow', 'Pow'), local_dict=local_dict)
+
+        expr = parse_expr (exp.replace ('pow', 'Pow'), 
+                local_dict=local_dict)
+        symbols = var_symbols + param_symbols
+        exp_f = sym.lambdify (symbols, expr, 'numpy')
+        var_derivatives = [sym.lambdify (symbols, sym.diff (expr, s), 
+            'numpy') for s in var_symbols]
+        param_derivatives = [sym.lambdify (symbols, sym.diff (expr, s),
+            'numpy') for s in param_symbols]
+        derivatives = (exp_f, var_derivatives, param_derivatives)
+        self.exp_derivatives[exp] = derivatives
+        return derivatives
+
+
     def overtime_plot (self, var_list, t, initial_state_map=None, 
             filename='', xlabel=None, ylabel=None, title=None):
         """ Plots the values of a variable VAR over time t. """
@@ -297,6 +680,8 @@ class ODES:
         """ Gets a list of system variables, parameters and reaction 
             rate equations.
         """
+        import sympy as sym
+        from sympy.parsing.sympy_parser import parse_expr
         local_dict = {}
         var_symbols = []
         for var in self.index_map:
@@ -324,6 +709,7 @@ class ODES:
         """ Creates a sympy object that represents the system of 
             ordinary differential equations. 
         """
+        import sympy as sym
         n = len (self.rate_eq)
         m = len (self.param_table)
         var_names, params, equations = self.__get_sym_vars_equations ()
@@ -346,22 +732,183 @@ class ODES:
 
             This method uses Sympy to automatically create C code that
             represents the system; this C code is also automatically
-            compiled and wrapped as a python function.
+            compiled and wrapped as a python function. The compiled 
+            code is kept, so the same system is loaded without sympy
+            later.
         """
         if self.sys_function != None:
             return self.sys_function
 
-        self.__define_sys_eq ()
-        sys_vars = self.sys_vars
-        sys_params = self.sys_params
-        sys_fun = autowrap (self.sys_eq, backend='cython', \
-                tempdir='autowrap_sys_' + self.name + '_tmp', \
-                args=[sys_vars, sys_params])
+        tempdir = os.path.join (self.compiled_dir, 
+                'autowrap_sys_' + self.name + '_tmp')
+        sys_fun, _ = self.__load_compiled (tempdir)
+        if sys_fun is None:
+            if self.sys_eq == None:
+                self.__define_sys_eq ()
+            sys_fun = self.__compile_entries (list (self.sys_eq.rhs), 
+                    tempdir)
         wrapped_fun = self.odeint_sys_wrapper (sys_fun)
         self.sys_function = wrapped_fun
         return wrapped_fun
 
 
+    def __compile_entries (self, entries, tempdir, metadata=None):
+        """ Writes C code that calculates a list of sympy expressions of
+            the system variables and parameters, compiles it and wraps 
+            it as a python function. Subexpressions that are shared by
+            the entries, such as the rate of a reaction that appears on
+            the equations of all its reactants and products, are 
+            calculated only once. If there are more than 
+            MAX_FUNCTION_SIZE entries, they are split on several 
+            compiled functions. The compiled functions are saved with
+            metadata, so they can be loaded by __load_compiled.
+
+            Parameters
+                entries: a list of sympy expressions of sys_vars and
+                    sys_params.
+                tempdir: the directory of the generated code.
+                metadata: a dictionary, that can be written as JSON, 
+                    with information needed to use the function.
+
+            Returns a function that receives the numpy arrays of the
+            states, of shape (n, 1), and of the parameters, of shape 
+            (m, 1), and returns a numpy array with the value of each 
+            entry.
+        """
+        import sympy as sym
+        from sympy.utilities.codegen import C99CodeGen
+        size = ODES.MAX_FUNCTION_SIZE
+        functions = []
+        os.makedirs (tempdir, exist_ok=True)
+        # The modules are named after the directory of the compiled 
+        # functions, so they never clash with the modules of other 
+        # systems loaded by __load_compiled
+        digest = os.path.basename (self.__get_compiled_dir (tempdir))
+        code_gen = C99CodeGen ('autowrap', cse=True)
+        for first in range (0, len (entries), size):
+            chunk = entries[first:first + size]
+            sym_out = sym.MatrixSymbol ('out', len (chunk), 1)
+            sym_eq = sym.Eq (sym_out, sym.Matrix (chunk))
+            routine = code_gen.routine ('autofunc', sym_eq, 
+                    [self.sys_vars, self.sys_params, sym_out])
+            module_name = 'signetms_' + digest + '_' + \
+                    str (first // size)
+            code_wrapper = ODES.__create_code_wrapper (module_name, 
+                    code_gen, tempdir)
+            functions.append (code_wrapper.wrap_code (routine))
+
+        self.__save_compiled (tempdir, functions, metadata)
+        return ODES.__join_functions (functions)
+
+
+    @staticmethod
+    def __create_code_wrapper (module_name, code_gen, tempdir):
+        """ Returns a sympy CythonCodeWrapper that compiles the code of
+            code_gen on tempdir as an extension module named 
+            module_name. """
+        from sympy.utilities.autowrap import CythonCodeWrapper
+
+        class NamedCodeWrapper (CythonCodeWrapper):
+
+            @property
+            def module_name (self):
+                return module_name
+
+        return NamedCodeWrapper (code_gen, tempdir)
+
+
+    @staticmethod
+    def __join_functions (functions):
+        """ Returns a function that concatenates the outputs of compiled
+            functions. """
+        if len (functions) == 1:
+            return functions[0]
+        
+        def compiled_entries (npstate, npparams):
+            if len (functions) == 0:
+                return np.zeros (0)
+            return np.concatenate ([np.ravel (f (npstate, npparams)) 
+                for f in functions])
+        return compiled_entries
+
+
+    def __get_compiled_dir (self, tempdir):
+        """ Returns the directory in which the compiled functions of 
+            tempdir are kept for this system. It depends on everything
+            that defines the generated code, so a changed system is 
+            compiled again. """
+        key = (tempdir, list (self.index_map), list (self.rate_eq), 
+                list (self.param_table), ODES.MAX_FUNCTION_SIZE)
+        digest = hashlib.sha1 (repr (key).encode ()).hexdigest ()
+        return os.path.join (tempdir, 'compiled', digest)
+
+
+    def __save_compiled (self, tempdir, functions, metadata):
+        """ Copies the extension modules of compiled functions to the
+            directory of this system, with a manifest that lists them
+            together with their metadata. """
+        compiled_dir = self.__get_compiled_dir (tempdir)
+        if os.path.isdir (compiled_dir):
+            return
+        # The directory is written with a temporary name and renamed,
+        # so other process never load a partial directory
+        tmp_dir = compiled_dir + '.' + str (os.getpid ()) + '.tmp'
+        os.makedirs (tmp_dir, exist_ok=True)
+        modules = []
+        for f in functions:
+            module_file = sys.modules[f.__module__].__file__
+            shutil.copy (module_file, tmp_dir)
+            modules.append (os.path.basename (module_file))
+        with open (os.path.join (tmp_dir, 'manifest.json'), 'w') as f:
+            json.dump ({"modules": modules, "metadata": metadata}, f)
+        try:
+            os.rename (tmp_dir, compiled_dir)
+        except OSError:
+            shutil.rmtree (tmp_dir, ignore_errors=True)
+
+
+    def __load_compiled (self, tempdir):
+        """ Loads the functions of tempdir that were compiled for this
+            system before, without using sympy.
+
+            Returns
+                function: the compiled function, as returned by
+                    __compile_entries, or None if the system was not 
+                    compiled before.
+                metadata: the metadata saved with the function.
+        """
+        compiled_dir = self.__get_compiled_dir (tempdir)
+        try:
+            with open (os.path.join (compiled_dir, 'manifest.json')) \
+                    as f:
+                manifest = json.load (f)
+            functions = []
+            for module_file in manifest["modules"]:
+                module_name = module_file.split ('.')[0]
+                module_path = os.path.join (compiled_dir, module_file)
+                # The compiled functions are pickled with the name of
+                # their modules, so a module of the same name that was
+                # already loaded is used if it is the same module (e.g.
+                # of the same system), and the system is compiled again
+                # otherwise
+                loaded = sys.modules.get (module_name)
+                if loaded is not None:
+                    if not filecmp.cmp (loaded.__file__, module_path, 
+                            shallow=False):
+                        return None, None
+                    functions.append (loaded.autofunc_c)
+                    continue
+                spec = importlib.util.spec_from_file_location (
+                        module_name, module_path)
+                module = importlib.util.module_from_spec (spec)
+                spec.loader.exec_module (module)
+                functions.append (module.autofunc_c)
+        except (OSError, ValueError, KeyError, ImportError, 
+                AttributeError):
+            return None, None
+        return ODES.__join_functions (functions), manifest["metadata"]
+
+
     def odeint_sys_wrapper (self, lamb):
         """ This is a wrapper to the lambda functions that were created
             with sympy to represent the system function and also its 
@@ -396,29 +943,151 @@ class ODES:
 
     def get_system_jacobian (self):
         """ Creates the jacobian of the function that describes the 
-            dynamics of the system. """
+            dynamics of the system. Only the entries of the jacobian 
+            that are not identically zero are written and compiled, and
+            the returned function scatters them on a (n, n) array. """
         # system_function = f (state) = (f_1 (state), ..., f_n (state))
         if self.sys_jacobian != None:
             return self.sys_jacobian
 
-        if self.sys_eq == None:
-            self.__get_system_function () 
-        
         n = len (self.rate_eq)
-        rhs = self.sys_eq.rhs
-        sys_vars = self.sys_vars
-        sys_params = self.sys_params
-        sym_jacobian_rhs = rhs.jacobian (sys_vars)
-        sym_jacobian = sym.MatrixSymbol ('J', n, n)
-        sym_jac_eq = sym.Eq (sym_jacobian, sym_jacobian_rhs)
-        jac_fun = autowrap (sym_jac_eq, backend='cython', \
-                tempdir='autowrap_jac' + self.name + '_tmp', \
-                args=[sys_vars, sys_params])
-        wrapped_jac = self.odeint_sys_wrapper (jac_fun)
+        tempdir = os.path.join (self.compiled_dir, 
+                'autowrap_jac' + self.name + '_tmp')
+        jac_fun, metadata = self.__load_compiled (tempdir)
+        if jac_fun is not None:
+            rows = metadata["rows"]
+            cols = metadata["cols"]
+        else:
+            if self.sys_eq == None:
+                self.__define_sys_eq ()
+            sym_jacobian_rhs = self.sys_eq.rhs.jacobian (self.sys_vars)
+            rows = []
+            cols = []
+            entries = []
+            for i in range (n):
+                for j in range (n):
+                    if sym_jacobian_rhs[i, j] != 0:
+                        rows.append (i)
+                        cols.append (j)
+                        entries.append (sym_jacobian_rhs[i, j])
+            jac_fun = self.__compile_entries (entries, tempdir, 
+                    {"rows": rows, "cols": cols})
+        rows = np.array (rows, dtype=int)
+        cols = np.array (cols, dtype=int)
+        self.jacobian_sparsity = np.zeros ((n, n), dtype=bool)
+        self.jacobian_sparsity[rows, cols] = True
+        wrapped_entries = self.odeint_sys_wrapper (jac_fun)
+        self.__jacobian_entries = (rows, cols, wrapped_entries)
+
+        def wrapped_jac (t, state, args):
+            jac = np.zeros ((n, n))
+            jac[rows, cols] = wrapped_entries (t, state, args)
+            return jac
         self.sys_jacobian = wrapped_jac
         return wrapped_jac
 
 
+    def get_jacobian_sparsity (self):
+        """ Returns a boolean numpy array of shape (n, n) whose true 
+            entries are the ones of the jacobian of the system function
+            that are not identically zero. """
+        if self.sys_jacobian == None:
+            self.get_system_jacobian ()
+        return self.jacobian_sparsity
+
+
+    def __get_band_structure (self):
+        """ Finds a reordering of the variables that gives the jacobian 
+            of the system a narrow band, using the reverse Cuthill-McKee
+            algorithm. Reaction networks have sparse jacobians, so large
+            systems can be integrated with banded factorizations of the
+            jacobian instead of dense ones.
+
+            Returns
+                perm: an array with the reordering, that is, the i-th
+                    reordered variable is the variable of index perm[i].
+                ml: the lower bandwidth of the reordered jacobian.
+                mu: the upper bandwidth of the reordered jacobian.
+                If the system is small or the band is not narrow enough,
+                all values are None.
+        """
+        if self.band_structure != None:
+            return self.band_structure
+
+        n = len (self.rate_eq)
+        sparsity = self.get_jacobian_sparsity ()
+        self.band_structure = (None, None, None)
+        if n < ODES.BANDED_MIN_SIZE:
+            return self.band_structure
+
+        pattern = sparsity | sparsity.T | np.eye (n, dtype=bool)
+        perm = reverse_cuthill_mckee (csr_matrix (pattern.astype (int)),
+                symmetric_mode=True)
+        inv_perm = np.argsort (perm)
+        rows, cols = np.nonzero (pattern)
+        ml = int (np.max (inv_perm[rows] - inv_perm[cols]))
+        mu = int (np.max (inv_perm[cols] - inv_perm[rows]))
+        if ml + mu + 1 <= n // 2:
+            self.band_structure = (perm, ml, mu)
+        return self.band_structure
+
+
+    def __get_banded_functions (self, sys_f):
+        """ Returns the system function and its jacobian on the 
+            variables reordered by __get_band_structure. The jacobian is
+            returned on the packed format expected by odeint, where the
+            element [i - j + mu, j] is the derivative of the i-th 
+            equation with respect to the j-th variable. """
+        perm, ml, mu = self.__get_band_structure ()
+        rows, cols, entries_f = self.__jacobian_entries
+        inv_perm = np.argsort (perm)
+        band_rows = inv_perm[rows] - inv_perm[cols] + mu
+        band_cols = inv_perm[cols]
+        n = len (self.rate_eq)
+
+        def banded_f (t, z, args):
+            dy = np.array (sys_f (t, z[inv_perm], args), ndmin=1)
+            return dy[perm]
+
+        def banded_jac (t, z, args):
+            jac = np.zeros ((ml + mu + 1, n))
+            jac[band_rows, band_cols] = entries_f (t, z[inv_perm], args)
+            return jac
+        return banded_f, banded_jac
+
+
+    def get_system_parameter_jacobian (self):
+        """ Creates the jacobian of the function that describes the 
+            dynamics of the system with respect to the parameters. 
+            
+            Returns a function that receives (t, y, args) as the system
+            function and returns a numpy array of shape (n, m), where n
+            is the number of variables and m the number of parameters.
+        """
+        if self.sys_param_jacobian != None:
+            return self.sys_param_jacobian
+
+        n = len (self.rate_eq)
+        m = len (self.param_table)
+        tempdir = os.path.join (self.compiled_dir, 
+                'autowrap_pjac_' + self.name + '_tmp')
+        p_jac_fun, _ = self.__load_compiled (tempdir)
+        if p_jac_fun is None:
+            if self.sys_eq == None:
+                self.__define_sys_eq ()
+            sym_p_jacobian_rhs = self.sys_eq.rhs.jacobian (
+                    self.sys_params)
+            p_jac_fun = self.__compile_entries (list (
+                sym_p_jacobian_rhs), tempdir)
+        wrapped_p_jac = self.odeint_sys_wrapper (p_jac_fun)
+
+        def reshaped_p_jac (t, state, args):
+            return np.array (wrapped_p_jac (t, state, args)).reshape (n,
+                    m)
+        self.sys_param_jacobian = reshaped_p_jac
+        return reshaped_p_jac
+
+
     @staticmethod
     def __calc_func (func, symbol_table, interpreter=None):
         """ Evaluate func in the scope of symbol table. """
@@ -449,6 +1118,9 @@ class ODES:
             title):
         """ Plots values of vars in var_list that were observed on time 
             t. """
+        import matplotlib
+        matplotlib.use ('Agg')
+        import matplotlib.pyplot as plt
         legend = []
         var_list = [var for var in values_map.keys ()]
 
@@ -72,7 +72,8 @@ def define_sbml_params_priors (sbml, filename):
         SBML model.
         
         Parameters
-            sbml: an SBML object, with the model of interest.
+            sbml: an SBML object, with the model of interest, or a
+                ModelBundle of the model.
             filename: a file path that contains the definition of all
                 model parameters priors.
 
@@ -60,3 +60,9 @@ class RandomParameter:
         """
         return self.__distribution.log_pdf (self.value)
 
+
+    def get_log_p_derivative (self):
+        """ Returns the derivative of the log of the likelihood of the 
+            parameter on its current value. 
+        """
+        return self.__distribution.log_pdf_derivative (self.value)
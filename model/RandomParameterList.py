@@ -54,6 +54,16 @@ class RandomParameterList:
         return copy
 
 
+    def get_random_copy (self):
+        """ Returns a copy of this parameter list in which the value of
+            every parameter, including the experimental error, is drawn
+            from its distribution. """
+        copy = self.get_copy ()
+        for p in copy:
+            p.set_rand_value ()
+        return copy
+
+
     def set_experimental_error (self, p):
         """ Sets the experimental error.
 
@@ -132,6 +142,13 @@ class RandomParameterList:
         return log_prob
 
 
+    def get_log_p_gradient (self):
+        """ Returns a list with the derivative of the log of the prior
+            joint probability of this parameter list with respect to 
+            each parameter. The order is the same as in get_values. """
+        return [p.get_log_p_derivative () for p in self.__param_list]
+
+
     def get_size (self):
         """ Returns the number of elements. """
         return len (self.__param_list)
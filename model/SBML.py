@@ -21,6 +21,13 @@ class SBML:
                 reaction names. The values for an entry is the
                 corresponding list of reaction rate constants names.
             num_params (int): stores the number of parameters
+            __reactions_index (dict): a dictionary in which keys are 
+                species ids. The value of an entry is a list with a 
+                tuple (reaction, products, reactants) for each time the
+                species is referenced by a reaction.
+            __reaction_formulas (dict): a dictionary that maps reaction
+                ids to their rate formulas, with internal parameter
+                names and without compartments.
     """
 
     def __init__ (self):
@@ -49,6 +56,12 @@ class SBML:
         # Stores the model name
         self.name = ''
 
+        # Stores the reactions of each species and the formula of each
+        # reaction. They are built when first needed and erased when 
+        # the reactions of the model change.
+        self.__reactions_index = None
+        self.__reaction_formulas = {}
+
 
     def get_copy (self):
         """ Creates a copy of this object and returns it. 
@@ -93,6 +106,7 @@ class SBML:
         self.name = str (sbmldoc.model.name)
         self.__global_param = self.__get_global_params ()
         self.__local_param = self.__get_local_params ()
+        self.__erase_reactions_index ()
         return True
         
 
@@ -136,9 +150,7 @@ class SBML:
         """
         formula = ""
         reactions = self.__get_reactions_involving (species_name)
-        for reac in reactions:
-            products = [x.species for x in reac.getListOfProducts ()]
-            reactants = [x.species for x in reac.getListOfReactants ()]
+        for reac, products, reactants in reactions:
             if species_name in products and species_name in reactants:
                 continue
 
@@ -146,14 +158,46 @@ class SBML:
                 formula += "+ "
             else:
                 formula += "- "
-            formula += self.__reaction_rate_formula (reac)
+            formula += self.__get_reaction_formula (reac)
             formula += " "
         if formula == "":
             formula = "0"
         
-        return SBML.__remove_compartments (formula)
+        return formula
             
     
+    def get_stoichiometry_matrix (self):
+        """ Gets the stoichiometry matrix of the model, with the same
+            convention of get_species_kinetic_law: each reference to a
+            species as a product of a reaction adds 1 to its 
+            coefficient, each reference as a reactant adds -1, and a 
+            species that is both a reactant and a product of a reaction
+            has coefficient 0.
+
+            Returns
+                N: a list of lists, where N[i][j] is the coefficient of
+                    the i-th species of get_species_list on the j-th
+                    reaction of the model.
+        """
+        species = self.get_species_list ()
+        if self.sbml_obj == None:
+            return []
+
+        all_reactions = self.sbml_obj.model.getListOfReactions ()
+        reaction_idx = {}
+        for j in range (len (all_reactions)):
+            reaction_idx[all_reactions[j].getId ()] = j
+        N = [[0] * len (all_reactions) for _ in species]
+        for i in range (len (species)):
+            reactions = self.__get_reactions_involving (species[i])
+            for reac, products, reactants in reactions:
+                if species[i] in products and species[i] in reactants:
+                    continue
+                j = reaction_idx[reac.getId ()]
+                N[i][j] += 1 if species[i] in products else -1
+        return N
+
+
     def get_initial_concentration (self, species_name):
         """ Gets the initial concentration for a chemical species.
     
@@ -312,6 +356,7 @@ class SBML:
                 raise ValueError ("Could not set", modifier, \
                         "as a modifier")
         
+        self.__erase_reactions_index ()
         created_kinetic_law = created_reac.createKineticLaw ()
         created_kinetic_law.setFormula (reaction.formula)
         for param in reaction.parameters:
@@ -332,6 +377,7 @@ class SBML:
         """
         model = self.sbml_obj.model
         reaction = model.removeReaction (reaction_id)
+        self.__erase_reactions_index ()
         if not reaction:
             warnings.warn ("Could not find reaction with id" \
                     + str (reaction_id))
@@ -375,29 +421,53 @@ class SBML:
         created_species.setCompartment (compartment_id)
 
 
+    def __erase_reactions_index (self):
+        """ Erases the index of reactions and the formulas of reactions,
+            which must be done when the reactions of the model change.
+        """
+        self.__reactions_index = None
+        self.__reaction_formulas = {}
+
+
     def __get_reactions_involving (self, species_name):
         """ Gets all reactions involving some chemical species, as a
-            product or reactant.
+            product or reactant. The reactions of all species are 
+            indexed on the first call, so each call takes time 
+            proportional to the number of reactions of the species.
         
             Parameters
                 species_name: a string with the id of the chemical
                 species of interest.
 
-            Returns a list with libsbml.Reaction objects, each of these
-            objects representing a reaction that has the species of
-            interest as a reactant or product.
+            Returns a list with a tuple (reaction, products, reactants)
+            for each reference of a reaction to the species of 
+            interest, where reaction is a libsbml.Reaction object and
+            products and reactants are sets with the ids of its products
+            and reactants.
         """
-        model = self.sbml_obj.model
-        all_reactions = model.getListOfReactions ()
-        participating_reactions = []
-        for reac in all_reactions:
-            reacs_n_prod_ref = list (reac.getListOfReactants ()) + \
-                            list (reac.getListOfProducts ())
-            reacs_n_prod = [s.species for s in reacs_n_prod_ref]
-            for species in reacs_n_prod:
-                if species == species_name:
-                    participating_reactions.append (reac)
-        return participating_reactions
+        if self.__reactions_index is None:
+            index = {}
+            model = self.sbml_obj.model
+            for reac in model.getListOfReactions ():
+                reactants = [s.species for s in 
+                        reac.getListOfReactants ()]
+                products = [s.species for s in reac.getListOfProducts ()]
+                entry = (reac, set (products), set (reactants))
+                for species in reactants + products:
+                    index.setdefault (species, []).append (entry)
+            self.__reactions_index = index
+        return self.__reactions_index.get (species_name, [])
+
+
+    def __get_reaction_formula (self, reaction):
+        """ Gets the rate formula of a reaction, with internal parameter
+            names and without compartments. The formulas are cached. """
+        reac_id = reaction.getId ()
+        if reac_id not in self.__reaction_formulas:
+            formula = self.__reaction_rate_formula (reaction)
+            self.__reaction_formulas[reac_id] = \
+                    SBML.__remove_compartments (formula)
+        return self.__reaction_formulas[reac_id]
 
     
     def __new_parameter (self):
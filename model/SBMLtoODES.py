@@ -1,10 +1,18 @@
 from model.ODES import ODES
+import re
 
-def sbml_to_odes (sbml):
+def sbml_to_odes (sbml, reduce_conservation_laws=False):
     """ Creates an ODE model given an SBML object.
-    
+
         Parameters:
             sbml: a model.SBML object.
+            reduce_conservation_laws: if True, one species of each
+                linear conservation law of the model (e.g. total kinase
+                = active kinase + inactive kinase) is not integrated,
+                but defined by an algebraic equation of the other
+                species. The conserved totals are parameters of the
+                system named "total_" + species, calculated with the
+                initial concentrations of the model.
 
         Returns an ODES object that is a system of differential
         equations that rules the concentration changes of the chemical
@@ -12,8 +20,26 @@ def sbml_to_odes (sbml):
     """
     odes = ODES ()
     variables = sbml.get_species_list ()
+    laws = {}
+    if reduce_conservation_laws:
+        laws = find_conservation_laws (sbml)
+
+    dependent = {}
+    for dep_var in laws:
+        terms = ["(" + str (laws[dep_var][var]) + ") * " + var for var
+                in laws[dep_var] if var != dep_var]
+        formula = "total_" + dep_var
+        if len (terms) > 0:
+            formula += " - (" + " + ".join (terms) + ")"
+        dependent[dep_var] = formula
+
     for var in variables:
+        if var in dependent:
+            continue
         formula = sbml.get_species_kinetic_law (var)
+        for dep_var in dependent:
+            formula = re.sub (r"\b" + dep_var + r"\b", "(" +
+                    dependent[dep_var] + ")", formula)
         initial_val = sbml.get_initial_concentration (var)
         odes.add_equation (var, formula)
         odes.define_initial_value (var, initial_val)
@@ -21,5 +47,53 @@ def sbml_to_odes (sbml):
     params = sbml.get_all_param ()
     for param in params:
         odes.define_parameter (param, params[param])
+
+    for dep_var in dependent:
+        total = 0
+        for var in laws[dep_var]:
+            total += float (laws[dep_var][var]) * \
+                    sbml.get_initial_concentration (var)
+        odes.define_parameter ("total_" + dep_var, total)
+        odes.add_algebraic_equation (dep_var, dependent[dep_var])
     odes.name = sbml.name
     return odes
+
+
+def find_conservation_laws (sbml):
+    """ Finds the linear conservation laws of an SBML model, that is,
+        the linear combinations of species concentrations that do not
+        change over time. They are a basis of the left null space of
+        the stoichiometry matrix, in reduced row echelon form, so each
+        law has a species that does not appear on the other laws.
+
+        Parameters
+            sbml: a model.SBML object.
+
+        Returns
+            a dictionary that maps the species defined by each law to
+            a dictionary with the species of the law as keys and their
+            coefficients as values. The coefficient of the defined
+            species is one.
+    """
+    import sympy as sym
+    species = sbml.get_species_list ()
+    if len (species) == 0:
+        return {}
+    stoichiometry = sbml.get_stoichiometry_matrix ()
+    n_reactions = max (1, len (stoichiometry[0]))
+    N = sym.Matrix (len (species), n_reactions, lambda i, j :
+            stoichiometry[i][j] if j < len (stoichiometry[i]) else 0)
+
+    null_space = N.T.nullspace ()
+    if len (null_space) == 0:
+        return {}
+    L, pivots = sym.Matrix.hstack (*null_space).T.rref ()
+
+    laws = {}
+    for i in range (len (pivots)):
+        law = {}
+        for j in range (len (species)):
+            if L[i, j] != 0:
+                law[species[j]] = L[i, j]
+        laws[species[pivots[i]]] = law
+    return laws
@@ -0,0 +1,855 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_57.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *J) {
+
+   J[0] = -p[4]*y[2];
+   J[1] = p[5];
+   J[2] = -p[4]*y[0];
+   J[3] = 0;
+   J[4] = 0;
+   J[5] = 0;
+   J[6] = 0;
+   J[7] = 0;
+   J[8] = 0;
+   J[9] = 0;
+   J[10] = 0;
+   J[11] = 0;
+   J[12] = 0;
+   J[13] = 0;
+   J[14] = 0;
+   J[15] = 0;
+   J[16] = 0;
+   J[17] = 0;
+   J[18] = 0;
+   J[19] = 0;
+   J[20] = 0;
+   J[21] = 0;
+   J[22] = 0;
+   J[23] = 0;
+   J[24] = 0;
+   J[25] = 0;
+   J[26] = 0;
+   J[27] = 0;
+   J[28] = 0;
+   J[29] = p[4]*y[2];
+   J[30] = -p[5];
+   J[31] = p[4]*y[0];
+   J[32] = 0;
+   J[33] = 0;
+   J[34] = 0;
+   J[35] = 0;
+   J[36] = 0;
+   J[37] = 0;
+   J[38] = 0;
+   J[39] = 0;
+   J[40] = 0;
+   J[41] = 0;
+   J[42] = 0;
+   J[43] = 0;
+   J[44] = 0;
+   J[45] = 0;
+   J[46] = 0;
+   J[47] = 0;
+   J[48] = 0;
+   J[49] = 0;
+   J[50] = 0;
+   J[51] = 0;
+   J[52] = 0;
+   J[53] = 0;
+   J[54] = 0;
+   J[55] = 0;
+   J[56] = 0;
+   J[57] = 0;
+   J[58] = -p[4]*y[2];
+   J[59] = p[5];
+   J[60] = -p[4]*y[0];
+   J[61] = 0;
+   J[62] = 0;
+   J[63] = 0;
+   J[64] = 0;
+   J[65] = 0;
+   J[66] = 0;
+   J[67] = 0;
+   J[68] = 0;
+   J[69] = 0;
+   J[70] = 0;
+   J[71] = 0;
+   J[72] = 0;
+   J[73] = 0;
+   J[74] = 0;
+   J[75] = 0;
+   J[76] = 0;
+   J[77] = 0;
+   J[78] = 0;
+   J[79] = 0;
+   J[80] = 0;
+   J[81] = 0;
+   J[82] = 0;
+   J[83] = 0;
+   J[84] = 0;
+   J[85] = 0;
+   J[86] = 0;
+   J[87] = 0;
+   J[88] = p[2]*y[4]/(p[3] + y[4]);
+   J[89] = 0;
+   J[90] = -p[7]/(p[6] + y[3]) + p[7]*y[3]/pow(p[6] + y[3], 2) - p[0]*y[12]/(p[1] + y[3]) + p[0]*y[3]*y[12]/pow(p[1] + y[3], 2);
+   J[91] = p[2]*y[1]/(p[3] + y[4]) - p[2]*y[1]*y[4]/pow(p[3] + y[4], 2);
+   J[92] = 0;
+   J[93] = 0;
+   J[94] = 0;
+   J[95] = 0;
+   J[96] = 0;
+   J[97] = 0;
+   J[98] = 0;
+   J[99] = -p[0]*y[3]/(p[1] + y[3]);
+   J[100] = 0;
+   J[101] = 0;
+   J[102] = 0;
+   J[103] = 0;
+   J[104] = 0;
+   J[105] = 0;
+   J[106] = 0;
+   J[107] = 0;
+   J[108] = 0;
+   J[109] = 0;
+   J[110] = 0;
+   J[111] = 0;
+   J[112] = 0;
+   J[113] = 0;
+   J[114] = 0;
+   J[115] = 0;
+   J[116] = 0;
+   J[117] = -p[2]*y[4]/(p[3] + y[4]);
+   J[118] = 0;
+   J[119] = p[7]/(p[6] + y[3]) - p[7]*y[3]/pow(p[6] + y[3], 2);
+   J[120] = -p[2]*y[1]/(p[3] + y[4]) + p[2]*y[1]*y[4]/pow(p[3] + y[4], 2) - p[0]*y[12]/(p[1] + y[4]) + p[0]*y[4]*y[12]/pow(p[1] + y[4], 2);
+   J[121] = 0;
+   J[122] = 0;
+   J[123] = 0;
+   J[124] = 0;
+   J[125] = 0;
+   J[126] = 0;
+   J[127] = 0;
+   J[128] = -p[0]*y[4]/(p[1] + y[4]);
+   J[129] = 0;
+   J[130] = 0;
+   J[131] = 0;
+   J[132] = 0;
+   J[133] = 0;
+   J[134] = 0;
+   J[135] = 0;
+   J[136] = 0;
+   J[137] = 0;
+   J[138] = 0;
+   J[139] = 0;
+   J[140] = 0;
+   J[141] = 0;
+   J[142] = 0;
+   J[143] = 0;
+   J[144] = 0;
+   J[145] = 0;
+   J[146] = 0;
+   J[147] = 0;
+   J[148] = p[8]*y[6]/(p[9] + y[6]);
+   J[149] = 0;
+   J[150] = -p[10]*y[25]/(p[11] + y[5]) + p[10]*y[5]*y[25]/pow(p[11] + y[5], 2);
+   J[151] = p[8]*y[3]/(p[9] + y[6]) - p[8]*y[3]*y[6]/pow(p[9] + y[6], 2);
+   J[152] = 0;
+   J[153] = 0;
+   J[154] = 0;
+   J[155] = 0;
+   J[156] = 0;
+   J[157] = 0;
+   J[158] = 0;
+   J[159] = 0;
+   J[160] = 0;
+   J[161] = 0;
+   J[162] = 0;
+   J[163] = 0;
+   J[164] = 0;
+   J[165] = 0;
+   J[166] = 0;
+   J[167] = 0;
+   J[168] = 0;
+   J[169] = 0;
+   J[170] = -p[10]*y[5]/(p[11] + y[5]);
+   J[171] = 0;
+   J[172] = 0;
+   J[173] = 0;
+   J[174] = 0;
+   J[175] = 0;
+   J[176] = 0;
+   J[177] = -p[8]*y[6]/(p[9] + y[6]);
+   J[178] = 0;
+   J[179] = p[10]*y[25]/(p[11] + y[5]) - p[10]*y[5]*y[25]/pow(p[11] + y[5], 2);
+   J[180] = -p[8]*y[3]/(p[9] + y[6]) + p[8]*y[3]*y[6]/pow(p[9] + y[6], 2);
+   J[181] = 0;
+   J[182] = 0;
+   J[183] = 0;
+   J[184] = 0;
+   J[185] = 0;
+   J[186] = 0;
+   J[187] = 0;
+   J[188] = 0;
+   J[189] = 0;
+   J[190] = 0;
+   J[191] = 0;
+   J[192] = 0;
+   J[193] = 0;
+   J[194] = 0;
+   J[195] = 0;
+   J[196] = 0;
+   J[197] = 0;
+   J[198] = 0;
+   J[199] = p[10]*y[5]/(p[11] + y[5]);
+   J[200] = 0;
+   J[201] = 0;
+   J[202] = 0;
+   J[203] = 0;
+   J[204] = 0;
+   J[205] = 0;
+   J[206] = 0;
+   J[207] = 0;
+   J[208] = -p[12]*y[7]/(p[13] + y[7]);
+   J[209] = 0;
+   J[210] = -p[22]*y[14]/(p[23] + y[7]) + p[22]*y[7]*y[14]/pow(p[23] + y[7], 2) - p[12]*y[5]/(p[13] + y[7]) + p[12]*y[5]*y[7]/pow(p[13] + y[7], 2);
+   J[211] = p[15]/(p[14] + y[8]) - p[15]*y[8]/pow(p[14] + y[8], 2);
+   J[212] = 0;
+   J[213] = 0;
+   J[214] = 0;
+   J[215] = 0;
+   J[216] = 0;
+   J[217] = -p[22]*y[7]/(p[23] + y[7]);
+   J[218] = 0;
+   J[219] = 0;
+   J[220] = 0;
+   J[221] = 0;
+   J[222] = 0;
+   J[223] = 0;
+   J[224] = 0;
+   J[225] = 0;
+   J[226] = 0;
+   J[227] = 0;
+   J[228] = 0;
+   J[229] = 0;
+   J[230] = 0;
+   J[231] = 0;
+   J[232] = 0;
+   J[233] = 0;
+   J[234] = 0;
+   J[235] = 0;
+   J[236] = 0;
+   J[237] = p[12]*y[7]/(p[13] + y[7]);
+   J[238] = 0;
+   J[239] = p[12]*y[5]/(p[13] + y[7]) - p[12]*y[5]*y[7]/pow(p[13] + y[7], 2);
+   J[240] = -p[15]/(p[14] + y[8]) + p[15]*y[8]/pow(p[14] + y[8], 2);
+   J[241] = 0;
+   J[242] = 0;
+   J[243] = 0;
+   J[244] = 0;
+   J[245] = 0;
+   J[246] = 0;
+   J[247] = 0;
+   J[248] = 0;
+   J[249] = 0;
+   J[250] = 0;
+   J[251] = 0;
+   J[252] = 0;
+   J[253] = 0;
+   J[254] = 0;
+   J[255] = 0;
+   J[256] = 0;
+   J[257] = 0;
+   J[258] = 0;
+   J[259] = 0;
+   J[260] = 0;
+   J[261] = 0;
+   J[262] = 0;
+   J[263] = 0;
+   J[264] = 0;
+   J[265] = 0;
+   J[266] = 0;
+   J[267] = 0;
+   J[268] = 0;
+   J[269] = -p[16]*y[9]/(p[17] + y[9]);
+   J[270] = -p[44]*y[22]/(p[45] + y[9]) + p[44]*y[9]*y[22]/pow(p[45] + y[9], 2) - p[16]*y[8]/(p[17] + y[9]) + p[16]*y[8]*y[9]/pow(p[17] + y[9], 2);
+   J[271] = p[19]/(p[18] + y[10]) - p[19]*y[10]/pow(p[18] + y[10], 2);
+   J[272] = 0;
+   J[273] = 0;
+   J[274] = 0;
+   J[275] = 0;
+   J[276] = 0;
+   J[277] = 0;
+   J[278] = 0;
+   J[279] = 0;
+   J[280] = 0;
+   J[281] = 0;
+   J[282] = 0;
+   J[283] = -p[44]*y[9]/(p[45] + y[9]);
+   J[284] = 0;
+   J[285] = 0;
+   J[286] = 0;
+   J[287] = 0;
+   J[288] = 0;
+   J[289] = 0;
+   J[290] = 0;
+   J[291] = 0;
+   J[292] = 0;
+   J[293] = 0;
+   J[294] = 0;
+   J[295] = 0;
+   J[296] = 0;
+   J[297] = 0;
+   J[298] = p[16]*y[9]/(p[17] + y[9]);
+   J[299] = p[44]*y[22]/(p[45] + y[9]) - p[44]*y[9]*y[22]/pow(p[45] + y[9], 2) + p[16]*y[8]/(p[17] + y[9]) - p[16]*y[8]*y[9]/pow(p[17] + y[9], 2);
+   J[300] = -p[19]/(p[18] + y[10]) + p[19]*y[10]/pow(p[18] + y[10], 2);
+   J[301] = 0;
+   J[302] = 0;
+   J[303] = 0;
+   J[304] = 0;
+   J[305] = 0;
+   J[306] = 0;
+   J[307] = 0;
+   J[308] = 0;
+   J[309] = 0;
+   J[310] = 0;
+   J[311] = 0;
+   J[312] = p[44]*y[9]/(p[45] + y[9]);
+   J[313] = 0;
+   J[314] = 0;
+   J[315] = 0;
+   J[316] = 0;
+   J[317] = 0;
+   J[318] = 0;
+   J[319] = 0;
+   J[320] = 0;
+   J[321] = 0;
+   J[322] = 0;
+   J[323] = 0;
+   J[324] = 0;
+   J[325] = 0;
+   J[326] = 0;
+   J[327] = 0;
+   J[328] = 0;
+   J[329] = -p[20]*y[11]/(p[21] + y[11]);
+   J[330] = -p[20]*y[10]/(p[21] + y[11]) + p[20]*y[10]*y[11]/pow(p[21] + y[11], 2);
+   J[331] = p[55]/(p[54] + y[12]) - p[55]*y[12]/pow(p[54] + y[12], 2);
+   J[332] = 0;
+   J[333] = 0;
+   J[334] = 0;
+   J[335] = 0;
+   J[336] = 0;
+   J[337] = 0;
+   J[338] = 0;
+   J[339] = 0;
+   J[340] = 0;
+   J[341] = 0;
+   J[342] = 0;
+   J[343] = 0;
+   J[344] = 0;
+   J[345] = 0;
+   J[346] = 0;
+   J[347] = 0;
+   J[348] = 0;
+   J[349] = 0;
+   J[350] = 0;
+   J[351] = 0;
+   J[352] = 0;
+   J[353] = 0;
+   J[354] = 0;
+   J[355] = 0;
+   J[356] = 0;
+   J[357] = 0;
+   J[358] = p[20]*y[11]/(p[21] + y[11]);
+   J[359] = p[20]*y[10]/(p[21] + y[11]) - p[20]*y[10]*y[11]/pow(p[21] + y[11], 2);
+   J[360] = -p[55]/(p[54] + y[12]) + p[55]*y[12]/pow(p[54] + y[12], 2);
+   J[361] = 0;
+   J[362] = 0;
+   J[363] = 0;
+   J[364] = 0;
+   J[365] = 0;
+   J[366] = 0;
+   J[367] = 0;
+   J[368] = 0;
+   J[369] = 0;
+   J[370] = 0;
+   J[371] = 0;
+   J[372] = 0;
+   J[373] = 0;
+   J[374] = 0;
+   J[375] = 0;
+   J[376] = 0;
+   J[377] = 0;
+   J[378] = 0;
+   J[379] = 0;
+   J[380] = p[0]*y[12]/(p[1] + y[3]) - p[0]*y[3]*y[12]/pow(p[1] + y[3], 2);
+   J[381] = p[0]*y[12]/(p[1] + y[4]) - p[0]*y[4]*y[12]/pow(p[1] + y[4], 2);
+   J[382] = 0;
+   J[383] = 0;
+   J[384] = 0;
+   J[385] = 0;
+   J[386] = 0;
+   J[387] = 0;
+   J[388] = 0;
+   J[389] = p[0]*y[4]/(p[1] + y[4]) + p[0]*y[3]/(p[1] + y[3]);
+   J[390] = 0;
+   J[391] = 0;
+   J[392] = 0;
+   J[393] = 0;
+   J[394] = 0;
+   J[395] = 0;
+   J[396] = 0;
+   J[397] = 0;
+   J[398] = 0;
+   J[399] = 0;
+   J[400] = 0;
+   J[401] = 0;
+   J[402] = 0;
+   J[403] = 0;
+   J[404] = 0;
+   J[405] = 0;
+   J[406] = 0;
+   J[407] = 0;
+   J[408] = 0;
+   J[409] = 0;
+   J[410] = 0;
+   J[411] = 0;
+   J[412] = 0;
+   J[413] = 0;
+   J[414] = 0;
+   J[415] = 0;
+   J[416] = 0;
+   J[417] = 0;
+   J[418] = 0;
+   J[419] = 0;
+   J[420] = -p[29]/(p[28] + y[14]) + p[29]*y[14]/pow(p[28] + y[14], 2);
+   J[421] = 0;
+   J[422] = p[26]*y[27]/(p[27] + y[16]) - p[26]*y[16]*y[27]/pow(p[27] + y[16], 2) + p[24]*y[28]/(p[25] + y[16]) - p[24]*y[16]*y[28]/pow(p[25] + y[16], 2);
+   J[423] = 0;
+   J[424] = 0;
+   J[425] = 0;
+   J[426] = 0;
+   J[427] = 0;
+   J[428] = 0;
+   J[429] = 0;
+   J[430] = 0;
+   J[431] = 0;
+   J[432] = 0;
+   J[433] = p[26]*y[16]/(p[27] + y[16]);
+   J[434] = p[24]*y[16]/(p[25] + y[16]);
+   J[435] = 0;
+   J[436] = 0;
+   J[437] = 0;
+   J[438] = 0;
+   J[439] = 0;
+   J[440] = 0;
+   J[441] = 0;
+   J[442] = p[22]*y[14]/(p[23] + y[7]) - p[22]*y[7]*y[14]/pow(p[23] + y[7], 2);
+   J[443] = 0;
+   J[444] = 0;
+   J[445] = 0;
+   J[446] = 0;
+   J[447] = 0;
+   J[448] = 0;
+   J[449] = p[22]*y[7]/(p[23] + y[7]);
+   J[450] = 0;
+   J[451] = 0;
+   J[452] = 0;
+   J[453] = 0;
+   J[454] = 0;
+   J[455] = 0;
+   J[456] = 0;
+   J[457] = 0;
+   J[458] = 0;
+   J[459] = 0;
+   J[460] = 0;
+   J[461] = 0;
+   J[462] = 0;
+   J[463] = 0;
+   J[464] = 0;
+   J[465] = 0;
+   J[466] = 0;
+   J[467] = 0;
+   J[468] = 0;
+   J[469] = 0;
+   J[470] = 0;
+   J[471] = 0;
+   J[472] = 0;
+   J[473] = 0;
+   J[474] = 0;
+   J[475] = 0;
+   J[476] = 0;
+   J[477] = 0;
+   J[478] = p[29]/(p[28] + y[14]) - p[29]*y[14]/pow(p[28] + y[14], 2);
+   J[479] = 0;
+   J[480] = -p[26]*y[27]/(p[27] + y[16]) + p[26]*y[16]*y[27]/pow(p[27] + y[16], 2) - p[24]*y[28]/(p[25] + y[16]) + p[24]*y[16]*y[28]/pow(p[25] + y[16], 2);
+   J[481] = 0;
+   J[482] = 0;
+   J[483] = 0;
+   J[484] = 0;
+   J[485] = 0;
+   J[486] = 0;
+   J[487] = 0;
+   J[488] = 0;
+   J[489] = 0;
+   J[490] = 0;
+   J[491] = -p[26]*y[16]/(p[27] + y[16]);
+   J[492] = -p[24]*y[16]/(p[25] + y[16]);
+   J[493] = 0;
+   J[494] = 0;
+   J[495] = 0;
+   J[496] = 0;
+   J[497] = 0;
+   J[498] = 0;
+   J[499] = 0;
+   J[500] = 0;
+   J[501] = 0;
+   J[502] = 0;
+   J[503] = 0;
+   J[504] = 0;
+   J[505] = 0;
+   J[506] = 0;
+   J[507] = 0;
+   J[508] = 0;
+   J[509] = 0;
+   J[510] = -p[35]/(p[34] + y[17]) + p[35]*y[17]/pow(p[34] + y[17], 2);
+   J[511] = p[32]*y[27]/(p[33] + y[18]) - p[32]*y[18]*y[27]/pow(p[33] + y[18], 2) + p[30]*y[26]/(p[31] + y[18]) - p[30]*y[18]*y[26]/pow(p[31] + y[18], 2);
+   J[512] = 0;
+   J[513] = 0;
+   J[514] = 0;
+   J[515] = 0;
+   J[516] = 0;
+   J[517] = 0;
+   J[518] = 0;
+   J[519] = p[30]*y[18]/(p[31] + y[18]);
+   J[520] = p[32]*y[18]/(p[33] + y[18]);
+   J[521] = 0;
+   J[522] = 0;
+   J[523] = 0;
+   J[524] = 0;
+   J[525] = 0;
+   J[526] = 0;
+   J[527] = 0;
+   J[528] = 0;
+   J[529] = 0;
+   J[530] = 0;
+   J[531] = 0;
+   J[532] = 0;
+   J[533] = 0;
+   J[534] = 0;
+   J[535] = 0;
+   J[536] = 0;
+   J[537] = 0;
+   J[538] = 0;
+   J[539] = p[35]/(p[34] + y[17]) - p[35]*y[17]/pow(p[34] + y[17], 2);
+   J[540] = -p[32]*y[27]/(p[33] + y[18]) + p[32]*y[18]*y[27]/pow(p[33] + y[18], 2) - p[30]*y[26]/(p[31] + y[18]) + p[30]*y[18]*y[26]/pow(p[31] + y[18], 2);
+   J[541] = 0;
+   J[542] = 0;
+   J[543] = 0;
+   J[544] = 0;
+   J[545] = 0;
+   J[546] = 0;
+   J[547] = 0;
+   J[548] = -p[30]*y[18]/(p[31] + y[18]);
+   J[549] = -p[32]*y[18]/(p[33] + y[18]);
+   J[550] = 0;
+   J[551] = 0;
+   J[552] = 0;
+   J[553] = 0;
+   J[554] = 0;
+   J[555] = 0;
+   J[556] = 0;
+   J[557] = 0;
+   J[558] = 0;
+   J[559] = 0;
+   J[560] = 0;
+   J[561] = 0;
+   J[562] = 0;
+   J[563] = 0;
+   J[564] = 0;
+   J[565] = 0;
+   J[566] = 0;
+   J[567] = 0;
+   J[568] = p[36]*y[20]/(p[37] + y[20]);
+   J[569] = 0;
+   J[570] = -p[38]*y[25]/(p[39] + y[19]) + p[38]*y[19]*y[25]/pow(p[39] + y[19], 2);
+   J[571] = p[50]*y[23]/(p[51] + y[20]) - p[50]*y[20]*y[23]/pow(p[51] + y[20], 2) + p[36]*y[17]/(p[37] + y[20]) - p[36]*y[17]*y[20]/pow(p[37] + y[20], 2);
+   J[572] = 0;
+   J[573] = 0;
+   J[574] = p[50]*y[20]/(p[51] + y[20]);
+   J[575] = 0;
+   J[576] = -p[38]*y[19]/(p[39] + y[19]);
+   J[577] = 0;
+   J[578] = 0;
+   J[579] = 0;
+   J[580] = 0;
+   J[581] = 0;
+   J[582] = 0;
+   J[583] = 0;
+   J[584] = 0;
+   J[585] = 0;
+   J[586] = 0;
+   J[587] = 0;
+   J[588] = 0;
+   J[589] = 0;
+   J[590] = 0;
+   J[591] = 0;
+   J[592] = 0;
+   J[593] = 0;
+   J[594] = 0;
+   J[595] = 0;
+   J[596] = 0;
+   J[597] = -p[36]*y[20]/(p[37] + y[20]);
+   J[598] = 0;
+   J[599] = p[38]*y[25]/(p[39] + y[19]) - p[38]*y[19]*y[25]/pow(p[39] + y[19], 2);
+   J[600] = -p[50]*y[23]/(p[51] + y[20]) + p[50]*y[20]*y[23]/pow(p[51] + y[20], 2) - p[36]*y[17]/(p[37] + y[20]) + p[36]*y[17]*y[20]/pow(p[37] + y[20], 2);
+   J[601] = 0;
+   J[602] = 0;
+   J[603] = -p[50]*y[20]/(p[51] + y[20]);
+   J[604] = 0;
+   J[605] = p[38]*y[19]/(p[39] + y[19]);
+   J[606] = 0;
+   J[607] = 0;
+   J[608] = 0;
+   J[609] = 0;
+   J[610] = 0;
+   J[611] = 0;
+   J[612] = 0;
+   J[613] = 0;
+   J[614] = -p[52]*y[21]/(p[53] + y[21]);
+   J[615] = 0;
+   J[616] = 0;
+   J[617] = 0;
+   J[618] = 0;
+   J[619] = 0;
+   J[620] = 0;
+   J[621] = 0;
+   J[622] = 0;
+   J[623] = 0;
+   J[624] = 0;
+   J[625] = 0;
+   J[626] = 0;
+   J[627] = 0;
+   J[628] = -p[40]*y[21]/(p[41] + y[21]);
+   J[629] = 0;
+   J[630] = -p[52]*y[5]/(p[53] + y[21]) + p[52]*y[5]*y[21]/pow(p[53] + y[21], 2) - p[40]*y[19]/(p[41] + y[21]) + p[40]*y[19]*y[21]/pow(p[41] + y[21], 2);
+   J[631] = p[43]/(p[42] + y[22]) - p[43]*y[22]/pow(p[42] + y[22], 2);
+   J[632] = 0;
+   J[633] = 0;
+   J[634] = 0;
+   J[635] = 0;
+   J[636] = 0;
+   J[637] = 0;
+   J[638] = 0;
+   J[639] = 0;
+   J[640] = 0;
+   J[641] = 0;
+   J[642] = 0;
+   J[643] = p[52]*y[21]/(p[53] + y[21]);
+   J[644] = 0;
+   J[645] = 0;
+   J[646] = 0;
+   J[647] = 0;
+   J[648] = 0;
+   J[649] = 0;
+   J[650] = 0;
+   J[651] = 0;
+   J[652] = 0;
+   J[653] = 0;
+   J[654] = 0;
+   J[655] = 0;
+   J[656] = 0;
+   J[657] = p[40]*y[21]/(p[41] + y[21]);
+   J[658] = 0;
+   J[659] = p[52]*y[5]/(p[53] + y[21]) - p[52]*y[5]*y[21]/pow(p[53] + y[21], 2) + p[40]*y[19]/(p[41] + y[21]) - p[40]*y[19]*y[21]/pow(p[41] + y[21], 2);
+   J[660] = -p[43]/(p[42] + y[22]) + p[43]*y[22]/pow(p[42] + y[22], 2);
+   J[661] = 0;
+   J[662] = 0;
+   J[663] = 0;
+   J[664] = 0;
+   J[665] = 0;
+   J[666] = 0;
+   J[667] = 0;
+   J[668] = p[46]*y[24]/(p[47] + y[24]);
+   J[669] = 0;
+   J[670] = 0;
+   J[671] = 0;
+   J[672] = 0;
+   J[673] = 0;
+   J[674] = 0;
+   J[675] = 0;
+   J[676] = 0;
+   J[677] = 0;
+   J[678] = 0;
+   J[679] = 0;
+   J[680] = 0;
+   J[681] = 0;
+   J[682] = 0;
+   J[683] = 0;
+   J[684] = 0;
+   J[685] = 0;
+   J[686] = 0;
+   J[687] = 0;
+   J[688] = 0;
+   J[689] = 0;
+   J[690] = -p[48]/(p[49] + y[23]) + p[48]*y[23]/pow(p[49] + y[23], 2);
+   J[691] = p[46]*y[1]/(p[47] + y[24]) - p[46]*y[1]*y[24]/pow(p[47] + y[24], 2);
+   J[692] = 0;
+   J[693] = 0;
+   J[694] = 0;
+   J[695] = 0;
+   J[696] = 0;
+   J[697] = -p[46]*y[24]/(p[47] + y[24]);
+   J[698] = 0;
+   J[699] = 0;
+   J[700] = 0;
+   J[701] = 0;
+   J[702] = 0;
+   J[703] = 0;
+   J[704] = 0;
+   J[705] = 0;
+   J[706] = 0;
+   J[707] = 0;
+   J[708] = 0;
+   J[709] = 0;
+   J[710] = 0;
+   J[711] = 0;
+   J[712] = 0;
+   J[713] = 0;
+   J[714] = 0;
+   J[715] = 0;
+   J[716] = 0;
+   J[717] = 0;
+   J[718] = 0;
+   J[719] = p[48]/(p[49] + y[23]) - p[48]*y[23]/pow(p[49] + y[23], 2);
+   J[720] = -p[46]*y[1]/(p[47] + y[24]) + p[46]*y[1]*y[24]/pow(p[47] + y[24], 2);
+   J[721] = 0;
+   J[722] = 0;
+   J[723] = 0;
+   J[724] = 0;
+   J[725] = 0;
+   J[726] = 0;
+   J[727] = 0;
+   J[728] = 0;
+   J[729] = 0;
+   J[730] = 0;
+   J[731] = 0;
+   J[732] = 0;
+   J[733] = 0;
+   J[734] = 0;
+   J[735] = 0;
+   J[736] = 0;
+   J[737] = 0;
+   J[738] = 0;
+   J[739] = 0;
+   J[740] = 0;
+   J[741] = 0;
+   J[742] = 0;
+   J[743] = 0;
+   J[744] = 0;
+   J[745] = 0;
+   J[746] = 0;
+   J[747] = 0;
+   J[748] = 0;
+   J[749] = 0;
+   J[750] = 0;
+   J[751] = 0;
+   J[752] = 0;
+   J[753] = 0;
+   J[754] = 0;
+   J[755] = 0;
+   J[756] = 0;
+   J[757] = 0;
+   J[758] = 0;
+   J[759] = 0;
+   J[760] = 0;
+   J[761] = 0;
+   J[762] = 0;
+   J[763] = 0;
+   J[764] = 0;
+   J[765] = 0;
+   J[766] = 0;
+   J[767] = 0;
+   J[768] = 0;
+   J[769] = 0;
+   J[770] = 0;
+   J[771] = 0;
+   J[772] = 0;
+   J[773] = 0;
+   J[774] = 0;
+   J[775] = 0;
+   J[776] = 0;
+   J[777] = 0;
+   J[778] = 0;
+   J[779] = 0;
+   J[780] = 0;
+   J[781] = 0;
+   J[782] = 0;
+   J[783] = 0;
+   J[784] = 0;
+   J[785] = 0;
+   J[786] = 0;
+   J[787] = 0;
+   J[788] = 0;
+   J[789] = 0;
+   J[790] = 0;
+   J[791] = 0;
+   J[792] = 0;
+   J[793] = 0;
+   J[794] = 0;
+   J[795] = 0;
+   J[796] = 0;
+   J[797] = 0;
+   J[798] = 0;
+   J[799] = 0;
+   J[800] = 0;
+   J[801] = 0;
+   J[802] = 0;
+   J[803] = 0;
+   J[804] = 0;
+   J[805] = 0;
+   J[806] = 0;
+   J[807] = 0;
+   J[808] = 0;
+   J[809] = 0;
+   J[810] = 0;
+   J[811] = 0;
+   J[812] = 0;
+   J[813] = 0;
+   J[814] = 0;
+   J[815] = 0;
+   J[816] = 0;
+   J[817] = 0;
+   J[818] = 0;
+   J[819] = 0;
+   J[820] = 0;
+   J[821] = 0;
+   J[822] = 0;
+   J[823] = 0;
+   J[824] = 0;
+   J[825] = 0;
+   J[826] = 0;
+   J[827] = 0;
+   J[828] = 0;
+   J[829] = 0;
+   J[830] = 0;
+   J[831] = 0;
+   J[832] = 0;
+   J[833] = 0;
+   J[834] = 0;
+   J[835] = 0;
+   J[836] = 0;
+   J[837] = 0;
+   J[838] = 0;
+   J[839] = 0;
+   J[840] = 0;
+
+}
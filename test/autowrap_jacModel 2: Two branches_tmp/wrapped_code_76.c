@@ -0,0 +1,105 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_76.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *J) {
+
+   J[0] = -p[4]*y[2];
+   J[1] = p[5];
+   J[2] = -p[4]*y[0];
+   J[3] = p[4]*y[2];
+   J[4] = -p[5];
+   J[5] = p[4]*y[0];
+   J[6] = -p[4]*y[2];
+   J[7] = p[5];
+   J[8] = -p[4]*y[0];
+   J[9] = p[2]*y[4]/(p[3] + y[4]);
+   J[10] = -p[7]/(p[6] + y[3]) + p[7]*y[3]/pow(p[6] + y[3], 2) - p[0]*y[12]/(p[1] + y[3]) + p[0]*y[3]*y[12]/pow(p[1] + y[3], 2);
+   J[11] = p[2]*y[1]/(p[3] + y[4]) - p[2]*y[1]*y[4]/pow(p[3] + y[4], 2);
+   J[12] = -p[0]*y[3]/(p[1] + y[3]);
+   J[13] = -p[2]*y[4]/(p[3] + y[4]);
+   J[14] = p[7]/(p[6] + y[3]) - p[7]*y[3]/pow(p[6] + y[3], 2);
+   J[15] = -p[2]*y[1]/(p[3] + y[4]) + p[2]*y[1]*y[4]/pow(p[3] + y[4], 2) - p[0]*y[12]/(p[1] + y[4]) + p[0]*y[4]*y[12]/pow(p[1] + y[4], 2);
+   J[16] = -p[0]*y[4]/(p[1] + y[4]);
+   J[17] = p[8]*y[6]/(p[9] + y[6]);
+   J[18] = -p[10]*y[25]/(p[11] + y[5]) + p[10]*y[5]*y[25]/pow(p[11] + y[5], 2);
+   J[19] = p[8]*y[3]/(p[9] + y[6]) - p[8]*y[3]*y[6]/pow(p[9] + y[6], 2);
+   J[20] = -p[10]*y[5]/(p[11] + y[5]);
+   J[21] = -p[8]*y[6]/(p[9] + y[6]);
+   J[22] = p[10]*y[25]/(p[11] + y[5]) - p[10]*y[5]*y[25]/pow(p[11] + y[5], 2);
+   J[23] = -p[8]*y[3]/(p[9] + y[6]) + p[8]*y[3]*y[6]/pow(p[9] + y[6], 2);
+   J[24] = p[10]*y[5]/(p[11] + y[5]);
+   J[25] = -p[12]*y[7]/(p[13] + y[7]);
+   J[26] = -p[22]*y[14]/(p[23] + y[7]) + p[22]*y[7]*y[14]/pow(p[23] + y[7], 2) - p[12]*y[5]/(p[13] + y[7]) + p[12]*y[5]*y[7]/pow(p[13] + y[7], 2);
+   J[27] = p[15]/(p[14] + y[8]) - p[15]*y[8]/pow(p[14] + y[8], 2);
+   J[28] = -p[22]*y[7]/(p[23] + y[7]);
+   J[29] = p[12]*y[7]/(p[13] + y[7]);
+   J[30] = p[12]*y[5]/(p[13] + y[7]) - p[12]*y[5]*y[7]/pow(p[13] + y[7], 2);
+   J[31] = -p[15]/(p[14] + y[8]) + p[15]*y[8]/pow(p[14] + y[8], 2);
+   J[32] = -p[16]*y[9]/(p[17] + y[9]);
+   J[33] = -p[44]*y[22]/(p[45] + y[9]) + p[44]*y[9]*y[22]/pow(p[45] + y[9], 2) - p[16]*y[8]/(p[17] + y[9]) + p[16]*y[8]*y[9]/pow(p[17] + y[9], 2);
+   J[34] = p[19]/(p[18] + y[10]) - p[19]*y[10]/pow(p[18] + y[10], 2);
+   J[35] = -p[44]*y[9]/(p[45] + y[9]);
+   J[36] = p[16]*y[9]/(p[17] + y[9]);
+   J[37] = p[44]*y[22]/(p[45] + y[9]) - p[44]*y[9]*y[22]/pow(p[45] + y[9], 2) + p[16]*y[8]/(p[17] + y[9]) - p[16]*y[8]*y[9]/pow(p[17] + y[9], 2);
+   J[38] = -p[19]/(p[18] + y[10]) + p[19]*y[10]/pow(p[18] + y[10], 2);
+   J[39] = p[44]*y[9]/(p[45] + y[9]);
+   J[40] = -p[20]*y[11]/(p[21] + y[11]);
+   J[41] = -p[20]*y[10]/(p[21] + y[11]) + p[20]*y[10]*y[11]/pow(p[21] + y[11], 2);
+   J[42] = p[55]/(p[54] + y[12]) - p[55]*y[12]/pow(p[54] + y[12], 2);
+   J[43] = p[20]*y[11]/(p[21] + y[11]);
+   J[44] = p[20]*y[10]/(p[21] + y[11]) - p[20]*y[10]*y[11]/pow(p[21] + y[11], 2);
+   J[45] = -p[55]/(p[54] + y[12]) + p[55]*y[12]/pow(p[54] + y[12], 2);
+   J[46] = p[0]*y[12]/(p[1] + y[3]) - p[0]*y[3]*y[12]/pow(p[1] + y[3], 2);
+   J[47] = p[0]*y[12]/(p[1] + y[4]) - p[0]*y[4]*y[12]/pow(p[1] + y[4], 2);
+   J[48] = p[0]*y[4]/(p[1] + y[4]) + p[0]*y[3]/(p[1] + y[3]);
+   J[49] = -p[29]/(p[28] + y[14]) + p[29]*y[14]/pow(p[28] + y[14], 2);
+   J[50] = p[26]*y[27]/(p[27] + y[16]) - p[26]*y[16]*y[27]/pow(p[27] + y[16], 2) + p[24]*y[28]/(p[25] + y[16]) - p[24]*y[16]*y[28]/pow(p[25] + y[16], 2);
+   J[51] = p[26]*y[16]/(p[27] + y[16]);
+   J[52] = p[24]*y[16]/(p[25] + y[16]);
+   J[53] = p[22]*y[14]/(p[23] + y[7]) - p[22]*y[7]*y[14]/pow(p[23] + y[7], 2);
+   J[54] = p[22]*y[7]/(p[23] + y[7]);
+   J[55] = p[29]/(p[28] + y[14]) - p[29]*y[14]/pow(p[28] + y[14], 2);
+   J[56] = -p[26]*y[27]/(p[27] + y[16]) + p[26]*y[16]*y[27]/pow(p[27] + y[16], 2) - p[24]*y[28]/(p[25] + y[16]) + p[24]*y[16]*y[28]/pow(p[25] + y[16], 2);
+   J[57] = -p[26]*y[16]/(p[27] + y[16]);
+   J[58] = -p[24]*y[16]/(p[25] + y[16]);
+   J[59] = -p[35]/(p[34] + y[17]) + p[35]*y[17]/pow(p[34] + y[17], 2);
+   J[60] = p[32]*y[27]/(p[33] + y[18]) - p[32]*y[18]*y[27]/pow(p[33] + y[18], 2) + p[30]*y[26]/(p[31] + y[18]) - p[30]*y[18]*y[26]/pow(p[31] + y[18], 2);
+   J[61] = p[30]*y[18]/(p[31] + y[18]);
+   J[62] = p[32]*y[18]/(p[33] + y[18]);
+   J[63] = p[35]/(p[34] + y[17]) - p[35]*y[17]/pow(p[34] + y[17], 2);
+   J[64] = -p[32]*y[27]/(p[33] + y[18]) + p[32]*y[18]*y[27]/pow(p[33] + y[18], 2) - p[30]*y[26]/(p[31] + y[18]) + p[30]*y[18]*y[26]/pow(p[31] + y[18], 2);
+   J[65] = -p[30]*y[18]/(p[31] + y[18]);
+   J[66] = -p[32]*y[18]/(p[33] + y[18]);
+   J[67] = p[36]*y[20]/(p[37] + y[20]);
+   J[68] = -p[38]*y[25]/(p[39] + y[19]) + p[38]*y[19]*y[25]/pow(p[39] + y[19], 2);
+   J[69] = p[50]*y[23]/(p[51] + y[20]) - p[50]*y[20]*y[23]/pow(p[51] + y[20], 2) + p[36]*y[17]/(p[37] + y[20]) - p[36]*y[17]*y[20]/pow(p[37] + y[20], 2);
+   J[70] = p[50]*y[20]/(p[51] + y[20]);
+   J[71] = -p[38]*y[19]/(p[39] + y[19]);
+   J[72] = -p[36]*y[20]/(p[37] + y[20]);
+   J[73] = p[38]*y[25]/(p[39] + y[19]) - p[38]*y[19]*y[25]/pow(p[39] + y[19], 2);
+   J[74] = -p[50]*y[23]/(p[51] + y[20]) + p[50]*y[20]*y[23]/pow(p[51] + y[20], 2) - p[36]*y[17]/(p[37] + y[20]) + p[36]*y[17]*y[20]/pow(p[37] + y[20], 2);
+   J[75] = -p[50]*y[20]/(p[51] + y[20]);
+   J[76] = p[38]*y[19]/(p[39] + y[19]);
+   J[77] = -p[52]*y[21]/(p[53] + y[21]);
+   J[78] = -p[40]*y[21]/(p[41] + y[21]);
+   J[79] = -p[52]*y[5]/(p[53] + y[21]) + p[52]*y[5]*y[21]/pow(p[53] + y[21], 2) - p[40]*y[19]/(p[41] + y[21]) + p[40]*y[19]*y[21]/pow(p[41] + y[21], 2);
+   J[80] = p[43]/(p[42] + y[22]) - p[43]*y[22]/pow(p[42] + y[22], 2);
+   J[81] = p[52]*y[21]/(p[53] + y[21]);
+   J[82] = p[40]*y[21]/(p[41] + y[21]);
+   J[83] = p[52]*y[5]/(p[53] + y[21]) - p[52]*y[5]*y[21]/pow(p[53] + y[21], 2) + p[40]*y[19]/(p[41] + y[21]) - p[40]*y[19]*y[21]/pow(p[41] + y[21], 2);
+   J[84] = -p[43]/(p[42] + y[22]) + p[43]*y[22]/pow(p[42] + y[22], 2);
+   J[85] = p[46]*y[24]/(p[47] + y[24]);
+   J[86] = -p[48]/(p[49] + y[23]) + p[48]*y[23]/pow(p[49] + y[23], 2);
+   J[87] = p[46]*y[1]/(p[47] + y[24]) - p[46]*y[1]*y[24]/pow(p[47] + y[24], 2);
+   J[88] = -p[46]*y[24]/(p[47] + y[24]);
+   J[89] = p[48]/(p[49] + y[23]) - p[48]*y[23]/pow(p[49] + y[23], 2);
+   J[90] = -p[46]*y[1]/(p[47] + y[24]) + p[46]*y[1]*y[24]/pow(p[47] + y[24], 2);
+
+}
@@ -0,0 +1,201 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_97.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *out) {
+   const double x0 = p[4]*y[2];
+   const double x1 = -x0;
+   const double x2 = p[4]*y[0];
+   const double x3 = -x2;
+   const double x4 = p[3] + y[4];
+   const double x5 = p[2]/x4;
+   const double x6 = x5*y[4];
+   const double x7 = p[6] + y[3];
+   const double x8 = p[7]/x7 - p[7]*y[3]/pow(x7, 2);
+   const double x9 = p[1] + y[3];
+   const double x10 = p[0]/x9;
+   const double x11 = p[0]*y[12];
+   const double x12 = x10*y[12] - x11*y[3]/pow(x9, 2);
+   const double x13 = x5*y[1] - p[2]*y[1]*y[4]/pow(x4, 2);
+   const double x14 = x10*y[3];
+   const double x15 = p[1] + y[4];
+   const double x16 = p[0]/x15;
+   const double x17 = -x11*y[4]/pow(x15, 2) + x16*y[12];
+   const double x18 = x16*y[4];
+   const double x19 = p[9] + y[6];
+   const double x20 = p[8]/x19;
+   const double x21 = x20*y[6];
+   const double x22 = p[11] + y[5];
+   const double x23 = p[10]/x22;
+   const double x24 = x23*y[25] - p[10]*y[5]*y[25]/pow(x22, 2);
+   const double x25 = x20*y[3] - p[8]*y[3]*y[6]/pow(x19, 2);
+   const double x26 = x23*y[5];
+   const double x27 = p[13] + y[7];
+   const double x28 = p[12]/x27;
+   const double x29 = x28*y[7];
+   const double x30 = x28*y[5] - p[12]*y[5]*y[7]/pow(x27, 2);
+   const double x31 = p[23] + y[7];
+   const double x32 = p[22]/x31;
+   const double x33 = x32*y[14] - p[22]*y[7]*y[14]/pow(x31, 2);
+   const double x34 = p[14] + y[8];
+   const double x35 = p[15]/x34 - p[15]*y[8]/pow(x34, 2);
+   const double x36 = x32*y[7];
+   const double x37 = p[17] + y[9];
+   const double x38 = p[16]/x37;
+   const double x39 = x38*y[9];
+   const double x40 = p[45] + y[9];
+   const double x41 = p[44]/x40;
+   const double x42 = x38*y[8] + x41*y[22] - p[44]*y[9]*y[22]/pow(x40, 2) - p[16]*y[8]*y[9]/pow(x37, 2);
+   const double x43 = p[18] + y[10];
+   const double x44 = p[19]/x43 - p[19]*y[10]/pow(x43, 2);
+   const double x45 = x41*y[9];
+   const double x46 = p[21] + y[11];
+   const double x47 = p[20]/x46;
+   const double x48 = x47*y[11];
+   const double x49 = x47*y[10] - p[20]*y[10]*y[11]/pow(x46, 2);
+   const double x50 = p[54] + y[12];
+   const double x51 = p[55]/x50 - p[55]*y[12]/pow(x50, 2);
+   const double x52 = p[28] + y[14];
+   const double x53 = p[29]/x52 - p[29]*y[14]/pow(x52, 2);
+   const double x54 = p[25] + y[16];
+   const double x55 = p[24]/x54;
+   const double x56 = p[27] + y[16];
+   const double x57 = p[26]/x56;
+   const double x58 = x55*y[28] + x57*y[27] - p[26]*y[16]*y[27]/pow(x56, 2) - p[24]*y[16]*y[28]/pow(x54, 2);
+   const double x59 = x57*y[16];
+   const double x60 = x55*y[16];
+   const double x61 = p[34] + y[17];
+   const double x62 = p[35]/x61 - p[35]*y[17]/pow(x61, 2);
+   const double x63 = p[31] + y[18];
+   const double x64 = p[30]/x63;
+   const double x65 = p[33] + y[18];
+   const double x66 = p[32]/x65;
+   const double x67 = x64*y[26] + x66*y[27] - p[32]*y[18]*y[27]/pow(x65, 2) - p[30]*y[18]*y[26]/pow(x63, 2);
+   const double x68 = x64*y[18];
+   const double x69 = x66*y[18];
+   const double x70 = p[37] + y[20];
+   const double x71 = p[36]/x70;
+   const double x72 = x71*y[20];
+   const double x73 = p[39] + y[19];
+   const double x74 = p[38]/x73;
+   const double x75 = x74*y[25] - p[38]*y[19]*y[25]/pow(x73, 2);
+   const double x76 = p[51] + y[20];
+   const double x77 = p[50]/x76;
+   const double x78 = x71*y[17] + x77*y[23] - p[50]*y[20]*y[23]/pow(x76, 2) - p[36]*y[17]*y[20]/pow(x70, 2);
+   const double x79 = x77*y[20];
+   const double x80 = x74*y[19];
+   const double x81 = p[53] + y[21];
+   const double x82 = p[52]/x81;
+   const double x83 = x82*y[21];
+   const double x84 = p[41] + y[21];
+   const double x85 = p[40]/x84;
+   const double x86 = x85*y[21];
+   const double x87 = x82*y[5] + x85*y[19] - p[40]*y[19]*y[21]/pow(x84, 2) - p[52]*y[5]*y[21]/pow(x81, 2);
+   const double x88 = p[42] + y[22];
+   const double x89 = p[43]/x88 - p[43]*y[22]/pow(x88, 2);
+   const double x90 = p[47] + y[24];
+   const double x91 = p[46]/x90;
+   const double x92 = x91*y[24];
+   const double x93 = p[49] + y[23];
+   const double x94 = p[48]/x93 - p[48]*y[23]/pow(x93, 2);
+   const double x95 = x91*y[1] - p[46]*y[1]*y[24]/pow(x90, 2);
+
+   out[0] = x1;
+   out[1] = p[5];
+   out[2] = x3;
+   out[3] = x0;
+   out[4] = -p[5];
+   out[5] = x2;
+   out[6] = x1;
+   out[7] = p[5];
+   out[8] = x3;
+   out[9] = x6;
+   out[10] = -x12 - x8;
+   out[11] = x13;
+   out[12] = -x14;
+   out[13] = -x6;
+   out[14] = x8;
+   out[15] = -x13 - x17;
+   out[16] = -x18;
+   out[17] = x21;
+   out[18] = -x24;
+   out[19] = x25;
+   out[20] = -x26;
+   out[21] = -x21;
+   out[22] = x24;
+   out[23] = -x25;
+   out[24] = x26;
+   out[25] = -x29;
+   out[26] = -x30 - x33;
+   out[27] = x35;
+   out[28] = -x36;
+   out[29] = x29;
+   out[30] = x30;
+   out[31] = -x35;
+   out[32] = -x39;
+   out[33] = -x42;
+   out[34] = x44;
+   out[35] = -x45;
+   out[36] = x39;
+   out[37] = x42;
+   out[38] = -x44;
+   out[39] = x45;
+   out[40] = -x48;
+   out[41] = -x49;
+   out[42] = x51;
+   out[43] = x48;
+   out[44] = x49;
+   out[45] = -x51;
+   out[46] = x12;
+   out[47] = x17;
+   out[48] = x14 + x18;
+   out[49] = -x53;
+   out[50] = x58;
+   out[51] = x59;
+   out[52] = x60;
+   out[53] = x33;
+   out[54] = x36;
+   out[55] = x53;
+   out[56] = -x58;
+   out[57] = -x59;
+   out[58] = -x60;
+   out[59] = -x62;
+   out[60] = x67;
+   out[61] = x68;
+   out[62] = x69;
+   out[63] = x62;
+   out[64] = -x67;
+   out[65] = -x68;
+   out[66] = -x69;
+   out[67] = x72;
+   out[68] = -x75;
+   out[69] = x78;
+   out[70] = x79;
+   out[71] = -x80;
+   out[72] = -x72;
+   out[73] = x75;
+   out[74] = -x78;
+   out[75] = -x79;
+   out[76] = x80;
+   out[77] = -x83;
+   out[78] = -x86;
+   out[79] = -x87;
+   out[80] = x89;
+   out[81] = x83;
+   out[82] = x86;
+   out[83] = x87;
+   out[84] = -x89;
+   out[85] = x92;
+   out[86] = -x94;
+   out[87] = x95;
+   out[88] = -x92;
+   out[89] = x94;
+   out[90] = -x95;
+
+}
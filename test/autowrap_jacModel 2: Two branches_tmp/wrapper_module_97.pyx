@@ -0,0 +1,11 @@
+import numpy as np
+cimport numpy as np
+
+cdef extern from 'wrapped_code_97.h':
+    void autofunc(double *y, double *p, double *out)
+
+def autofunc_c(np.ndarray[np.double_t, ndim=2] y, np.ndarray[np.double_t, ndim=2] p):
+
+    cdef np.ndarray[np.double_t, ndim=2] out = np.empty((91,1))
+    autofunc(<double*> y.data, <double*> p.data, <double*> out.data)
+    return out
\ No newline at end of file
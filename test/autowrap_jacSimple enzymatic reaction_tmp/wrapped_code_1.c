@@ -0,0 +1,24 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_1.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *J) {
+
+   J[0] = -p[0]*y[1];
+   J[1] = -p[0]*y[0];
+   J[2] = p[1] + p[2];
+   J[3] = -p[0]*y[1];
+   J[4] = -p[0]*y[0];
+   J[5] = p[1];
+   J[6] = p[0]*y[1];
+   J[7] = p[0]*y[0];
+   J[8] = -p[1] - p[2];
+   J[9] = p[2];
+
+}
@@ -0,0 +1,16 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+
+
+#ifndef AUTOWRAP__WRAPPED_CODE_1__H
+#define AUTOWRAP__WRAPPED_CODE_1__H
+
+void autofunc(double *y, double *p, double *J);
+
+#endif
+
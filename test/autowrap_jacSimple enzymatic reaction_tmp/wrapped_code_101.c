@@ -0,0 +1,29 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_101.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *out) {
+   const double x0 = p[0]*y[1];
+   const double x1 = -x0;
+   const double x2 = p[0]*y[0];
+   const double x3 = -x2;
+   const double x4 = p[1] + p[2];
+
+   out[0] = x1;
+   out[1] = x3;
+   out[2] = x4;
+   out[3] = x1;
+   out[4] = x3;
+   out[5] = p[1];
+   out[6] = x0;
+   out[7] = x2;
+   out[8] = -x4;
+   out[9] = p[2];
+
+}
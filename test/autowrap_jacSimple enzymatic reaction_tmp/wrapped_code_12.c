@@ -0,0 +1,30 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_12.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *J) {
+
+   J[0] = -p[0]*y[1];
+   J[1] = -p[0]*y[0];
+   J[2] = p[1] + p[2];
+   J[3] = 0;
+   J[4] = -p[0]*y[1];
+   J[5] = -p[0]*y[0];
+   J[6] = p[1];
+   J[7] = 0;
+   J[8] = p[0]*y[1];
+   J[9] = p[0]*y[0];
+   J[10] = -p[1] - p[2];
+   J[11] = 0;
+   J[12] = 0;
+   J[13] = 0;
+   J[14] = p[2];
+   J[15] = 0;
+
+}
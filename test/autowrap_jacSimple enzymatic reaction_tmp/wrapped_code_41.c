@@ -0,0 +1,18 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_41.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *out) {
+   const double x0 = (-p[3] + y[0])*p[0];
+
+   out[0] = x0 + (-p[4] + y[0] + y[1])*p[0] - p[1] - p[2];
+   out[1] = x0;
+   out[2] = p[2];
+
+}
@@ -0,0 +1,17 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_74.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *J) {
+
+   J[0] = (-p[3] + y[0])*p[0] + (-p[4] + y[0] + y[1])*p[0] - p[1] - p[2];
+   J[1] = (-p[3] + y[0])*p[0];
+   J[2] = p[2];
+
+}
@@ -0,0 +1,15 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_107.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *out) {
+
+   out[0] = -p[0];
+
+}
@@ -0,0 +1,18 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_17.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *out) {
+
+   out[0] = 1.0/2.0;
+   out[1] = 1.0/2.0;
+   out[2] = 1.0/2.0;
+   out[3] = 1.0/2.0;
+
+}
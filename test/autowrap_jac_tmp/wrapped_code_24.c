@@ -0,0 +1,18 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_24.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *J) {
+
+   J[0] = 1.0/2.0;
+   J[1] = 1.0/2.0;
+   J[2] = 1.0/2.0;
+   J[3] = 1.0/2.0;
+
+}
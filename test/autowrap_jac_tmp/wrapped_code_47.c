@@ -0,0 +1,37 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_47.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *out) {
+
+   out[0] = -1;
+   out[1] = 1;
+   out[2] = -1;
+   out[3] = -1;
+   out[4] = 1;
+   out[5] = -1;
+   out[6] = 1;
+   out[7] = -1;
+   out[8] = 1;
+   out[9] = 1;
+   out[10] = -1;
+   out[11] = -1;
+   out[12] = 1;
+   out[13] = 1;
+   out[14] = -1;
+   out[15] = 1;
+   out[16] = -1;
+   out[17] = 1;
+   out[18] = -1;
+   out[19] = 1;
+   out[20] = -1;
+   out[21] = 1;
+   out[22] = -1;
+
+}
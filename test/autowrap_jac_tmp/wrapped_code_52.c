@@ -0,0 +1,20 @@
+/******************************************************************************
+ *                      Code generated with SymPy 1.14.0                      *
+ *                                                                            *
+ *              See http://www.sympy.org/ for more information.               *
+ *                                                                            *
+ *                      This file is part of 'autowrap'                       *
+ ******************************************************************************/
+#include "wrapped_code_52.h"
+#include <math.h>
+
+void autofunc(double *y, double *p, double *out) {
+   const double x0 = p[0]*y[1];
+   const double x1 = p[0]*y[0];
+
+   out[0] = -x0;
+   out[1] = -x1;
+   out[2] = x0;
+   out[3] = x1 - p[1];
+
+}